@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+import hashlib
+import json
+import logging
+import os
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Who a request runs as: Arcade tools execute with that user's authorizations,
+# so it comes from the caller's credentials, never from the request body.
+# API keys as "key:user,key2:user2" and/or a JSON file {"key": "user"}; a key
+# mapped to "*" is a service key that may name the user per request/item.
+API_KEYS = os.getenv("API_KEYS", "")
+API_KEYS_FILE = os.getenv("API_KEYS_FILE", "")
+# Behind an authenticating proxy: header carrying the signed-in user's id
+AUTH_USER_HEADER = os.getenv("AUTH_USER_HEADER", "")
+SERVICE_USER = "*"
+
+_keys: Optional[Dict[str, str]] = None
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def api_keys() -> Dict[str, str]:
+    """sha256(key) -> user id, from API_KEYS and API_KEYS_FILE (read once)."""
+    global _keys
+    if _keys is None:
+        keys: Dict[str, str] = {}
+        for pair in API_KEYS.split(","):
+            key, _, user = pair.strip().partition(":")
+            if key and user:
+                keys[key] = user
+        if API_KEYS_FILE:
+            try:
+                with open(API_KEYS_FILE) as f:
+                    keys.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read {API_KEYS_FILE}: {e}")
+        _keys = {_digest(key): user for key, user in keys.items()}
+    return _keys
+
+
+def set_api_keys(keys: Optional[Dict[str, str]]) -> None:
+    """Replace the key table ({"key": "user"}); None re-reads the env on next use."""
+    global _keys
+    _keys = None if keys is None else {_digest(key): user for key, user in keys.items()}
+
+
+class Caller:
+    """The authenticated caller: a user, a service key, or (no auth configured) the default user."""
+
+    def __init__(self, user_id: Optional[str] = None, service: bool = False):
+        self.user_id = user_id
+        self.service = service
+
+    def user_for(self, requested: Optional[str]) -> Optional[str]:
+        """User a briefing / registration runs as; only service keys may name someone else."""
+        if requested is None or requested == self.user_id:
+            return self.user_id
+        if self.service:
+            return requested
+        raise HTTPException(status_code=403, detail="user_id can only be set with a service API key")
+
+    def can_see(self, user_id: Optional[str]) -> bool:
+        return self.service or user_id == self.user_id
+
+
+def _presented_key(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token.strip()
+    return request.headers.get("x-api-key")
+
+
+def current_caller(request: Request) -> Caller:
+    """FastAPI dependency: the caller from AUTH_USER_HEADER or an API key (401 when missing or unknown)."""
+    if AUTH_USER_HEADER:
+        user = request.headers.get(AUTH_USER_HEADER)
+        if user:
+            return Caller(user)
+    keys = api_keys()
+    if keys:
+        key = _presented_key(request)
+        user = keys.get(_digest(key)) if key else None
+        if user is None:
+            raise HTTPException(status_code=401, detail="Missing or unknown API key",
+                                headers={"WWW-Authenticate": "Bearer"})
+        return Caller(None, service=True) if user == SERVICE_USER else Caller(user)
+    if AUTH_USER_HEADER:
+        raise HTTPException(status_code=401, detail=f"Missing {AUTH_USER_HEADER} header")
+    # no auth configured: a single-user deployment, everything runs as the default user
+    return Caller()
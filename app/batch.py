@@ -0,0 +1,139 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import time
+import uuid
+
+from app.graph import shared_state
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Graph runs in flight across all batches; provider caps (app/graph/limits.py)
+# are what actually bound throughput
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "64"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+# How long finished async jobs stay pollable (seconds)
+BATCH_JOB_TTL = float(os.getenv("BATCH_JOB_TTL", "3600"))
+# With a shared backend, an async job's progress is copied there at most this
+# often (seconds) so polls on other workers see it; the final state always is
+BATCH_PUBLISH_INTERVAL = float(os.getenv("BATCH_PUBLISH_INTERVAL", "1.0"))
+
+# item -> (result, progress callback) ; progress callback receives finished node names
+RunItem = Callable[[Dict[str, Any], Callable[[str], None]], Awaitable[Dict[str, Any]]]
+
+
+class BatchJob:
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.id = uuid.uuid4().hex
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.items = [
+            {
+                "id": item.get("id") or str(idx),
+                "transcript": item["transcript"],
+                "user_id": item.get("user_id"),
+                "inputs": item.get("inputs"),
+                "status": "queued",
+                "nodes": [],
+                "result": None,
+                "error": None,
+                "latencyMs": None,
+            }
+            for idx, item in enumerate(items)
+        ]
+        self.task: Optional[asyncio.Task] = None
+        self.published: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.finished is not None:
+            return "done"
+        if any(item["status"] != "queued" for item in self.items):
+            return "running"
+        return "queued"
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"queued": 0, "running": 0, "done": 0, "error": 0}
+        for item in self.items:
+            counts[item["status"]] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobId": self.id,
+            "status": self.status,
+            "progress": self.counts(),
+            "items": self.items,
+        }
+
+
+class BatchScheduler:
+    """Runs many briefings concurrently under one global in-flight limit."""
+
+    def __init__(self, run_item: RunItem, max_concurrency: int = BATCH_MAX_CONCURRENCY):
+        self.run_item = run_item
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.jobs: Dict[str, BatchJob] = {}
+
+    async def _run_one(self, job: BatchJob, item: Dict[str, Any]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            item["status"] = "running"
+            await self._publish(job)
+            start = time.perf_counter()
+            try:
+                item["result"] = await self.run_item(item, item["nodes"].append)
+                item["status"] = "done"
+            except Exception as e:
+                logger.exception(f"Batch item {item['id']} failed")
+                item["error"] = str(e)
+                item["status"] = "error"
+            item["latencyMs"] = int((time.perf_counter() - start) * 1000)
+        await self._publish(job)
+
+    async def _publish(self, job: BatchJob, force: bool = False) -> None:
+        """Copy an async job's state to the shared backend so any worker can answer polls."""
+        if job.id not in self.jobs or not shared_state.is_shared():
+            return
+        now = time.monotonic()
+        if not force and job.published is not None and now - job.published < BATCH_PUBLISH_INTERVAL:
+            return
+        job.published = now
+        await shared_state.set_json("batch:" + job.id, job.to_dict(), BATCH_JOB_TTL)
+
+    async def run(self, job: BatchJob) -> BatchJob:
+        await asyncio.gather(*(self._run_one(job, item) for item in job.items))
+        job.finished = time.time()
+        await self._publish(job, force=True)
+        return job
+
+    async def submit(self, items: List[Dict[str, Any]]) -> BatchJob:
+        """Start a job in the background; poll it with get()."""
+        self._purge()
+        job = BatchJob(items)
+        self.jobs[job.id] = job
+        await self._publish(job, force=True)
+        job.task = asyncio.create_task(self.run(job))
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's state, from this worker or (shared backend) whichever worker runs it."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if shared_state.is_shared():
+            return await shared_state.get_json("batch:" + job_id)
+        return None
+
+    def _purge(self) -> None:
+        cutoff = time.time() - BATCH_JOB_TTL
+        for job_id, job in list(self.jobs.items()):
+            if job.finished is not None and job.finished < cutoff:
+                del self.jobs[job_id]
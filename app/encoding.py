@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from fastapi import Response
+from pydantic import BaseModel
+import gzip
+import json
+import logging
+import os
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Content negotiation for /summarize: JSON or MessagePack (Accept), gzip or
+# brotli (Accept-Encoding), and a `fields=` selector for trimmed responses
+RESPONSE_COMPRESSION_ENABLED = os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+# Smaller bodies are sent as-is: compressing them saves less than it costs
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+# Upper bound on paths in one `fields=` selector
+MAX_FIELDS = 32
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# brotli / msgpack are optional: without them the server only offers gzip / JSON
+_brotli: Any = None
+_msgpack: Any = None
+_checked: Dict[str, bool] = {}
+
+_stats = {
+    "json": 0,
+    "msgpack": 0,
+    "gzip": 0,
+    "br": 0,
+    "identity": 0,
+    "selected": 0,
+    "bytes_encoded": 0,
+    "bytes_sent": 0,
+}
+
+
+def _optional(name: str) -> Any:
+    global _brotli, _msgpack
+    if name not in _checked:
+        try:
+            if name == "brotli":
+                import brotli as _brotli
+            else:
+                import msgpack as _msgpack
+            _checked[name] = True
+        except ImportError:
+            logger.info(f"{name} not installed; {name} responses disabled")
+            _checked[name] = False
+    return _brotli if name == "brotli" else _msgpack
+
+
+def _parse(header: str) -> Dict[str, float]:
+    """'gzip;q=0.8, br' -> {"gzip": 0.8, "br": 1.0}"""
+    prefs: Dict[str, float] = {}
+    for part in header.split(","):
+        token, *params = [p.strip() for p in part.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        prefs[token.lower()] = q
+    return prefs
+
+
+def negotiate_format(accept: str) -> str:
+    """"msgpack" when the client prefers MessagePack (and it's installed), else "json"."""
+    prefs = _parse(accept or "")
+    msgpack_q = max((prefs.get(t, 0.0) for t in MSGPACK_TYPES), default=0.0)
+    json_q = max(prefs.get(JSON_TYPE, 0.0), prefs.get("application/*", 0.0), prefs.get("*/*", 0.0))
+    if msgpack_q > 0 and msgpack_q >= json_q and _optional("msgpack") is not None:
+        return "msgpack"
+    return "json"
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best of br / gzip the client accepts, or None."""
+    if not RESPONSE_COMPRESSION_ENABLED:
+        return None
+    prefs = _parse(accept_encoding or "")
+    wildcard = prefs.get("*", 0.0)
+    best, best_q = None, 0.0
+    # br first: on a tie it wins (smaller at similar cost)
+    for name in ("br", "gzip"):
+        q = prefs.get(name, wildcard)
+        if q > best_q and (name != "br" or _optional("brotli") is not None):
+            best, best_q = name, q
+    return best
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[List[str]]]:
+    """'result.summary,usage.total_tokens' -> [["result", "summary"], ["usage", "total_tokens"]].
+
+    Raises ValueError for malformed selectors.
+    """
+    if fields is None:
+        return None
+    paths = [p.strip() for p in fields.split(",") if p.strip()]
+    if not paths:
+        raise ValueError("fields must name at least one field, e.g. fields=result.summary")
+    if len(paths) > MAX_FIELDS:
+        raise ValueError(f"fields accepts at most {MAX_FIELDS} paths")
+    parsed = [path.split(".") for path in paths]
+    for path, keys in zip(paths, parsed):
+        if not all(keys):
+            raise ValueError(f"fields: malformed path {path!r}")
+    return parsed
+
+
+def wants(paths: Optional[List[List[str]]], key: str) -> bool:
+    """Whether the response needs top-level `key` (everything does without a selector)."""
+    return paths is None or any(keys[0] == key for keys in paths)
+
+
+def _pick(value: Any, keys: List[str]) -> Tuple[bool, Any]:
+    if not keys:
+        return True, value
+    if isinstance(value, list):
+        # applies to every item: steps.latencyMs -> [{"latencyMs": ...}, ...]
+        return True, [_pick(item, keys)[1] for item in value]
+    if isinstance(value, dict) and keys[0] in value:
+        found, picked = _pick(value[keys[0]], keys[1:])
+        return found, {keys[0]: picked} if found else None
+    return False, None
+
+
+def _merge(a: Any, b: Any) -> Any:
+    if isinstance(a, dict) and isinstance(b, dict):
+        merged = dict(a)
+        for key, value in b.items():
+            merged[key] = _merge(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(a, list) and isinstance(b, list):
+        return [_merge(x, y) for x, y in zip(a, b)]
+    return b
+
+
+def select_fields(payload: Dict[str, Any], paths: List[List[str]]) -> Dict[str, Any]:
+    """Keep only `paths` of `payload`; missing paths are left out."""
+    selected: Dict[str, Any] = {}
+    for keys in paths:
+        found, picked = _pick(payload, keys)
+        if found:
+            selected = _merge(selected, picked)
+    _stats["selected"] += 1
+    return selected
+
+
+def serialize(payload: Any, fmt: str = "json") -> bytes:
+    """Pydantic model or plain dict -> JSON / MessagePack bytes."""
+    if fmt == "msgpack":
+        if isinstance(payload, BaseModel):
+            payload = payload.model_dump(mode="json")
+        return _optional("msgpack").packb(payload)
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode()
+    # same output as FastAPI's JSONResponse
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return _optional("brotli").compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+    return body
+
+
+def encode_response(payload: Any, accept: str = "", accept_encoding: str = "") -> Response:
+    """Serialize and compress `payload` the way the request's Accept / Accept-Encoding ask for."""
+    fmt = negotiate_format(accept)
+    body = serialize(payload, fmt)
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= RESPONSE_COMPRESS_MIN_BYTES else None
+    sent = compress(body, encoding)
+    _stats[fmt] += 1
+    _stats[encoding or "identity"] += 1
+    _stats["bytes_encoded"] += len(body)
+    _stats["bytes_sent"] += len(sent)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    media_type = MSGPACK_TYPES[0] if fmt == "msgpack" else JSON_TYPE
+    return Response(content=sent, media_type=media_type, headers=headers)
+
+
+def encoding_stats() -> Dict[str, int]:
+    return dict(_stats)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+import hashlib
+import os
+import time
+
+from app.graph import shared_state
+from app.graph.records import terms
+from app.graph.router import normalize_transcript
+
+load_dotenv()
+
+# Reuse a synth answer while the transcript and the context it was given are unchanged
+SYNTH_CACHE_ENABLED = os.getenv("SYNTH_CACHE_ENABLED", "true").lower() == "true"
+SYNTH_CACHE_TTL = float(os.getenv("SYNTH_CACHE_TTL", "600"))
+SYNTH_CACHE_MAXSIZE = int(os.getenv("SYNTH_CACHE_MAXSIZE", "512"))
+# Also serve answers for reworded transcripts over the very same context
+SYNTH_CACHE_NEAR_DUP = os.getenv("SYNTH_CACHE_NEAR_DUP", "false").lower() == "true"
+SYNTH_CACHE_SIMILARITY = float(os.getenv("SYNTH_CACHE_SIMILARITY", "0.8"))
+
+
+class _Answer:
+    __slots__ = ("summary", "stored_at", "data_key", "terms")
+
+    def __init__(self, summary: str, stored_at: float, data_key: str, terms: frozenset):
+        self.summary = summary
+        self.stored_at = stored_at
+        self.data_key = data_key
+        self.terms = terms
+
+
+class AnswerCache:
+    """TTL/LRU cache of synth answers keyed on (prompt version, model, transcript, context fingerprint)."""
+
+    def __init__(
+        self,
+        ttl: float = SYNTH_CACHE_TTL,
+        maxsize: int = SYNTH_CACHE_MAXSIZE,
+        near_dup: bool = SYNTH_CACHE_NEAR_DUP,
+        similarity: float = SYNTH_CACHE_SIMILARITY,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.near_dup = near_dup
+        self.similarity = similarity
+        self._data: "OrderedDict[str, _Answer]" = OrderedDict()
+        # data key -> exact keys answered over that context
+        self._by_data: Dict[str, List[str]] = {}
+        self.stats = {"hits": 0, "near_hits": 0, "shared_hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def _keys(transcript: str, fingerprint: str, version: str, model: str) -> Tuple[str, str]:
+        data_key = hashlib.sha256(f"{version}\0{model}\0{fingerprint}".encode()).hexdigest()
+        key = hashlib.sha256(f"{data_key}\0{normalize_transcript(transcript)}".encode()).hexdigest()
+        return key, data_key
+
+    def get(self, transcript: str, fingerprint: str, version: str, model: str) -> Optional[Tuple[str, str]]:
+        """(summary, "exact" | "near") for a cached answer, else None."""
+        key, data_key = self._keys(transcript, fingerprint, version, model)
+        now = time.time()
+        entry = self._data.get(key)
+        if entry is not None and now - entry.stored_at <= self.ttl:
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.summary, "exact"
+
+        if self.near_dup:
+            query = terms(transcript)
+            for other in self._by_data.get(data_key, []):
+                candidate = self._data.get(other)
+                if candidate is None or now - candidate.stored_at > self.ttl or not (query or candidate.terms):
+                    continue
+                if len(query & candidate.terms) / len(query | candidate.terms) >= self.similarity:
+                    self._data.move_to_end(other)
+                    self.stats["near_hits"] += 1
+                    return candidate.summary, "near"
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, transcript: str, fingerprint: str, version: str, model: str, summary: str) -> None:
+        self._put(transcript, fingerprint, version, model, summary, time.time())
+        self.stats["stores"] += 1
+
+    def _put(self, transcript: str, fingerprint: str, version: str, model: str, summary: str, stored_at: float) -> None:
+        key, data_key = self._keys(transcript, fingerprint, version, model)
+        if key not in self._data:
+            self._by_data.setdefault(data_key, []).append(key)
+        self._data[key] = _Answer(summary, stored_at, data_key, terms(transcript))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            _, evicted = self._data.popitem(last=False)
+            self._forget(evicted.data_key)
+
+    async def aget(self, transcript: str, fingerprint: str, version: str, model: str) -> Optional[Tuple[str, str]]:
+        """`get`, falling back to exact answers stored by other workers (shared state backend)."""
+        cached = self.get(transcript, fingerprint, version, model)
+        if cached is not None or not shared_state.is_shared():
+            return cached
+        key, _ = self._keys(transcript, fingerprint, version, model)
+        raw = await shared_state.get_json("answer:" + key)
+        if raw is None or time.time() - raw[1] > self.ttl:
+            return None
+        self.stats["misses"] -= 1
+        self.stats["shared_hits"] += 1
+        self._put(transcript, fingerprint, version, model, raw[0], raw[1])
+        return raw[0], "exact"
+
+    async def aset(self, transcript: str, fingerprint: str, version: str, model: str, summary: str) -> None:
+        self.set(transcript, fingerprint, version, model, summary)
+        if shared_state.is_shared():
+            key, _ = self._keys(transcript, fingerprint, version, model)
+            await shared_state.set_json("answer:" + key, [summary, time.time()], self.ttl)
+
+    def _forget(self, data_key: str) -> None:
+        keys = [k for k in self._by_data.get(data_key, []) if k in self._data]
+        if keys:
+            self._by_data[data_key] = keys
+        else:
+            self._by_data.pop(data_key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._by_data.clear()
+
+
+# Lazy initialization - create cache only when needed
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = AnswerCache()
+    return _answer_cache
+
+
+def set_answer_cache(cache: Optional[AnswerCache]) -> None:
+    global _answer_cache
+    _answer_cache = cache
+
+
+def answer_cache_stats() -> Dict[str, int]:
+    cache = get_answer_cache()
+    return dict(cache.stats, size=len(cache._data))
@@ -0,0 +1,297 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import time
+from app.graph import replay, shared_state
+from app.graph.cache import get_response_cache, make_key
+from app.graph.singleflight import SingleFlight
+from app.graph.limits import provider_for_tool, provider_slot, record_failure
+from app.metrics import PROVIDER_ERRORS, PROVIDER_LATENCY
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Per-call timeout (seconds) for authorize / wait_for_completion / execute
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("ARCADE_TOOL_TIMEOUT", "20"))
+
+# How long (seconds) a completed authorization is trusted before re-checking
+AUTH_CACHE_TTL = float(os.getenv("ARCADE_AUTH_CACHE_TTL", "3600"))
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+# Concurrent identical fetches share one in-flight call
+SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+AUTH_ERROR_KINDS = {"UPSTREAM_RUNTIME_AUTH_ERROR", "TOOL_RUNTIME_CONTEXT_REQUIRED"}
+# Errors caused by the request (bad repo name, missing issue, invalid input):
+# the provider answered fine, so they don't count against its circuit breaker
+CALLER_ERROR_KINDS = {
+    "UPSTREAM_RUNTIME_BAD_REQUEST",
+    "UPSTREAM_RUNTIME_NOT_FOUND",
+    "UPSTREAM_RUNTIME_VALIDATION_ERROR",
+    "TOOL_RUNTIME_BAD_INPUT_VALUE",
+} | AUTH_ERROR_KINDS
+
+# Lazy initialization - create client only when needed
+_arcade_client = None
+
+# (user_id, tool_name) -> expiry timestamp of a completed authorization
+_auth_cache: Dict[Tuple[str, str], float] = {}
+_auth_stats = {"hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+
+_fetches = SingleFlight()
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when an Arcade call for a tool does not finish within its timeout."""
+
+    def __init__(self, message: str, step: str = "execute"):
+        super().__init__(message)
+        self.step = step
+        # a user who hasn't finished authorizing says nothing about the provider
+        self.provider_fault = step != "wait_for_completion"
+
+
+class ToolAuthError(RuntimeError):
+    """Raised when a tool keeps failing with an auth error after re-authorizing."""
+
+    provider_fault = False
+
+
+class ToolError(RuntimeError):
+    """Raised when a tool call returns a (non-auth) error instead of a value."""
+
+    def __init__(self, message: str, kind: Optional[str] = None, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = status_code
+        self.provider_fault = kind not in CALLER_ERROR_KINDS and not (
+            isinstance(status_code, int) and 400 <= status_code < 500 and status_code not in (408, 429)
+        )
+
+
+def get_arcade_client():
+    """Lazy initialization of the async Arcade client to avoid import-time errors"""
+    global _arcade_client
+    if _arcade_client is None:
+        from arcadepy import AsyncArcade
+
+        _arcade_client = AsyncArcade()
+    return _arcade_client
+
+
+def _sdk_auth_errors() -> Tuple[type, ...]:
+    # only evaluated when an exception is raised, so arcadepy stays unimported until needed
+    from arcadepy import AuthenticationError, PermissionDeniedError
+
+    return AuthenticationError, PermissionDeniedError
+
+
+def set_arcade_client(client) -> None:
+    """Swap the Arcade client (e.g. for a fake backend in benchmarks)."""
+    global _arcade_client
+    _arcade_client = client
+
+
+async def _with_timeout(coro, tool_name: str, step: str, timeout: float):
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"{tool_name} {step} timed out after {timeout}s")
+        raise ToolTimeoutError(f"{tool_name} {step} timed out after {timeout}s", step)
+
+
+def auth_cache_stats() -> Dict[str, int]:
+    """Hit/miss/invalidation counters for the authorization cache."""
+    return dict(_auth_stats, size=len(_auth_cache))
+
+
+def _auth_key(tool_name: str, user_id: str) -> str:
+    return f"auth:{user_id}:{tool_name}"
+
+
+async def invalidate_auth(tool_name: str, user_id: str) -> None:
+    if _auth_cache.pop((user_id, tool_name), None) is not None:
+        _auth_stats["invalidations"] += 1
+    if shared_state.is_shared():
+        await shared_state.delete(_auth_key(tool_name, user_id))
+
+
+def clear_auth_cache() -> None:
+    _auth_cache.clear()
+    for k in _auth_stats:
+        _auth_stats[k] = 0
+
+
+async def authorize_tool(tool_name: str, user_id: str, timeout: Optional[float] = None) -> None:
+    """Make sure `user_id` has authorized `tool_name`, waiting for completion if needed.
+
+    Completed authorizations are cached per (user_id, tool_name) for AUTH_CACHE_TTL,
+    and shared with other workers when a shared state backend is configured.
+    """
+    key = (user_id, tool_name)
+    expires = _auth_cache.get(key)
+    if expires is not None and expires > time.monotonic():
+        _auth_stats["hits"] += 1
+        return
+    if shared_state.is_shared():
+        # wall-clock expiry, comparable across workers and hosts
+        shared_expires = await shared_state.get_json(_auth_key(tool_name, user_id))
+        if shared_expires is not None and shared_expires > time.time():
+            _auth_cache[key] = time.monotonic() + shared_expires - time.time()
+            _auth_stats["shared_hits"] += 1
+            return
+    _auth_stats["misses"] += 1
+
+    timeout = timeout or DEFAULT_TOOL_TIMEOUT
+    client = get_arcade_client()
+
+    auth_response = await _with_timeout(
+        client.tools.authorize(tool_name=tool_name, user_id=user_id),
+        tool_name, "authorize", timeout,
+    )
+    if auth_response.status != "completed":
+        print(f"Click this link to authorize: {auth_response.url}")
+        # Wait for the authorization to complete
+        auth_response = await _with_timeout(
+            client.auth.wait_for_completion(auth_response),
+            tool_name, "wait_for_completion", timeout,
+        )
+    if auth_response.status == "completed":
+        _auth_cache[key] = time.monotonic() + AUTH_CACHE_TTL
+        if shared_state.is_shared():
+            await shared_state.set_json(_auth_key(tool_name, user_id), time.time() + AUTH_CACHE_TTL, AUTH_CACHE_TTL)
+
+
+def _is_auth_error(output) -> bool:
+    error = getattr(output, "error", None) if output is not None else None
+    return error is not None and error.kind in AUTH_ERROR_KINDS
+
+
+async def execute_tool(
+    tool_name: str,
+    tool_input: Dict[str, Any],
+    user_id: str,
+    timeout: Optional[float] = None,
+) -> Any:
+    """Authorize and execute an Arcade tool without blocking the event loop.
+
+    On an auth error the cached authorization is dropped and the call retried once.
+    Returns `response.output.value` (may be None).
+    """
+    start = time.perf_counter()
+    try:
+        return await _execute_tool(tool_name, tool_input, user_id, timeout)
+    except Exception:
+        PROVIDER_ERRORS.inc(provider=tool_name)
+        raise
+    finally:
+        PROVIDER_LATENCY.observe(time.perf_counter() - start, provider=tool_name)
+
+
+async def _execute_tool(tool_name: str, tool_input: Dict[str, Any], user_id: str, timeout: Optional[float]) -> Any:
+    timeout = timeout or DEFAULT_TOOL_TIMEOUT
+    client = get_arcade_client()
+    provider = provider_for_tool(tool_name)
+
+    for attempt in range(2):
+        start = time.perf_counter()
+        try:
+            await authorize_tool(tool_name, user_id, timeout=timeout)
+        except ToolTimeoutError as e:
+            # outside the slot, but a stalled authorize counts like a stalled execute
+            if e.provider_fault:
+                record_failure(provider, time.perf_counter() - start)
+            raise
+        try:
+            # the slot covers only the provider call, not authorization (a user may take a while)
+            async with provider_slot(provider):
+                response = await _with_timeout(
+                    client.tools.execute(tool_name=tool_name, input=tool_input, user_id=user_id),
+                    tool_name, "execute", timeout,
+                )
+                output = response.output
+                if _is_auth_error(output):
+                    logger.warning(f"{tool_name} auth error for {user_id}: {output.error.message}")
+                    raise ToolAuthError(f"{tool_name}: {output.error.message}")
+                if getattr(output, "error", None) is not None:
+                    # not cached; counted against the provider's health unless it's the caller's fault
+                    error = output.error
+                    raise ToolError(f"{tool_name}: {error.message}", getattr(error, "kind", None), getattr(error, "status_code", None))
+        except (ToolAuthError, *_sdk_auth_errors()) as e:
+            await invalidate_auth(tool_name, user_id)
+            if attempt and isinstance(e, ToolAuthError):
+                raise
+            if attempt:
+                raise ToolAuthError(f"{tool_name}: {e}") from e
+            continue
+        return output.value if output is not None else None
+
+
+async def fetch_tool(
+    source: str,
+    tool_name: str,
+    tool_input: Dict[str, Any],
+    user_id: str,
+    timeout: Optional[float] = None,
+    refresh: bool = False,
+) -> Any:
+    """`execute_tool` behind the shared response cache (TTL per `source`).
+
+    `refresh` skips cached values but stores the new one (pre-warming).
+
+    Concurrent identical fetches (same tool, input and user) share one call,
+    across workers too when a shared state backend is configured.
+    """
+    key = make_key(tool_name, tool_input, user_id)
+
+    async def call():
+        if shared_state.is_shared():
+            return await shared_state.shared_do(
+                key,
+                lambda: execute_tool(tool_name, tool_input, user_id, timeout=timeout),
+                # a lease, renewed while the call (slot wait, auth, execute) is in flight
+                ttl=timeout or DEFAULT_TOOL_TIMEOUT,
+            )
+        return await execute_tool(tool_name, tool_input, user_id, timeout=timeout)
+
+    async def fetch():
+        if not SINGLEFLIGHT_ENABLED:
+            return await execute_tool(tool_name, tool_input, user_id, timeout=timeout)
+        return await _fetches.do(key, call)
+
+    async def cached():
+        if not RESPONSE_CACHE_ENABLED:
+            return await fetch()
+        return await get_response_cache().get_or_fetch(source, key, fetch, refresh=refresh)
+
+    return await _recorded(source, tool_name, tool_input, cached)
+
+
+async def execute_recorded(
+    source: str,
+    tool_name: str,
+    tool_input: Dict[str, Any],
+    user_id: str,
+    timeout: Optional[float] = None,
+) -> Any:
+    """`execute_tool` for callers that bypass the response cache (incremental sync), recorded for replay."""
+    return await _recorded(source, tool_name, tool_input, lambda: execute_tool(tool_name, tool_input, user_id, timeout=timeout))
+
+
+async def _recorded(source: str, tool_name: str, tool_input: Dict[str, Any], call) -> Any:
+    start = time.perf_counter()
+    try:
+        value = await call()
+    except BaseException as e:
+        replay.record_tool(source, tool_name, tool_input, None, str(e) or type(e).__name__, time.perf_counter() - start)
+        raise
+    replay.record_tool(source, tool_name, tool_input, value, None, time.perf_counter() - start)
+    return value
+
+
+def singleflight_stats() -> Dict[str, int]:
+    return dict(_fetches.stats, inflight=_fetches.inflight())
@@ -0,0 +1,249 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.graph import shared_state
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Per-source freshness (seconds); after the TTL an entry is served stale for
+# up to CACHE_STALE_WHILE_REVALIDATE seconds while a background refresh runs.
+DEFAULT_TTLS = {
+    "github": float(os.getenv("CACHE_TTL_GITHUB", "120")),
+    "jira": float(os.getenv("CACHE_TTL_JIRA", "120")),
+    "meeting_notes": float(os.getenv("CACHE_TTL_MEETING_NOTES", "300")),
+}
+DEFAULT_TTL = float(os.getenv("CACHE_TTL_DEFAULT", "120"))
+STALE_WHILE_REVALIDATE = float(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "600"))
+
+# (value, stored_at wall-clock timestamp)
+Entry = Tuple[Any, float]
+
+
+def make_key(tool_name: str, tool_input: Dict[str, Any], user_id: str) -> str:
+    """Stable cache key for (tool, normalized input, user)."""
+    normalized = {
+        k: v.strip() if isinstance(v, str) else v
+        for k, v in tool_input.items()
+        if v is not None
+    }
+    raw = json.dumps([tool_name, normalized, user_id.strip().lower()], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class MemoryLRUBackend:
+    """In-process LRU storage for cache entries."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Entry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: Entry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class DiskBackend:
+    """Local-disk storage, one JSON file per key (survives restarts)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Entry]:
+        try:
+            with open(self._path(key)) as f:
+                raw = json.load(f)
+            return raw["value"], raw["stored_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, entry: Entry) -> None:
+        value, stored_at = entry
+        tmp = self._path(key) + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"value": value, "stored_at": stored_at}, f, default=str)
+            os.replace(tmp, self._path(key))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Disk cache write failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self.delete(name[:-5])
+
+
+class ResponseCache:
+    """TTL cache for source fetches with stale-while-revalidate.
+
+    With a shared state backend (SHARED_STATE_BACKEND=redis) local misses fall
+    through to the entries other workers stored, and every store is published.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_while_revalidate: float = STALE_WHILE_REVALIDATE,
+    ):
+        self.backend = backend if backend is not None else MemoryLRUBackend()
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "shared_hits": 0, "refreshes": 0, "refresh_errors": 0}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    async def get_or_fetch(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]], refresh: bool = False) -> Any:
+        """Return a cached value for `key`, calling `fetch` on a miss.
+
+        Fresh entries are returned as-is; stale entries (within the
+        stale-while-revalidate window) are returned immediately and refreshed
+        in the background. `refresh` always fetches (and stores) a new value.
+        """
+        entry = None if refresh else self.backend.get(key)
+        if entry is None and not refresh and shared_state.is_shared():
+            raw = await shared_state.get_json("response:" + key)
+            if raw is not None:
+                entry = (raw[0], raw[1])
+                self.backend.set(key, entry)
+                self.stats["shared_hits"] += 1
+        now = time.time()
+        if entry is not None:
+            value, stored_at = entry
+            age = now - stored_at
+            ttl = self.ttl_for(source)
+            if age <= ttl:
+                self.stats["hits"] += 1
+                return value
+            if age <= ttl + self.stale_while_revalidate:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(source, key, fetch)
+                return value
+
+        self.stats["refreshes" if refresh else "misses"] += 1
+        value = await fetch()
+        await self._store(source, key, value)
+        return value
+
+    async def _store(self, source: str, key: str, value: Any) -> None:
+        stored_at = time.time()
+        self.backend.set(key, (value, stored_at))
+        if shared_state.is_shared():
+            ttl = self.ttl_for(source) + self.stale_while_revalidate
+            await shared_state.set_json("response:" + key, [value, stored_at], ttl)
+
+    def _refresh_in_background(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                value = await fetch()
+                await self._store(source, key, value)
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                self.stats["refresh_errors"] += 1
+                logger.warning(f"Background cache refresh failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+class IdentityMemo:
+    """Memoize a derived value per source object (by identity, LRU-bounded).
+
+    Cached payloads are shared objects, so derived data (parsed issues,
+    prepared context items) only needs computing once per payload.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Tuple[Any, Any]]" = OrderedDict()
+
+    def get_or_compute(self, obj: Any, compute: Callable[[Any], Any]) -> Any:
+        key = id(obj)
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is obj:
+            self._data.move_to_end(key)
+            return entry[1]
+        value = compute(obj)
+        self._data[key] = (obj, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def get_or_compute_many(self, objs: Tuple[Any, ...], compute: Callable[..., Any]) -> Any:
+        """Memoize compute(*objs) on the identities of all of `objs` (e.g. merged payloads)."""
+        key = tuple(id(o) for o in objs)
+        entry = self._data.get(key)
+        if entry is not None and all(a is b for a, b in zip(entry[0], objs)):
+            self._data.move_to_end(key)
+            return entry[1]
+        value = compute(*objs)
+        self._data[key] = (objs, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+
+# Lazy initialization - create cache only when needed
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Shared response cache; backend picked by RESPONSE_CACHE_BACKEND (memory|disk)."""
+    global _response_cache
+    if _response_cache is None:
+        if os.getenv("RESPONSE_CACHE_BACKEND", "memory") == "disk":
+            backend = DiskBackend(os.getenv("RESPONSE_CACHE_DIR", ".cache/responses"))
+        else:
+            backend = MemoryLRUBackend(int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1024")))
+        _response_cache = ResponseCache(backend)
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    global _response_cache
+    _response_cache = cache
@@ -0,0 +1,211 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+import hashlib
+import os
+import time
+
+from app.graph.records import (
+    JiraIssue,
+    PullRequest,
+    normalize_issues,
+    normalize_notes,
+    normalize_pull_requests,
+    terms as _terms,
+)
+
+load_dotenv()
+
+# Approximate prompt budget for the synth context (tokens ≈ chars / 4)
+SYNTH_TOKEN_BUDGET = int(os.getenv("SYNTH_TOKEN_BUDGET", "2000"))
+# Transcript-independent item preparation is shared between briefings over the
+# same fetched payloads for this many seconds
+CONTEXT_SHARE_WINDOW = float(os.getenv("CONTEXT_SHARE_WINDOW", "60"))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _score(query: set, terms: frozenset) -> float:
+    if not query:
+        return 0.0
+    return len(query & terms) / len(query)
+
+
+def _related_issue(pr: PullRequest, issues: List[JiraIssue], keys: frozenset) -> Optional[str]:
+    """Jira key a PR duplicates (mentions the key, or near-identical title)."""
+    for key in pr.jira_keys:
+        if key in keys:
+            return key
+    pr_terms = pr.title_terms
+    if not pr_terms:
+        return None
+    for issue in issues:
+        terms = issue.title_terms
+        if terms and len(pr_terms & terms) / len(pr_terms | terms) >= 0.6:
+            return issue.key
+    return None
+
+
+# (section, position, lines, terms, token cost)
+Item = Tuple[int, int, List[str], frozenset, int]
+
+
+class _Prepared:
+    __slots__ = ("sources", "items", "prs", "issues", "notes", "compressed", "expires")
+
+    def __init__(self, sources, items, prs, issues, notes, compressed, expires):
+        self.sources = sources
+        self.items = items
+        self.prs = prs
+        self.issues = issues
+        self.notes = notes
+        self.compressed = compressed
+        self.expires = expires
+
+
+_prepared: "OrderedDict[Tuple[Any, ...], _Prepared]" = OrderedDict()
+_share_stats = {"hits": 0, "misses": 0}
+
+
+def _cost(lines: List[str]) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)
+
+
+def _payload_id(payload: Any) -> Any:
+    # graph state merges (operator.or_) copy the payload dict but not the lists inside it
+    if isinstance(payload, dict):
+        return tuple((key, id(value)) for key, value in payload.items())
+    return id(payload)
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(a[key] is b[key] for key in a)
+    return a is b
+
+
+def prepare_items(github: Optional[Dict[str, Any]], jira: Optional[Dict[str, Any]], meeting_notes: Any) -> _Prepared:
+    """Render, tokenize and dedupe every item once; shared while the payloads are unchanged.
+
+    Payloads come out of the response cache / single-flight, so concurrent
+    briefings over the same team data see the very same objects. Fetch nodes
+    hand over normalized records (app/graph/records.py); raw Arcade payloads
+    are normalized here.
+    """
+    sources = (github, jira, meeting_notes)
+    key = tuple(_payload_id(source) for source in sources)
+    now = time.monotonic()
+    cached = _prepared.get(key)
+    if cached is not None and cached.expires > now and all(_same(a, b) for a, b in zip(cached.sources, sources)):
+        _share_stats["hits"] += 1
+        return cached
+    _share_stats["misses"] += 1
+
+    github_data = normalize_pull_requests(github) if github else {"pull_requests": [], "changed": []}
+    jira_data = normalize_issues(jira) if jira else {"issues": [], "changed": []}
+    prs = github_data["pull_requests"]
+    issues = jira_data["issues"]
+    notes = normalize_notes(meeting_notes)["sections"]
+    issue_keys = frozenset(issue.key for issue in issues)
+    # keys reported by incremental sync
+    changed_prs = set(github_data["changed"])
+    changed_issues = set(jira_data["changed"])
+
+    items: List[Item] = []
+    compressed = 0
+    for pos, pr in enumerate(prs):
+        related = _related_issue(pr, issues, issue_keys) if issues else None
+        compressed += related is not None
+        lines = pr.render(pos + 1, related, pr.ref in changed_prs)
+        items.append((0, pos, lines, pr.terms, _cost(lines)))
+    for pos, issue in enumerate(issues):
+        lines = issue.render(pos + 1, changed=issue.key in changed_issues)
+        items.append((1, pos, lines, issue.terms, _cost(lines)))
+    for pos, section in enumerate(notes):
+        items.append((2, pos, [section.text], section.terms, _cost([section.text])))
+
+    prepared = _Prepared(sources, items, len(prs), len(issues), len(notes), compressed, now + CONTEXT_SHARE_WINDOW)
+    _prepared[key] = prepared
+    while len(_prepared) > 64:
+        _prepared.popitem(last=False)
+    return prepared
+
+
+def context_share_stats() -> Dict[str, int]:
+    return dict(_share_stats, size=len(_prepared))
+
+
+def build_context(
+    transcript: str,
+    github: Optional[Dict[str, Any]],
+    jira: Optional[Dict[str, Any]],
+    meeting_notes: Any,
+    budget: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Assemble the synth prompt context within a token budget.
+
+    PRs, Jira issues and meeting-note chunks are ranked by term overlap with the
+    transcript and added greedily until the budget is spent; PRs that duplicate a
+    Jira ticket are compressed. Output keeps source order. Returns (context, stats).
+    """
+    budget = SYNTH_TOKEN_BUDGET if budget is None else budget
+    query = _terms(transcript or "")
+    prepared = prepare_items(github, jira, meeting_notes)
+
+    header = [f"Meeting Prep Summary for: '{transcript}'\n", "=" * 50]
+    used = sum(estimate_tokens(part) for part in header)
+
+    # ties keep the original order (sources first, then position)
+    ranked = sorted(prepared.items, key=lambda item: (-_score(query, item[3]), item[0], item[1]))
+    selected: List[Item] = []
+    for item in ranked:
+        cost = item[4]
+        if used + cost > budget and selected:
+            continue
+        selected.append(item)
+        used += cost
+    selected.sort(key=lambda item: (item[0], item[1]))
+
+    by_section: Dict[int, List[List[str]]] = {0: [], 1: [], 2: []}
+    for section, _, lines, _, _ in selected:
+        by_section[section].append(lines)
+
+    parts = list(header)
+    if github:
+        if prepared.prs:
+            kept = by_section[0]
+            parts.append("\n".join([f"GitHub - Showing {len(kept)} of {prepared.prs} pull request(s):"] + [l for ls in kept for l in ls]))
+        else:
+            parts.append("GitHub - No pull requests found.")
+    else:
+        parts.append("GitHub - No data available.")
+
+    if jira:
+        if prepared.issues:
+            kept = by_section[1]
+            parts.append("\n".join([f"Jira - Showing {len(kept)} of {prepared.issues} issue(s):"] + [l for ls in kept for l in ls]))
+        else:
+            parts.append("Jira - No issues found.")
+    else:
+        parts.append("Jira - No data available.")
+
+    if prepared.notes:
+        parts.append("Meeting notes:\n" + "\n\n".join(ls[0] for ls in by_section[2]))
+    else:
+        parts.append("Meeting notes - No data available.")
+
+    context = "\n\n".join(parts)
+    # what the model is shown besides the transcript itself
+    data = "\n\n".join(parts[len(header):])
+    stats = {
+        "budgetTokens": budget,
+        "contextTokens": estimate_tokens(context),
+        "itemsConsidered": len(prepared.items),
+        "itemsIncluded": len(selected),
+        "prsCompressed": prepared.compressed,
+        "fingerprint": hashlib.sha256(data.encode()).hexdigest()[:16],
+    }
+    return context, stats
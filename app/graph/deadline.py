@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+from dotenv import load_dotenv
+import asyncio
+import os
+import time
+
+load_dotenv()
+
+# Per-request latency budget (ms); 0 disables. Overridable per request
+# (X-Deadline-Ms header or "deadline_ms" body field).
+REQUEST_DEADLINE_MS = int(os.getenv("REQUEST_DEADLINE_MS", "0"))
+# Part of the budget kept for node_synth; fetches must finish before it
+DEADLINE_SYNTH_RESERVE_MS = int(os.getenv("DEADLINE_SYNTH_RESERVE_MS", "2500"))
+# ...but never more than this share of the budget, so tight deadlines still fetch
+DEADLINE_SYNTH_RESERVE_FRACTION = float(os.getenv("DEADLINE_SYNTH_RESERVE_FRACTION", "0.3"))
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's latency budget ran out before this step finished."""
+
+
+def deadline_at(deadline_ms: Optional[int]) -> Optional[float]:
+    """Absolute (monotonic) deadline for a budget in ms; None when unbounded."""
+    ms = REQUEST_DEADLINE_MS if deadline_ms is None else deadline_ms
+    return time.monotonic() + ms / 1000 if ms and ms > 0 else None
+
+
+def synth_reserve_ms(deadline_ms: Optional[int]) -> float:
+    """Synth's share of a budget: DEADLINE_SYNTH_RESERVE_MS, capped at DEADLINE_SYNTH_RESERVE_FRACTION of it."""
+    ms = REQUEST_DEADLINE_MS if deadline_ms is None else deadline_ms
+    return min(DEADLINE_SYNTH_RESERVE_MS, DEADLINE_SYNTH_RESERVE_FRACTION * ms)
+
+
+def remaining(state: Mapping[str, Any], reserve_ms: Optional[float] = None) -> Optional[float]:
+    """Seconds left before synth has to start, or None without a deadline."""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    if reserve_ms is None:
+        reserve_ms = state.get("synth_reserve_ms", DEADLINE_SYNTH_RESERVE_MS)
+    return max(deadline - time.monotonic() - reserve_ms / 1000, 0.0)
+
+
+async def within(state: Mapping[str, Any], fn: Callable[[], Awaitable[T]], reserve_ms: Optional[float] = None) -> T:
+    """Run fn() but cancel it when the request's budget (minus the reserve) runs out.
+
+    Raises DeadlineExceeded on expiry; timeouts raised by fn itself pass through.
+    """
+    budget = remaining(state, reserve_ms)
+    if budget is None:
+        return await fn()
+    try:
+        async with asyncio.timeout(budget) as scope:
+            return await fn()
+    except TimeoutError:
+        if scope.expired():
+            raise DeadlineExceeded(f"deadline exceeded after {budget * 1000:.0f} ms") from None
+        raise
@@ -0,0 +1,298 @@
+from __future__ import annotations
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import time
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Global per-provider concurrency caps, shared by /summarize, batches and pre-warming
+PROVIDER_LIMITS: Dict[str, int] = {
+    "openai": int(os.getenv("PROVIDER_LIMIT_OPENAI", os.getenv("LLM_MAX_CONCURRENCY", "16"))),
+    "anthropic": int(os.getenv("PROVIDER_LIMIT_ANTHROPIC", "8")),
+    "github": int(os.getenv("PROVIDER_LIMIT_GITHUB", "8")),
+    "jira": int(os.getenv("PROVIDER_LIMIT_JIRA", "8")),
+    "notion": int(os.getenv("PROVIDER_LIMIT_NOTION", "4")),
+}
+DEFAULT_LIMIT = int(os.getenv("PROVIDER_LIMIT_DEFAULT", "8"))
+
+# AIMD: the cap above is the ceiling; errors and latency spikes shrink the
+# live limit multiplicatively, healthy calls grow it back by ~1 per window
+ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() == "true"
+AIMD_DECREASE = float(os.getenv("AIMD_DECREASE", "0.5"))
+# a call slower than this multiple of the latency EWMA counts as a spike
+AIMD_LATENCY_TOLERANCE = float(os.getenv("AIMD_LATENCY_TOLERANCE", "2.0"))
+EWMA_ALPHA = 0.2
+
+# Circuit breaker per health key (provider, or LLM role)
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_CONSECUTIVE_FAILURES = int(os.getenv("CIRCUIT_CONSECUTIVE_FAILURES", "5"))
+# seconds an open circuit rejects calls before letting one probe through
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "30"))
+
+# Arcade toolkit prefix -> provider
+TOOLKIT_PROVIDERS = {"Github": "github", "Jira": "jira", "NotionToolkit": "notion"}
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(f"circuit open for {key} (retry in {retry_in:.0f}s)")
+        self.key = key
+        self.retry_in = retry_in
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter whose limit moves between 1 and `max_limit` (AIMD)."""
+
+    def __init__(self, max_limit: int, adaptive: bool = ADAPTIVE_CONCURRENCY):
+        self.max_limit = max_limit
+        self.adaptive = adaptive
+        self.limit = float(max_limit)
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if self.active < int(self.limit) and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # granted just as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def on_success(self) -> None:
+        if self.adaptive:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_error(self) -> None:
+        """An error or latency spike: back off multiplicatively."""
+        if self.adaptive:
+            self.limit = max(1.0, self.limit * AIMD_DECREASE)
+
+
+class ProviderHealth:
+    """Error rate / latency EWMA for one dependency, with a circuit breaker."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.ewma_ms: Optional[float] = None
+        self.outcomes: Deque[bool] = deque(maxlen=CIRCUIT_WINDOW)
+        self.consecutive_failures = 0
+        self.probing = False
+        self.opens = 0
+
+    def retry_in(self, now: float) -> float:
+        return max(self.opened_at + CIRCUIT_COOLDOWN - now, 0.0)
+
+    def is_open(self, now: Optional[float] = None) -> bool:
+        """True while calls are being rejected (open and still cooling down)."""
+        return self.state == OPEN and self.retry_in(time.monotonic() if now is None else now) > 0
+
+    def allow(self) -> bool:
+        if not CIRCUIT_BREAKER_ENABLED or self.state == CLOSED:
+            return True
+        if self.is_open():
+            return False
+        # cooled down (or half-open): one probe at a time decides
+        if self.probing:
+            return False
+        self.state = HALF_OPEN
+        self.probing = True
+        return True
+
+    def is_slow(self, latency: float) -> bool:
+        """A latency spike relative to this key's own EWMA (roles differ a lot)."""
+        return self.ewma_ms is not None and latency * 1000 > self.ewma_ms * AIMD_LATENCY_TOLERANCE
+
+    def abandon(self) -> None:
+        """The call was cancelled: no verdict."""
+        self.probing = False
+
+    def record(self, ok: bool, latency: float) -> None:
+        self.probing = False
+        self.outcomes.append(ok)
+        latency_ms = latency * 1000
+        self.ewma_ms = latency_ms if self.ewma_ms is None else EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self.ewma_ms
+        if ok:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.key} closed")
+                self.state = CLOSED
+                self.outcomes.clear()
+            return
+
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self._tripped():
+            if self.state != OPEN:
+                logger.warning(f"Circuit for {self.key} opened (error rate {self.error_rate:.0%})")
+                self.opens += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def _tripped(self) -> bool:
+        if self.consecutive_failures >= CIRCUIT_CONSECUTIVE_FAILURES:
+            return True
+        return len(self.outcomes) >= CIRCUIT_MIN_CALLS and self.error_rate >= CIRCUIT_FAILURE_RATE
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "errorRate": round(self.error_rate, 3),
+            "latencyEwmaMs": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "consecutiveFailures": self.consecutive_failures,
+            "opens": self.opens,
+        }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_health: Dict[str, ProviderHealth] = {}
+
+
+def provider_for_tool(tool_name: str) -> str:
+    return TOOLKIT_PROVIDERS.get(tool_name.split(".", 1)[0], tool_name.split(".", 1)[0].lower())
+
+
+def provider_fault(error: BaseException) -> bool:
+    """Whether a failed call counts against the provider's health.
+
+    Errors caused by the request or the user (not found, bad input, auth)
+    don't: one user's bad repo name must not open the circuit for everyone.
+    Exceptions say so with a `provider_fault` attribute; otherwise a 4xx
+    `status_code` (other than 408 / 429) is the caller's fault.
+    """
+    fault = getattr(error, "provider_fault", None)
+    if fault is not None:
+        return bool(fault)
+    status = getattr(error, "status_code", None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status not in (408, 429))
+
+
+def get_health(key: str) -> ProviderHealth:
+    health = _health.get(key)
+    if health is None:
+        health = _health[key] = ProviderHealth(key)
+    return health
+
+
+def circuit_open(key: str) -> bool:
+    """Whether calls to `key` are currently short-circuited (lets the router skip it)."""
+    health = _health.get(key)
+    return CIRCUIT_BREAKER_ENABLED and health is not None and health.is_open()
+
+
+def record_failure(key: str, latency: float) -> None:
+    """A provider failure seen outside provider_slot (e.g. a timed-out authorize)."""
+    if CIRCUIT_BREAKER_ENABLED:
+        health = get_health(key)
+        if not health.is_open():
+            health.record(False, latency)
+
+
+@asynccontextmanager
+async def provider_slot(provider: str, key: Optional[str] = None):
+    """Hold one of `provider`'s concurrency slots for the duration of a call.
+
+    The outcome feeds the provider's adaptive limit and the circuit breaker for
+    `key` (defaults to the provider); failures the caller caused (see
+    provider_fault) don't count. An open circuit raises CircuitOpenError
+    without waiting for a slot.
+    """
+    health = get_health(key or provider)
+    if not health.allow():
+        raise CircuitOpenError(health.key, health.retry_in(time.monotonic()))
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limiter = _limiters[provider] = AdaptiveLimiter(PROVIDER_LIMITS.get(provider, DEFAULT_LIMIT))
+    try:
+        await limiter.acquire()
+    except asyncio.CancelledError:
+        health.abandon()
+        raise
+
+    start = time.perf_counter()
+    try:
+        yield
+    except asyncio.CancelledError:
+        latency = time.perf_counter() - start
+        if health.is_slow(latency):
+            # given up on (deadline) after running far longer than usual: count it as slow
+            health.record(False, latency)
+            limiter.on_error()
+        else:
+            health.abandon()
+        raise
+    except Exception as e:
+        if provider_fault(e):
+            health.record(False, time.perf_counter() - start)
+            limiter.on_error()
+        else:
+            health.abandon()
+        raise
+    else:
+        latency = time.perf_counter() - start
+        slow = health.is_slow(latency)
+        health.record(True, latency)
+        if slow:
+            limiter.on_error()
+        else:
+            limiter.on_success()
+    finally:
+        limiter.release()
+
+
+def provider_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        provider: {
+            "limit": int(limiter.limit),
+            "maxLimit": limiter.max_limit,
+            "active": limiter.active,
+            "waiting": limiter.waiting,
+        }
+        for provider, limiter in _limiters.items()
+    }
+
+
+def health_stats() -> Dict[str, Dict[str, Any]]:
+    return {key: health.to_dict() for key, health in _health.items()}
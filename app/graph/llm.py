@@ -0,0 +1,155 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from dotenv import load_dotenv
+import logging
+import os
+import time
+
+from app.graph import replay
+from app.graph.limits import provider_slot
+from app.graph.tracing import record_usage
+from app.metrics import PROVIDER_ERRORS, PROVIDER_LATENCY
+
+if TYPE_CHECKING:
+    import httpx
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool / concurrency settings for all LLM calls
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+# Retries use the OpenAI SDK's exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+# Fallback provider when OpenAI is rate-limited, erroring or too slow
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "claude-3-5-haiku-latest")
+LLM_FALLBACK_ENABLED = os.getenv("LLM_FALLBACK_ENABLED", "true").lower() == "true" and bool(
+    os.getenv("ANTHROPIC_API_KEY")
+)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+
+# role -> model settings
+LLM_ROLES: Dict[str, Dict[str, Any]] = {
+    "coordinator": {"model": "gpt-4o-mini", "temperature": 0},
+    "synth": {"model": "gpt-4o-mini", "temperature": 1},
+}
+
+_http_client: Optional[httpx.AsyncClient] = None
+_llms: Dict[str, Any] = {}
+_fallbacks: Dict[str, Any] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled async HTTP client shared by every OpenAI-compatible model."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # provider SDKs are imported on first use to keep cold start short
+        import httpx
+        import openai
+
+        # openai's default client keeps the SDK's transport tuning, just with our pool limits
+        _http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT),
+        )
+    return _http_client
+
+
+def _build_llm(role: str):
+    from langchain_openai import ChatOpenAI
+
+    settings = LLM_ROLES[role]
+    return ChatOpenAI(
+        model=settings["model"],
+        temperature=settings["temperature"],
+        max_retries=LLM_MAX_RETRIES,
+        timeout=LLM_TIMEOUT,
+        base_url=OPENAI_BASE_URL,
+        http_async_client=get_http_client(),
+    )
+
+
+def _build_fallback(role: str):
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(
+        model=LLM_FALLBACK_MODEL,
+        temperature=LLM_ROLES[role]["temperature"],
+        max_retries=LLM_MAX_RETRIES,
+        default_request_timeout=LLM_TIMEOUT,
+    )
+
+
+def get_llm(role: str):
+    """Module-level LLM for `role` ("coordinator" or "synth"), built once and reused."""
+    llm = _llms.get(role)
+    if llm is None:
+        llm = _llms[role] = _build_llm(role)
+    return llm
+
+
+def get_fallback_llm(role: str):
+    """Anthropic model tried when `role`'s OpenAI call fails, or None."""
+    if role not in _fallbacks:
+        _fallbacks[role] = _build_fallback(role) if LLM_FALLBACK_ENABLED else None
+    return _fallbacks[role]
+
+
+def set_llm(role: str, llm) -> None:
+    """Override the model used for `role` (e.g. a stub in benchmarks); overrides have no fallback."""
+    if llm is None:
+        _llms.pop(role, None)
+        _fallbacks.pop(role, None)
+    else:
+        _llms[role] = llm
+        _fallbacks[role] = None
+
+
+def set_fallback_llm(role: str, llm) -> None:
+    _fallbacks[role] = llm
+
+
+async def _ainvoke(provider: str, key: str, llm, messages: List[Dict[str, str]]):
+    async with provider_slot(provider, key):
+        return await llm.ainvoke(messages)
+
+
+async def ainvoke_llm(role: str, messages: List[Dict[str, str]]):
+    """Invoke the shared model for `role`, bounded by the global OpenAI concurrency cap.
+
+    When OpenAI fails (or its circuit is open) the Anthropic fallback is tried
+    under its own cap and circuit, so its outcome never counts for OpenAI.
+    """
+    start = time.perf_counter()
+    try:
+        try:
+            resp = await _ainvoke("openai", f"llm:{role}", get_llm(role), messages)
+        except Exception as e:
+            fallback = get_fallback_llm(role)
+            if fallback is None:
+                raise
+            logger.warning(f"{role} LLM failed ({e}), falling back to {LLM_FALLBACK_MODEL}")
+            resp = await _ainvoke("anthropic", f"llm:{role}:fallback", fallback, messages)
+    except Exception as e:
+        PROVIDER_ERRORS.inc(provider=f"llm:{role}")
+        replay.record_llm(role, messages, None, str(e) or type(e).__name__, time.perf_counter() - start)
+        raise
+    finally:
+        PROVIDER_LATENCY.observe(time.perf_counter() - start, provider=f"llm:{role}")
+    replay.record_llm(role, messages, resp, None, time.perf_counter() - start)
+    record_usage(role, getattr(resp, "usage_metadata", None))
+    return resp
+
+
+async def aclose_llm_clients() -> None:
+    """Close the pooled HTTP client (call on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    _llms.clear()
+    _fallbacks.clear()
@@ -1,17 +1,24 @@
 from __future__ import annotations
 from typing import Any, Dict, TypedDict, List, Annotated
-from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
-from pydantic import BaseModel
 import logging
 import asyncio
 import json
 import operator
-import re
-from arcadepy import Arcade
-from langchain_anthropic import ChatAnthropic
+import time
+import uuid
+from app.graph.arcade_tools import fetch_tool
+from app.graph.llm import LLM_ROLES, ainvoke_llm
+from app.graph.answer_cache import SYNTH_CACHE_ENABLED, get_answer_cache
+from app.graph.router import classify_by_rules, normalize_transcript, remember, route_locally
+from app.graph.deadline import DeadlineExceeded, within
+from app.graph.limits import CircuitOpenError, circuit_open
+from app.graph import speculative
+from app.graph.tracing import annotate, traced
+from app.graph.context import build_context
+from app.graph.cache import IdentityMemo
+from app.graph import notes_index, snapshots, sources
+from app.graph.records import JiraIssue, normalize_notes, normalize_pull_requests
 
 # initialize dotenv first (before any other imports that need env vars)
 load_dotenv()
@@ -19,30 +26,66 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Lazy initialization - create client only when needed
-_arcade_client = None
-
-def get_arcade_client():
-    """Lazy initialization of Arcade client to avoid import-time errors"""
-    global _arcade_client
-    if _arcade_client is None:
-        _arcade_client = Arcade()
-    return _arcade_client
+# raw payload -> normalized records (cached responses are shared objects)
+_parsed_github = IdentityMemo()
+_parsed_jira = IdentityMemo()
+_parsed_notes = IdentityMemo()
+# same page + same selected sections -> the same object, so the synth context memo hits
+_selected_notes = IdentityMemo()
 
 class GraphState(TypedDict, total=False):
     transcript: str
+    user_id: str  # Arcade user the tools run as
+    run_id: str
     github: Annotated[Dict[str, Any], operator.or_]  # Merge concurrent updates
     jira: Annotated[Dict[str, Any], operator.or_]
     summary: str
     classification: Dict[str, Any]
+    routing: Dict[str, Any]
     targets: List[str]
     meeting_notes: Dict[str, Any]
-    
+    no_cache: bool  # skip the synth answer cache for this run
+    refresh: bool  # re-fetch sources instead of serving cached responses (pre-warming)
+    inputs: Dict[str, Any]  # per-request repos / projects (see app/graph/sources.py)
+    deadline: float  # time.monotonic() by which the briefing should be done
+    synth_reserve_ms: float  # part of the budget kept for node_synth
+    skipped: Annotated[List[str], operator.add]  # sources dropped (open circuit, deadline, error)
+    trace: Annotated[List[Dict[str, Any]], operator.add]  # one entry per executed node
+
+# source node -> provider health key (see app/graph/limits.py)
+SOURCE_PROVIDERS = {"github": "github", "jira": "jira", "meeting_notes": "notion"}
+
+
+def skip_open_circuits(state: GraphState) -> None:
+    """Drop selected sources whose provider circuit is open instead of waiting on them."""
+    cls = state.get("classification") or {}
+    flags = {"github": "is_git", "jira": "is_jira", "meeting_notes": "is_meeting_notes"}
+    skipped = [source for source, flag in flags.items() if cls.get(flag) and circuit_open(SOURCE_PROVIDERS[source])]
+    if skipped:
+        logging.warning(f"Skipping {skipped}: circuit open")
+        annotate(circuitOpen=skipped)
+        state["skipped"] = skipped
+
+@traced("coordinator")
 async def node_coordinator(state: GraphState) -> GraphState:
     # classify the request and execute certain nodes based on the classification
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
+    start = time.perf_counter()
     transcript = state.get("transcript", "")
+    state["run_id"] = run_id = state.get("run_id") or uuid.uuid4().hex
+
+    # Fast path: rules / local classifier / memo cache
+    local = route_locally(transcript)
+    if local is not None:
+        result, source = local
+        state["classification"] = result
+        state["routing"] = {"source": source, "latencyMs": int((time.perf_counter() - start) * 1000)}
+        speculative.record_route(result)
+        skip_open_circuits(state)
+        return state
+
+    # Overlap likely fetches with the LLM round trip
+    if speculative.SPECULATIVE_PREFETCH:
+        speculative.start(run_id, state, FETCHERS)
 
     system_prompt = """You are a routing coordinator. Analyze the query and determine which data sources are needed. values are booleans.
         DATA SOURCES:
@@ -72,10 +115,24 @@ async def node_coordinator(state: GraphState) -> GraphState:
         }
     """
 
-    resp = await llm.ainvoke([
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": transcript}
-    ])
+    try:
+        resp = await within(state, lambda: ainvoke_llm("coordinator", [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": transcript}
+        ]))
+    except (DeadlineExceeded, CircuitOpenError) as e:
+        # out of time / LLM unavailable: go with whatever the rules matched, however unsure
+        result, _ = classify_by_rules(normalize_transcript(transcript))
+        logging.warning(f"Coordinator LLM skipped ({e}), routing by rules: {result}")
+        state["classification"] = result
+        source = "deadline" if isinstance(e, DeadlineExceeded) else "circuit_open"
+        state["routing"] = {"source": source, "latencyMs": int((time.perf_counter() - start) * 1000)}
+        skip_open_circuits(state)
+        speculative.settle(run_id, select_targets(state))
+        return state
+    except Exception:
+        speculative.settle(run_id, [])
+        raise
     state["classification"] = resp.content
 
     # Parse JSON; fall back safely
@@ -87,11 +144,16 @@ async def node_coordinator(state: GraphState) -> GraphState:
             "is_jira": bool(parsed.get("is_jira", False)),
             "is_meeting_notes": bool(parsed.get("is_meeting_notes", False)),
         }
-    except Exception:
+        remember(transcript, result)
+    except Exception as e:
         result = {"is_git": False, "is_jira": False, "is_meeting_notes": False}
         logging.error(f"Error parsing JSON: {e}")
     
     state["classification"] = result
+    state["routing"] = {"source": "llm", "latencyMs": int((time.perf_counter() - start) * 1000)}
+    speculative.record_route(result)
+    skip_open_circuits(state)
+    speculative.settle(run_id, select_targets(state))
     
     # determine which nodes to run
     cls = state.get("classification", {}) or {}
@@ -106,266 +168,224 @@ async def node_coordinator(state: GraphState) -> GraphState:
 
     return state
 
-async def node_github(state: GraphState) -> Dict[str, Any]:
+async def fetch_github(state: GraphState) -> Dict[str, Any]:
     logging.info("GitHub node started")
 
-    # configuration (facebook repo)
-    USER_ID = "mlau191@uw.edu"
+    # repos from the request inputs / per-user config / GITHUB_REPOS
+    USER_ID = state.get("user_id") or "mlau191@uw.edu"
     TOOL_NAME = "Github.ListPullRequests"
-    owner = "facebook"
-    repo = "react"
-    state = "open"
-
-    client = get_arcade_client()
-    
-    auth_response = client.tools.authorize(
-        tool_name=TOOL_NAME,
-        user_id=USER_ID,
-    )
-    if auth_response.status != "completed":
-        print(f"Click this link to authorize: {auth_response.url}")
+    config = sources.resolve(state.get("user_id"), state.get("inputs"))["github"]
+    repos = config["repos"]
+
+    if snapshots.INCREMENTAL_SYNC:
+        # only PRs updated since the last sync are fetched, one sync per repo in parallel
+        results = await sources.fan_out([
+            lambda repo=repo: snapshots.sync_github(USER_ID, *repo.split("/", 1)) for repo in repos
+        ])
+        sources.successful(results, repos, "github")
+        parts = [normalize_pull_requests(r, repo) for repo, r in zip(repos, results) if not isinstance(r, BaseException)]
+        github_data = sources.merge_pull_requests(*parts)
+        logging.info(f"GitHub snapshot: {len(github_data['pull_requests'])} PRs, {len(github_data['changed'])} changed")
+        return {"github": github_data}
+
+    # one call per repo and page, all in flight together
+    calls, labels = [], []
+    for repo in repos:
+        owner, name = repo.split("/", 1)
+        for page in range(1, config["max_pages"] + 1):
+            tool_input = {
+                "owner": owner,
+                "repo": name,
+                "state": config["state"],
+                "per_page": config["per_page"],
+            }
+            if config["max_pages"] > 1:
+                tool_input["page"] = page
+            calls.append(lambda tool_input=tool_input, repo=repo: fetch_github_page(state, USER_ID, TOOL_NAME, tool_input, repo))
+            labels.append(f"{repo} page {page}")
+
+    results = await sources.fan_out(calls)
+    github_data = _parsed_github.get_or_compute_many(tuple(sources.successful(results, labels, "github")), sources.merge_pull_requests)
+    logging.info(f"GitHub response parsed successfully")
+    logging.info(f"Total PRs found: {len(github_data['pull_requests'])} across {len(repos)} repo(s)")
     
+    # Log each PR
+    for pr in github_data['pull_requests']:
+        logging.info(f"PR {pr.repo}#{pr.number}: {pr.title} (State: {pr.state})")
     
-    client.auth.wait_for_completion(auth_response)
-    tool_input = {
-        "owner": owner,
-        "repo": repo,
-        "state": state,
-        "per_page": 5,
+    return {
+        "github": github_data
     }
-    response = client.tools.execute(
-        tool_name=TOOL_NAME,
-        input=tool_input,
-        user_id=USER_ID,
-    )
 
-    github_data = response.output.value
-    
+
+async def fetch_github_page(state: GraphState, user_id: str, tool_name: str, tool_input: Dict[str, Any], repo: str) -> Dict[str, Any]:
+    github_data = await fetch_tool("github", tool_name, tool_input, user_id, refresh=state.get("refresh", False))
+
     # Parse if it's a JSON string
     if isinstance(github_data, str):
         github_data = json.loads(github_data)
-    
+
     # Fallback to empty dict if null/None
     if github_data is None:
         github_data = {"pull_requests": []}
-    
-    logging.info(f"GitHub response parsed successfully")
-    logging.info(f"Total PRs found: {len(github_data.get('pull_requests', []))}")
-    
-    # Log each PR
-    for pr in github_data.get('pull_requests', []):
-        logging.info(f"PR #{pr['number']}: {pr['title']} (State: {pr['state']})")
-    
-    return {
-        "github": github_data
-    }
 
+    return _parsed_github.get_or_compute(github_data, lambda data: normalize_pull_requests(data, repo))
 
-async def node_jira(state: GraphState) -> Dict[str, Any]:
-    logging.info("Jira node started")
-    
-    # hardcoded for demo (input)
-    jira_website = "https://uw-team-eg624ru3.atlassian.net/rest/api/3/search"
-    assignee = "mlau191@uw.edu"
-    project = "briefly"
-    keyword = "bug"
-    atlassian_cloud_id = "a3c0ae94-18ac-4e5b-a511-6fa2460c8c35"
-    limit = 10
-    due_from = "2025-01-01"
-    status = "In Progress"
-
-    USER_ID = "mlau191@uw.edu"  # Unique identifier for your user (email, UUID, etc.)
-    TOOL_NAME = "Jira.GetIssuesWithoutId"
 
-    client = get_arcade_client()
-    
-    auth_response = client.tools.authorize(tool_name=TOOL_NAME, user_id=USER_ID)
-
-    if auth_response.status != "completed":
-        print(f"Click this link to authorize: {auth_response.url}")
-
-    # Wait for the authorization to complete
-    client.auth.wait_for_completion(auth_response)
+async def fetch_jira(state: GraphState) -> Dict[str, Any]:
+    logging.info("Jira node started")
 
-    tool_input = {
-        "assignee": assignee,
-        "project": project,
-        "limit": limit,
-        "atlassian_cloud_id": atlassian_cloud_id,
-    }
+    # projects from the request inputs / per-user config / JIRA_PROJECTS
+    USER_ID = state.get("user_id") or "mlau191@uw.edu"  # Unique identifier for your user (email, UUID, etc.)
+    TOOL_NAME = "Jira.GetIssuesWithoutId"
+    config = sources.resolve(state.get("user_id"), state.get("inputs"))["jira"]
+    projects = config["projects"]
+
+    def tool_input(project: str) -> Dict[str, Any]:
+        return {
+            "assignee": config["assignee"],
+            "project": project,
+            "limit": config["limit"],
+            "atlassian_cloud_id": config["atlassian_cloud_id"],
+        }
 
-    response = client.tools.execute(
-        tool_name=TOOL_NAME,
-        input=tool_input,
-        user_id=USER_ID,
-    )
-    final_response = response.output.value  # Already a dict, no need for json.dumps
-    logging.info(f"Jira response: {json.dumps(final_response)}")  # Log as JSON string for readability
-
-    # parse the response
-    parsed = []
-
-    issues = final_response.get("issues", [])
-    for issue in issues:
-        # Basic info
-        key = issue["key"]                           # "OPS-5"
-        title = issue["title"]                       # "(Sample) Credit Card Payment"
-        status = issue["status"]["name"]             # "In Progress"
-        
-        # Priority (can be null)
-        priority = issue.get("priority")
-        priority_name = priority["name"] if priority else "No Priority"
-        
-        # Assignee
-        assignee = issue["assignee"]
-        assignee_name = assignee["name"]             # "Matt Lau"
-        assignee_email = assignee["email"]           # "mlau191@uw.edu"
-        
-        # Description (HTML format)
-        description = issue["description"]           # "<p>Create a secure payment...</p>"
-        
-        # Parent Epic (can be null)
-        parent = issue.get("parent")
-        parent_key = parent["key"] if parent else None      # "OPS-2"
-        parent_title = parent["title"] if parent else None  # "(Sample) Payment Processing"
-        
-        # Dates
-        created = issue["created"]                   # "2025-10-16T18:50:36.559-0700"
-        
-        # URLs
-        jira_url = issue["jira_gui_url"]            # Direct link to issue
-        
-        # Project
-        project_name = issue["project"]["name"]      # "briefly"
-        project_key = issue["project"]["key"]        # "OPS"
-        
-        # Build clean dict
-        parsed.append({
-            "key": key,
-            "title": title,
-            "status": status,
-            "priority": priority_name,
-            "assignee": assignee_name,
-            "description": description,
-            "parent_epic": parent_key,
-            "created": created,
-            "url": jira_url
-        })
-    
-    logging.info(f"Parsed {len(parsed)} Jira issues")
+    if snapshots.INCREMENTAL_SYNC:
+        # only issues updated since the last sync are fetched, one sync per project in parallel
+        results = await sources.fan_out([lambda p=p: snapshots.sync_jira(USER_ID, tool_input(p)) for p in projects])
+        parts = [
+            dict(parse_jira_issues(snapshot), changed=snapshot["changed"])
+            for snapshot in sources.successful(results, projects, "jira")
+        ]
+        jira = sources.merge_issues(*parts)
+        logging.info(f"Jira snapshot: {len(jira['issues'])} issues, {len(jira['changed'])} changed")
+        return {"jira": jira}
+
+    # one call per project and page, all in flight together
+    calls, labels = [], []
+    for project in projects:
+        for page in range(config["max_pages"]):
+            page_input = tool_input(project)
+            if config["max_pages"] > 1:
+                page_input["offset"] = page * config["limit"]
+            calls.append(lambda page_input=page_input: fetch_tool("jira", TOOL_NAME, page_input, USER_ID, refresh=state.get("refresh", False)))
+            labels.append(f"{project} page {page + 1}")
+
+    responses = sources.successful(await sources.fan_out(calls), labels, "jira")
+    for final_response in responses:
+        logging.info(f"Jira response: {json.dumps(final_response)}")  # Log as JSON string for readability
+
+    # parse once per fetched payload (cached responses are shared objects)
+    parts = tuple(_parsed_jira.get_or_compute(r, parse_jira_issues) for r in responses)
+    jira = _parsed_jira.get_or_compute_many(parts, sources.merge_issues)
+    logging.info(f"Parsed {len(jira['issues'])} Jira issues across {len(projects)} project(s)")
     
     return {
-        "jira": {"issues": parsed}
+        "jira": jira
     }
 
-async def node_meeting_notes(state: GraphState) -> Dict[str, Any]:
-    USER_ID = "mlau191@uw.edu"
-    TOOL_NAME = "NotionToolkit.GetPageContentByTitle"
 
-    client = get_arcade_client()
-    
-    auth_response = client.tools.authorize(
-        tool_name=TOOL_NAME,
-        user_id=USER_ID,
-    )
+def parse_jira_issues(final_response: Dict[str, Any]) -> Dict[str, Any]:
+    """Arcade Jira payload -> {"issues": [JiraIssue]} (HTML stripped, rendered lazily)."""
+    issues = (final_response or {}).get("issues", [])
+    return {"issues": [JiraIssue.from_arcade(issue) for issue in issues]}
 
-    if auth_response.status != "completed":
-        print(f"Click this link to authorize: {auth_response.url}")
 
-    # Wait for the authorization to complete
-    client.auth.wait_for_completion(auth_response)
+async def fetch_meeting_notes(state: GraphState) -> Dict[str, Any]:
+    USER_ID = state.get("user_id") or "mlau191@uw.edu"
+    TOOL_NAME = "NotionToolkit.GetPageContentByTitle"
 
     tool_input = {
         "title": "Meeting Notes"
     }
 
-    response = client.tools.execute(
-        tool_name=TOOL_NAME,
-        input=tool_input,
-        user_id=USER_ID,
-    )
-    meeting_notes = response.output.value
+    meeting_notes = await fetch_tool("meeting_notes", TOOL_NAME, tool_input, USER_ID, refresh=state.get("refresh", False))
     logging.info(f"Meeting notes: {meeting_notes}")
+    notes = _parsed_notes.get_or_compute(meeting_notes, normalize_notes)
+
+    if notes_index.NOTES_INDEX_ENABLED and len(notes["sections"]) > notes_index.NOTES_TOP_K:
+        # only the sections relevant to this transcript reach the synth prompt
+        sections = await asyncio.to_thread(
+            notes_index.select_sections, USER_ID, tool_input["title"], notes["sections"], state.get("transcript") or ""
+        )
+        logging.info(f"Meeting notes: {len(sections)} of {len(notes['sections'])} sections selected")
+        notes = _selected_notes.get_or_compute_many(
+            (notes, *sections), lambda page, *selected: {"sections": list(selected), "total": len(page["sections"])}
+        )
 
     return {
-        "meeting_notes": meeting_notes
+        "meeting_notes": notes
     }
 
+FETCHERS = {
+    "github": fetch_github,
+    "jira": fetch_jira,
+    "meeting_notes": fetch_meeting_notes,
+}
+
+
+async def run_fetch(state: GraphState, source: str) -> Dict[str, Any]:
+    """Fetch one source, cancelled if it would eat into synth's share of the deadline."""
+    async def fetch():
+        # reuse a speculative prefetch started by the coordinator, if any
+        return await speculative.claim(state.get("run_id"), source) or await FETCHERS[source](state)
+
+    # synth goes ahead without a source that times out or fails
+    try:
+        return await within(state, fetch)
+    except DeadlineExceeded as e:
+        logging.warning(f"Skipping {source}: {e}")
+        annotate(ok=False, skipped="deadline")
+    except CircuitOpenError as e:
+        logging.warning(f"Skipping {source}: {e}")
+        annotate(ok=False, skipped="circuit_open")
+    except Exception as e:
+        logging.exception(f"Skipping {source}: fetch failed")
+        annotate(ok=False, skipped="error", error=str(e))
+    return {"skipped": [source]}
+
+
+@traced("github", source_key="github")
+async def node_github(state: GraphState) -> Dict[str, Any]:
+    return await run_fetch(state, "github")
+
+
+@traced("jira", source_key="jira")
+async def node_jira(state: GraphState) -> Dict[str, Any]:
+    return await run_fetch(state, "jira")
+
+
+@traced("meeting_notes", source_key="meeting_notes")
+async def node_meeting_notes(state: GraphState) -> Dict[str, Any]:
+    return await run_fetch(state, "meeting_notes")
+
+# Bump whenever the synth system prompt changes (invalidates cached answers)
+SYNTH_PROMPT_VERSION = "1"
+
+
+@traced("synth")
 async def node_synth(state: GraphState) -> Dict[str, Any]:
     logging.info("Synthesis node started")
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=1)
 
     github = state.get("github", {})
     jira = state.get("jira", {})
     transcript = state.get("transcript")
     meeting_notes = state.get("meeting_notes")
 
-    # Format GitHub PRs into a readable string
-    github_string = ""
-    if github:
-        pr_list = github.get("pull_requests", [])
-        if pr_list:
-            lines = [f"GitHub - Found {len(pr_list)} pull request(s):"]
-            for idx, pr in enumerate(pr_list, 1):
-                lines.append(f"  {idx}. PR #{pr['number']}: {pr['title']}")
-                lines.append(f"     State: {pr['state']}, Author: {pr['user']}")
-                # Extract and include the body (description) - this is critical context
-                body = pr.get('body', '').strip()
-                if body:
-                    # Truncate if too long, but keep enough for context
-                    body_preview = body[:300] + '...' if len(body) > 300 else body
-                    lines.append(f"     Description: {body_preview}")
-                lines.append(f"     URL: {pr['html_url']}")
-            github_string = "\n".join(lines)
-        else:
-            github_string = "GitHub - No pull requests found."
-    else:
-        github_string = "GitHub - No data available."
-    
-    # Format Jira issues into a readable string
-    jira_string = ""
-    if jira:
-        jira_issues = jira.get("issues", [])
-        if jira_issues:
-            lines = [f"Jira - Found {len(jira_issues)} issue(s):"]
-            for idx, issue in enumerate(jira_issues, 1):
-                lines.append(f"  {idx}. {issue['key']}: {issue['title']}")
-                lines.append(f"     Status: {issue['status']}, Priority: {issue['priority']}")
-                lines.append(f"     Assignee: {issue['assignee']}")
-                # Extract and include the description - this is critical context
-                description = issue.get('description', '').strip()
-                if description:
-                    # Remove HTML tags for better readability
-                    description_clean = re.sub('<[^<]+?>', '', description)
-                    # Truncate if too long
-                    desc_preview = description_clean[:300] + '...' if len(description_clean) > 300 else description_clean
-                    lines.append(f"     Description: {desc_preview}")
-                if issue.get('parent_epic'):
-                    lines.append(f"     Epic: {issue['parent_epic']}")
-                lines.append(f"     URL: {issue['url']}")
-            jira_string = "\n".join(lines)
-        else:
-            jira_string = "Jira - No issues found."
-    else:
-        jira_string = "Jira - No data available."
-    
-    # Combine everything into a summary
-    summary_parts = []
-    summary_parts.append(f"Meeting Prep Summary for: '{transcript}'\n")
-    summary_parts.append("=" * 50)
-    if github_string:
-        summary_parts.append(github_string)
-    if jira_string:
-        summary_parts.append(jira_string)
-    
-    if meeting_notes:
-        summary_parts.append(meeting_notes)
-    else:
-        summary_parts.append("Meeting notes - No data available.")
-    
-    final_summary = "\n\n".join(summary_parts)
+    # Rank, dedupe and trim sources to the synth token budget
+    final_summary, context_stats = build_context(transcript, github, jira, meeting_notes)
+    annotate(context=context_stats)
     logging.info(f"Generated summary:\n{final_summary}")
 
+    # Same transcript over unchanged data -> reuse the last answer, no model call
+    # (refresh runs regenerate it and store the new one)
+    use_cache = SYNTH_CACHE_ENABLED and not state.get("no_cache")
+    model = LLM_ROLES["synth"]["model"]
+    if use_cache and not state.get("refresh"):
+        cached = await get_answer_cache().aget(transcript or "", context_stats["fingerprint"], SYNTH_PROMPT_VERSION, model)
+        if cached is not None:
+            annotate(answerCache=cached[1])
+            return {"summary": cached[0]}
+
     # Aggregate into synthesizer llm
     system_prompt = """
     You are a personal meeting preparation assistant for software developers. Your job is to prepare one individual for their upcoming meeting by turning information from GitHub PRs, Jira issues, and meeting notes into a 30–60 second voice-friendly briefing (120–180 words max).
@@ -422,21 +442,25 @@ async def node_synth(state: GraphState) -> Dict[str, Any]:
         ✅ "You shipped two PRs yesterday — lead with that."
         ❌ "Let's celebrate shipping two PRs."
     """
-    resp = await llm.ainvoke([
+    resp = await ainvoke_llm("synth", [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": final_summary}
     ])
+    # partial briefings (sources skipped for the deadline) are not worth reusing
+    if use_cache and resp.content and not state.get("skipped"):
+        await get_answer_cache().aset(transcript or "", context_stats["fingerprint"], SYNTH_PROMPT_VERSION, model, resp.content)
     return {"summary": resp.content}
 
 def select_targets(state: GraphState) -> list[str]:
     """Return list of target nodes based on classification."""
     cls = state.get("classification", {}) or {}
+    skipped = set(state.get("skipped") or [])
     targets = []
-    if cls.get("is_git"):
+    if cls.get("is_git") and "github" not in skipped:
         targets.append("github")
-    if cls.get("is_jira"):
+    if cls.get("is_jira") and "jira" not in skipped:
         targets.append("jira")
-    if cls.get("is_meeting_notes"):
+    if cls.get("is_meeting_notes") and "meeting_notes" not in skipped:
         targets.append("meeting_notes")
 
     # If nothing selected, go straight to synth
@@ -446,6 +470,9 @@ def select_targets(state: GraphState) -> list[str]:
 
 
 def build_meeting_prep_graph():
+    # langgraph is only needed to compile; imported here to keep app import cheap
+    from langgraph.graph import StateGraph, END
+
     graph = StateGraph(GraphState)
     graph.add_node("coordinator", node_coordinator)
     graph.add_node("github", node_github)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+
+from app.graph.records import NoteSection, WORD
+
+if TYPE_CHECKING:
+    import numpy as np
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Hand only the top-k note sections relevant to the transcript to the synth context
+NOTES_INDEX_ENABLED = os.getenv("NOTES_INDEX_ENABLED", "true").lower() == "true"
+NOTES_INDEX_DIR = os.getenv("NOTES_INDEX_DIR", ".cache/notes_index")
+NOTES_TOP_K = int(os.getenv("NOTES_TOP_K", "8"))
+# hash (offline, deterministic) | openai
+NOTES_EMBEDDER = os.getenv("NOTES_EMBEDDER", "hash")
+HASH_EMBEDDING_DIM = 512
+# Indexes (memory-mapped vector files) kept open; least recently used are closed
+NOTES_INDEX_MAX_OPEN = int(os.getenv("NOTES_INDEX_MAX_OPEN", "256"))
+
+# texts -> float32 array of shape (len(texts), dim)
+Embedder = Callable[[List[str]], "np.ndarray"]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class HashEmbedder:
+    """Deterministic feature-hashing embedder (unigrams + bigrams); no network, no model."""
+
+    def __init__(self, dim: int = HASH_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = WORD.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vectors[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return vectors
+
+
+def _openai_embedder() -> Embedder:
+    import numpy as np
+    from langchain_openai import OpenAIEmbeddings
+
+    model = OpenAIEmbeddings(model=os.getenv("NOTES_EMBEDDING_MODEL", "text-embedding-3-small"))
+    return lambda texts: np.asarray(model.embed_documents(texts), dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class NotesIndex:
+    """Vector index of one notes page's sections, stored as a memory-mapped .npy.
+
+    Rebuilt incrementally: sections whose text is unchanged keep their stored
+    vector, only new / edited sections are embedded.
+    """
+
+    def __init__(self, path: str, embedder: Embedder):
+        import numpy as np
+
+        self.path = path  # <path>.npy vectors, <path>.json section texts + digests
+        self.embedder = embedder
+        self.fingerprint: Optional[str] = None
+        self.sections: List[NoteSection] = []
+        self.digests: List[str] = []
+        self.vectors: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        import numpy as np
+
+        try:
+            with open(self.path + ".json") as f:
+                meta = json.load(f)
+            vectors = np.load(self.path + ".npy", mmap_mode="r") if meta["texts"] else np.zeros((0, 0), dtype=np.float32)
+        except (OSError, ValueError, KeyError):
+            return
+        if len(vectors) != len(meta["texts"]):
+            return
+        self.fingerprint = meta["fingerprint"]
+        self.sections = [NoteSection.from_text(text) for text in meta["texts"]]
+        self.digests = meta["digests"]
+        self.vectors = vectors
+
+    def update(self, sections: List[NoteSection], fingerprint: str, force: bool = False) -> Dict[str, int]:
+        """Re-index when the page changed; returns {"embedded", "reused"}."""
+        import numpy as np
+
+        with self._lock:
+            if fingerprint == self.fingerprint and not force:
+                return {"embedded": 0, "reused": len(self.sections)}
+
+            stored = {} if force else {digest: row for row, digest in enumerate(self.digests)}
+            digests = [_digest(section.text) for section in sections]
+            new_rows = [i for i, digest in enumerate(digests) if digest not in stored]
+            fresh = _normalize(self.embedder([sections[i].text for i in new_rows])) if new_rows else None
+
+            dim = fresh.shape[1] if fresh is not None else self.vectors.shape[1]
+            if stored and self.vectors.shape[1] not in (0, dim):
+                # embedder changed; nothing stored is comparable any more
+                stored, new_rows = {}, list(range(len(sections)))
+                fresh = _normalize(self.embedder([section.text for section in sections]))
+
+            # unique per process and call: other workers may be re-indexing the same page
+            tmp = f"{self.path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+            try:
+                if sections:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    out = np.lib.format.open_memmap(tmp + ".npy", mode="w+", dtype=np.float32, shape=(len(sections), dim))
+                    new_pos = {row: n for n, row in enumerate(new_rows)}
+                    for i, digest in enumerate(digests):
+                        out[i] = fresh[new_pos[i]] if i in new_pos else self.vectors[stored[digest]]
+                    out.flush()
+                    del out
+                    os.replace(tmp + ".npy", self.path + ".npy")
+                    vectors = np.load(self.path + ".npy", mmap_mode="r")
+                else:
+                    vectors = np.zeros((0, 0), dtype=np.float32)
+
+                meta = {"fingerprint": fingerprint, "texts": [s.text for s in sections], "digests": digests}
+                with open(tmp + ".json", "w") as f:
+                    json.dump(meta, f)
+                os.replace(tmp + ".json", self.path + ".json")
+            except BaseException:
+                for leftover in (tmp + ".npy", tmp + ".json"):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+                raise
+
+            self.fingerprint, self.sections, self.digests, self.vectors = fingerprint, list(sections), digests, vectors
+            return {"embedded": len(new_rows), "reused": len(sections) - len(new_rows)}
+
+    def close(self) -> None:
+        """Drop the memory map; it is unmapped once no running search still holds it."""
+        import numpy as np
+
+        with self._lock:
+            self.fingerprint, self.sections, self.digests = None, [], []
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+
+    def search(self, query: str, k: int = NOTES_TOP_K) -> List[NoteSection]:
+        """Top-k sections by cosine similarity, returned in page order."""
+        import numpy as np
+
+        with self._lock:
+            sections, vectors = self.sections, self.vectors
+        if len(sections) <= k:
+            return list(sections)
+        q = _normalize(self.embedder([query]))[0]
+        if vectors.shape[1] != q.shape[0]:
+            # stored by a different embedder
+            self.update(sections, self.fingerprint, force=True)
+            vectors = self.vectors
+        scores = vectors @ q
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [sections[i] for i in sorted(top.tolist())]
+
+
+# Lazy initialization - pick the embedder only when needed
+_embedder: Optional[Embedder] = None
+_indexes: "OrderedDict[str, NotesIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_stats = {"updates": 0, "embedded": 0, "reused": 0, "searches": 0, "evictions": 0}
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    if _embedder is None:
+        _embedder = _openai_embedder() if NOTES_EMBEDDER == "openai" else HashEmbedder()
+    return _embedder
+
+
+def set_embedder(embedder: Optional[Embedder]) -> None:
+    """Swap the embedding function (drops open indexes; stored vectors are re-embedded on change)."""
+    global _embedder
+    _embedder = embedder
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
+
+
+def get_index(user_id: str, page: str) -> NotesIndex:
+    """Open index for (user, page), closing the least recently used beyond NOTES_INDEX_MAX_OPEN."""
+    key = _digest(f"{user_id.strip().lower()}:{page}")
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+        index = _indexes[key] = NotesIndex(os.path.join(NOTES_INDEX_DIR, key), get_embedder())
+        while len(_indexes) > NOTES_INDEX_MAX_OPEN:
+            _, evicted = _indexes.popitem(last=False)
+            evicted.close()
+            _stats["evictions"] += 1
+        return index
+
+
+def select_sections(user_id: str, page: str, sections: List[NoteSection], query: str, k: int = NOTES_TOP_K) -> List[NoteSection]:
+    """Index `sections` (if the page changed) and return the top-k for `query`.
+
+    Blocking (embedding + file IO); run it in a worker thread.
+    """
+    if len(sections) <= k:
+        return sections
+    index = get_index(user_id, page)
+    counts = index.update(sections, _digest("\n\n".join(s.text for s in sections)))
+    if counts["embedded"]:
+        _stats["updates"] += 1
+        logger.info(f"Notes index updated: {counts['embedded']} embedded, {counts['reused']} reused")
+    _stats["embedded"] += counts["embedded"]
+    _stats["reused"] += counts["reused"] if counts["embedded"] else 0
+    _stats["searches"] += 1
+    return index.search(query, k)
+
+
+def notes_index_stats() -> Dict[str, int]:
+    return dict(_stats, indexes=len(_indexes))
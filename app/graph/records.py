@@ -0,0 +1,235 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+import html
+import json
+import os
+import re
+
+load_dotenv()
+
+NOTES_CHUNK_CHARS = int(os.getenv("NOTES_CHUNK_CHARS", "800"))
+DESCRIPTION_CHARS = 300
+
+HTML_TAG = re.compile(r"<[^<]+?>")
+WHITESPACE = re.compile(r"\s+")
+WORD = re.compile(r"[a-z0-9][a-z0-9_-]+")
+HEADING = re.compile(r"^\s*#{1,6}\s")
+JIRA_KEY = re.compile(r"\b[A-Z][A-Z0-9]+-\d+\b")
+
+STOPWORDS = frozenset(
+    "the a an and or of to for in on at is are was were be me my i you your we us our it this that "
+    "what whats did do does have has with about from by prep prepare ready get brief briefing meeting "
+    "standup today yesterday any all can could should would tell give".split()
+)
+
+CHANGED_MARK = " [changed since your last briefing]"
+
+
+def terms(text: str) -> frozenset:
+    """Lower-cased content words used for relevance scoring and dedupe."""
+    return frozenset(w for w in WORD.findall(text.lower()) if w not in STOPWORDS)
+
+
+def truncate(text: str, limit: int = DESCRIPTION_CHARS) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def clean_html(text: str) -> str:
+    return WHITESPACE.sub(" ", html.unescape(HTML_TAG.sub(" ", text))).strip()
+
+
+# Rendered fragments are cached per (index, related, changed) on the record
+RenderKey = Tuple[int, Optional[str], bool]
+
+
+@dataclass(slots=True)
+class PullRequest:
+    number: int
+    title: str
+    state: str
+    author: str
+    description: str  # cleaned and truncated
+    url: str
+    updated_at: str
+    terms: frozenset = field(repr=False, compare=False)
+    title_terms: frozenset = field(repr=False, compare=False)
+    jira_keys: Tuple[str, ...] = field(repr=False, compare=False)  # Jira keys mentioned in title/body/branch
+    repo: str = ""  # "owner/name"; PR numbers are only unique per repo
+    _rendered: Optional[Tuple[RenderKey, List[str]]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def ref(self) -> str:
+        """Identity across repos ("owner/name#123"; just "123" when the repo is unknown)."""
+        return f"{self.repo}#{self.number}" if self.repo else str(self.number)
+
+    @classmethod
+    def from_arcade(cls, pr: Dict[str, Any], repo: str = "") -> "PullRequest":
+        title = pr.get("title") or ""
+        body = (pr.get("body") or "").strip()
+        user = pr.get("user")
+        author = user.get("login", "") if isinstance(user, dict) else (user or "")
+        return cls(
+            number=pr["number"],
+            title=title,
+            state=pr.get("state", "open"),
+            author=author,
+            description=truncate(body),
+            url=pr.get("html_url", ""),
+            updated_at=pr.get("updated_at") or "",
+            terms=terms(f"{title} {body}"),
+            title_terms=terms(title),
+            jira_keys=tuple(dict.fromkeys(JIRA_KEY.findall(f"{title} {body} {pr.get('head', '')}"))),
+            repo=repo,
+        )
+
+    def render(self, idx: int, related: Optional[str] = None, changed: bool = False) -> List[str]:
+        key = (idx, related, changed)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
+        mark = CHANGED_MARK if changed else ""
+        lines = [f"  {idx}. PR {self.repo}#{self.number}: {self.title}{mark}", f"     State: {self.state}, Author: {self.author}"]
+        if related:
+            # the Jira ticket carries the detail; keep the PR entry short
+            lines.append(f"     Related to: {related}")
+        elif self.description:
+            lines.append(f"     Description: {self.description}")
+        lines.append(f"     URL: {self.url}")
+        self._rendered = (key, lines)
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number, "repo": self.repo, "title": self.title, "state": self.state, "author": self.author,
+            "description": self.description, "url": self.url, "updated_at": self.updated_at,
+        }
+
+
+@dataclass(slots=True)
+class JiraIssue:
+    key: str
+    title: str
+    status: str
+    priority: str
+    assignee: str
+    description: str  # HTML-stripped and truncated
+    parent_epic: Optional[str]
+    created: str
+    updated: Optional[str]
+    url: str
+    terms: frozenset = field(repr=False, compare=False)
+    title_terms: frozenset = field(repr=False, compare=False)
+    _rendered: Optional[Tuple[RenderKey, List[str]]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_arcade(cls, issue: Dict[str, Any]) -> "JiraIssue":
+        title = issue["title"]                                   # "(Sample) Credit Card Payment"
+        priority = issue.get("priority")                         # can be null
+        assignee = issue.get("assignee") or {}
+        parent = issue.get("parent")                             # can be null
+        description = clean_html(issue.get("description") or "")  # "<p>Create a secure payment...</p>"
+        return cls(
+            key=issue["key"],                                    # "OPS-5"
+            title=title,
+            status=issue["status"]["name"],                      # "In Progress"
+            priority=priority["name"] if priority else "No Priority",
+            assignee=assignee.get("name", ""),                   # "Matt Lau"
+            description=truncate(description),
+            parent_epic=parent["key"] if parent else None,       # "OPS-2"
+            created=issue.get("created", ""),                    # "2025-10-16T18:50:36.559-0700"
+            updated=issue.get("updated"),
+            url=issue.get("jira_gui_url", ""),                   # Direct link to issue
+            terms=terms(f"{title} {description}"),
+            title_terms=terms(title),
+        )
+
+    def render(self, idx: int, related: Optional[str] = None, changed: bool = False) -> List[str]:
+        key = (idx, related, changed)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
+        mark = CHANGED_MARK if changed else ""
+        lines = [
+            f"  {idx}. {self.key}: {self.title}{mark}",
+            f"     Status: {self.status}, Priority: {self.priority}",
+            f"     Assignee: {self.assignee}",
+        ]
+        if self.description:
+            lines.append(f"     Description: {self.description}")
+        if self.parent_epic:
+            lines.append(f"     Epic: {self.parent_epic}")
+        lines.append(f"     URL: {self.url}")
+        self._rendered = (key, lines)
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key, "title": self.title, "status": self.status, "priority": self.priority,
+            "assignee": self.assignee, "description": self.description, "parent_epic": self.parent_epic,
+            "created": self.created, "updated": self.updated, "url": self.url,
+        }
+
+
+@dataclass(slots=True)
+class NoteSection:
+    text: str
+    terms: frozenset = field(repr=False, compare=False)
+
+    @classmethod
+    def from_text(cls, text: str) -> "NoteSection":
+        return cls(text=text, terms=terms(text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"text": self.text}
+
+
+def split_notes(notes: Any, chunk_chars: int = NOTES_CHUNK_CHARS) -> List[NoteSection]:
+    """Split meeting notes into sections at headings / blank lines, ~chunk_chars each."""
+    if not notes:
+        return []
+    if not isinstance(notes, str):
+        notes = json.dumps(notes, default=str)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in notes.splitlines():
+        starts_section = bool(HEADING.match(line)) or not line.strip()
+        if current and (size + len(line) > chunk_chars or (starts_section and size > chunk_chars // 2)):
+            chunks.append("\n".join(current).strip())
+            current, size = [], 0
+        if line.strip() or current:
+            current.append(line)
+            size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current).strip())
+    return [NoteSection.from_text(c) for c in chunks if c]
+
+
+def normalize_pull_requests(github: Dict[str, Any], repo: str = "") -> Dict[str, Any]:
+    """Arcade ListPullRequests payload -> {"pull_requests": [PullRequest], "changed": [PR refs]}"""
+    prs = [pr if isinstance(pr, PullRequest) else PullRequest.from_arcade(pr, repo) for pr in github.get("pull_requests", [])]
+    changed = [f"{repo}#{number}" if repo else number for number in github.get("changed", [])]
+    return {"pull_requests": prs, "changed": changed}
+
+
+def normalize_issues(jira: Dict[str, Any]) -> Dict[str, Any]:
+    """Arcade Jira issues payload -> {"issues": [JiraIssue], "changed": [...]}"""
+    issues = [i if isinstance(i, JiraIssue) else JiraIssue.from_arcade(i) for i in jira.get("issues", [])]
+    return {"issues": issues, "changed": list(jira.get("changed", []))}
+
+
+def normalize_notes(notes: Any) -> Dict[str, Any]:
+    """Notion page content -> {"sections": [NoteSection]}"""
+    if isinstance(notes, dict) and "sections" in notes:
+        return notes
+    return {"sections": split_notes(notes)}
+
+
+def to_json(value: Any) -> Any:
+    """`json.dumps` default hook for records."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
@@ -0,0 +1,371 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+import asyncio
+import contextlib
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Opt-in recording of graph runs: tool outputs, LLM prompts / responses and
+# node timings, appended to TRACE_RECORD_FILE (one JSON line per run, each
+# line its own gzip member when the name ends in .gz). Replay re-runs the
+# graph against a recording with no network (python -m benchmarks.replay).
+TRACE_RECORD_ENABLED = os.getenv("TRACE_RECORD_ENABLED", "false").lower() == "true"
+TRACE_RECORD_FILE = os.getenv("TRACE_RECORD_FILE", ".cache/traces.jsonl.gz")
+# Fraction of runs recorded, and only those at least this slow (ms)
+TRACE_RECORD_SAMPLE_RATE = float(os.getenv("TRACE_RECORD_SAMPLE_RATE", "1.0"))
+TRACE_RECORD_MIN_MS = int(os.getenv("TRACE_RECORD_MIN_MS", "0"))
+# Recording stops once the file is this big (rotate / ship it elsewhere)
+TRACE_RECORD_MAX_BYTES = int(os.getenv("TRACE_RECORD_MAX_BYTES", str(200 * 1024 * 1024)))
+
+TRACE_VERSION = 1
+
+_current: ContextVar[Optional["Recorder"]] = ContextVar("briefly_recorder", default=None)
+_write_lock = threading.Lock()
+_stats = {"recorded": 0, "sampled_out": 0, "too_fast": 0, "dropped": 0, "bytes": 0}
+
+
+class ReplayMiss(RuntimeError):
+    """Raised when a replayed run makes a call the recording doesn't have."""
+
+
+class NetworkBlocked(RuntimeError):
+    """Raised when code tries to open a network connection during a replay."""
+
+
+def _tool_key(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    return tool_name + ":" + json.dumps(tool_input, sort_keys=True, default=str)
+
+
+def _prompt_hash(messages: Any) -> str:
+    return hashlib.sha1(json.dumps(messages, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class Recorder:
+    """Collects one graph run's external inputs (tool outputs, LLM responses)."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.state = state
+        self.tools: List[Dict[str, Any]] = []
+        self.llm: List[Dict[str, Any]] = []
+        self.snapshots: List[Dict[str, Any]] = []
+
+    def to_dict(self, result: Optional[Dict[str, Any]], latency_ms: int, error: Optional[str]) -> Dict[str, Any]:
+        result = result or {}
+        return {
+            "v": TRACE_VERSION,
+            "id": self.id,
+            "ts": time.time(),
+            "transcript": self.state.get("transcript", ""),
+            "user_id": self.state.get("user_id"),
+            "inputs": self.state.get("inputs"),
+            "latencyMs": latency_ms,
+            "error": error,
+            "classification": result.get("classification"),
+            "routing": result.get("routing"),
+            "skipped": result.get("skipped", []),
+            "summary": result.get("summary", ""),
+            "nodes": result.get("trace", []),
+            "tools": self.tools,
+            "llm": self.llm,
+            "snapshots": self.snapshots,
+        }
+
+
+def record_tool(source: str, tool_name: str, tool_input: Dict[str, Any], value: Any, error: Optional[str], latency: float) -> None:
+    """Called by fetch_tool: what a source node got back (cached or not)."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.tools.append({
+            "source": source, "tool": tool_name, "input": tool_input,
+            "output": value, "error": error, "latencyMs": int(latency * 1000),
+        })
+
+
+def record_snapshot(source: str, user_id: str, scope: str, snapshot: Optional[Dict[str, Any]], now: float) -> None:
+    """Called by incremental sync: the stored snapshot it started from (timestamps as ages)."""
+    recorder = _current.get()
+    if recorder is not None and snapshot is not None:
+        recorder.snapshots.append({
+            "source": source, "user_id": user_id, "scope": scope,
+            "snapshot": dict(snapshot, synced_at=now - snapshot["synced_at"], full_synced_at=now - snapshot["full_synced_at"]),
+        })
+
+
+def record_llm(role: str, messages: List[Dict[str, str]], resp: Any, error: Optional[str], latency: float) -> None:
+    """Called by ainvoke_llm: the prompt sent and the response received."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.llm.append({
+            "role": role, "prompt": _prompt_hash(messages), "messages": messages,
+            "content": getattr(resp, "content", None), "usage": getattr(resp, "usage_metadata", None),
+            "error": error, "latencyMs": int(latency * 1000),
+        })
+
+
+def _append(line: bytes) -> None:
+    path = TRACE_RECORD_FILE
+    with _write_lock:
+        try:
+            if os.path.exists(path) and os.path.getsize(path) >= TRACE_RECORD_MAX_BYTES:
+                _stats["dropped"] += 1
+                return
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            data = gzip.compress(line, mtime=0) if path.endswith(".gz") else line
+            # one write per run on an O_APPEND fd: workers appending at once don't interleave
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            _stats["recorded"] += 1
+            _stats["bytes"] += len(data)
+        except OSError as e:
+            _stats["dropped"] += 1
+            logger.warning(f"Could not append trace to {path}: {e}")
+
+
+async def ainvoke_recorded(graph_app, state: Dict[str, Any]) -> Dict[str, Any]:
+    """`graph_app.ainvoke(state)`, recording the run when TRACE_RECORD_ENABLED."""
+    if not TRACE_RECORD_ENABLED:
+        return await graph_app.ainvoke(state)
+    if random.random() >= TRACE_RECORD_SAMPLE_RATE:
+        _stats["sampled_out"] += 1
+        return await graph_app.ainvoke(state)
+
+    recorder = Recorder(state)
+    token = _current.set(recorder)
+    start = time.perf_counter()
+    result, error = None, None
+    try:
+        result = await graph_app.ainvoke(state)
+        return result
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _current.reset(token)
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        if latency_ms < TRACE_RECORD_MIN_MS and error is None:
+            _stats["too_fast"] += 1
+        else:
+            line = json.dumps(recorder.to_dict(result, latency_ms, error), default=str, separators=(",", ":")) + "\n"
+            await asyncio.to_thread(_append, line.encode())
+
+
+def trace_recorder_stats() -> Dict[str, int]:
+    return dict(_stats, enabled=int(TRACE_RECORD_ENABLED))
+
+
+def load_traces(path: str) -> Iterator[Dict[str, Any]]:
+    """Recorded runs in `path` (plain or gzipped JSON lines), oldest first."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        try:
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # a worker killed mid-write leaves a partial last line
+                    logger.warning(f"{path}:{n}: skipping unreadable trace")
+        except (EOFError, gzip.BadGzipFile) as e:
+            logger.warning(f"{path}: stopped at a truncated trace: {e}")
+
+
+# ---- replay ----
+
+
+class _ReplayTools:
+    def __init__(self, owner: "ReplayArcade"):
+        self.owner = owner
+
+    async def authorize(self, tool_name: str, user_id: str, **kwargs):
+        return SimpleNamespace(status="completed", url=None, id="replay")
+
+    async def execute(self, tool_name: str, input: Dict[str, Any], user_id: str, **kwargs):
+        entry = self.owner.take(tool_name, input)
+        await self.owner.wait(entry["latencyMs"])
+        if entry.get("error"):
+            message = entry["error"].removeprefix(f"{tool_name}: ")  # ToolError adds it back
+            error = SimpleNamespace(kind="REPLAYED_ERROR", message=message)
+            return SimpleNamespace(output=SimpleNamespace(value=None, error=error), success=False)
+        # a fresh copy per call, as the SDK would parse one
+        return SimpleNamespace(output=SimpleNamespace(value=copy.deepcopy(entry["output"]), error=None), success=True)
+
+
+class _ReplayAuth:
+    async def wait_for_completion(self, auth_response):
+        return auth_response
+
+
+class ReplayArcade:
+    """Arcade client stand-in that answers tool calls from a recorded run."""
+
+    def __init__(self, trace: Dict[str, Any], latency_scale: float = 0.0):
+        self.latency_scale = latency_scale
+        self.misses: List[str] = []
+        self._calls: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_tool: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in trace.get("tools", []):
+            self._calls.setdefault(_tool_key(entry["tool"], entry["input"]), []).append(entry)
+            self._by_tool.setdefault(entry["tool"], []).append(entry)
+        self._used: Dict[str, int] = {}
+        self.tools = _ReplayTools(self)
+        self.auth = _ReplayAuth()
+
+    def take(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        key = _tool_key(tool_name, tool_input)
+        entries = self._calls.get(key)
+        if not entries:
+            self.misses.append(key)
+            raise ReplayMiss(f"no recorded call for {key}")
+        # repeated identical calls get the recorded answers in order, then the last one
+        index = self._used.get(key, 0)
+        self._used[key] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    async def wait(self, latency_ms: int) -> None:
+        if self.latency_scale:
+            await asyncio.sleep(latency_ms / 1000 * self.latency_scale)
+
+
+class ReplayLLM:
+    """Chat model stand-in returning a recorded run's responses for one role.
+
+    Responses are matched by prompt, else handed out in recorded order; with
+    none recorded (the run hit a cache) the run's own result is returned.
+    """
+
+    def __init__(self, role: str, trace: Dict[str, Any], latency_scale: float = 0.0):
+        self.role = role
+        self.latency_scale = latency_scale
+        self.entries = [e for e in trace.get("llm", []) if e["role"] == role]
+        self._by_prompt = {e["prompt"]: e for e in self.entries}
+        self._next = 0
+        self.prompt_changed = 0
+        if role == "coordinator":
+            self.fallback = json.dumps(trace.get("classification") or {})
+        else:
+            self.fallback = trace.get("summary", "")
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        entry = self._by_prompt.get(_prompt_hash(messages))
+        if entry is None and self.entries:
+            # prompt building changed (or the run was non-deterministic)
+            self.prompt_changed += 1
+            entry = self.entries[min(self._next, len(self.entries) - 1)]
+        self._next += 1
+        if entry is None:
+            return AIMessage(content=self.fallback)
+        if self.latency_scale:
+            await asyncio.sleep(entry["latencyMs"] / 1000 * self.latency_scale)
+        if entry.get("error"):
+            raise RuntimeError(entry["error"])
+        return AIMessage(content=entry["content"] or "", usage_metadata=entry.get("usage"))
+
+
+@contextlib.contextmanager
+def block_network():
+    """Fail any outbound connection (loopback included) while replaying."""
+    original = socket.socket.connect, socket.socket.connect_ex, socket.getaddrinfo
+
+    def refuse(*args, **kwargs):
+        target = args[1] if args and isinstance(args[0], socket.socket) else args[:2]
+        raise NetworkBlocked(f"network access during replay: {target}")
+
+    socket.socket.connect, socket.socket.connect_ex, socket.getaddrinfo = refuse, refuse, refuse
+    try:
+        yield
+    finally:
+        socket.socket.connect, socket.socket.connect_ex, socket.getaddrinfo = original
+
+
+async def replay(trace: Dict[str, Any], graph_app=None, latency_scale: float = 0.0) -> Dict[str, Any]:
+    """Re-run a recorded briefing against its recorded tool outputs and LLM responses.
+
+    `latency_scale` 0 replays as fast as the code allows (CPU profile); 1
+    waits the recorded tool / LLM latencies (the run's original shape).
+    Returns per-node timings next to the recorded ones.
+    """
+    from app.graph import arcade_tools, answer_cache, cache, llm, shared_state, snapshots
+    from app.graph.meeting_prep_graph import build_meeting_prep_graph
+
+    fake_arcade = ReplayArcade(trace, latency_scale)
+    models = {role: ReplayLLM(role, trace, latency_scale) for role in ("coordinator", "synth")}
+    # the process's own clients, caches and stores, put back once the replay is done
+    saved = (
+        arcade_tools._arcade_client, (dict(llm._llms), dict(llm._fallbacks)), cache._response_cache,
+        answer_cache._answer_cache, shared_state._shared_state, snapshots._store,
+    )
+    arcade_tools.set_arcade_client(fake_arcade)
+    for role, model in models.items():
+        llm.set_llm(role, model)
+    # nothing carried over between replays, nothing shared with other processes
+    cache.set_response_cache(cache.ResponseCache())
+    answer_cache.set_answer_cache(answer_cache.AnswerCache())
+    shared_state.set_shared_state(shared_state.MemorySharedState())
+    arcade_tools.clear_auth_cache()
+    # incremental syncs start from the snapshots the recorded run had
+    store = snapshots.SnapshotStore(":memory:")
+    now = time.time()
+    for entry in trace.get("snapshots", []):
+        snapshot = entry["snapshot"]
+        snapshot = dict(snapshot, synced_at=now - snapshot["synced_at"], full_synced_at=now - snapshot["full_synced_at"])
+        store.save(entry["user_id"], entry["source"], entry["scope"], snapshot)
+    snapshots.set_snapshot_store(store)
+
+    state: Dict[str, Any] = {"transcript": trace["transcript"], "no_cache": True}
+    if trace.get("user_id"):
+        state["user_id"] = trace["user_id"]
+    if trace.get("inputs"):
+        state["inputs"] = trace["inputs"]
+
+    graph_app = graph_app or build_meeting_prep_graph()
+    try:
+        start = time.perf_counter()
+        result = await graph_app.ainvoke(state)
+        latency_ms = (time.perf_counter() - start) * 1000
+    finally:
+        arcade_client, llms, response_cache, answers, shared, snapshot_store = saved
+        arcade_tools.set_arcade_client(arcade_client)
+        for current, before in zip((llm._llms, llm._fallbacks), llms):
+            current.clear()
+            current.update(before)
+        cache.set_response_cache(response_cache)
+        answer_cache.set_answer_cache(answers)
+        shared_state.set_shared_state(shared)
+        snapshots.set_snapshot_store(snapshot_store)
+
+    recorded = {entry["node"]: entry.get("latencyMs", 0) for entry in trace.get("nodes", [])}
+    replayed = {entry["node"]: entry.get("latencyMs", 0) for entry in result.get("trace", [])}
+    return {
+        "id": trace.get("id"),
+        "recordedMs": trace.get("latencyMs"),
+        "replayedMs": latency_ms,
+        "nodes": {node: (recorded.get(node), replayed.get(node)) for node in dict.fromkeys([*recorded, *replayed])},
+        "summaryMatches": result.get("summary", "") == trace.get("summary", ""),
+        "classificationMatches": result.get("classification") == trace.get("classification"),
+        "promptChanged": sum(m.prompt_changed for m in models.values()),
+        "misses": fake_arcade.misses,
+    }
+
@@ -0,0 +1,114 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+import logging
+import os
+import re
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Below this confidence the coordinator falls back to the LLM
+MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.8"))
+MEMO_MAXSIZE = int(os.getenv("ROUTER_MEMO_MAXSIZE", "512"))
+
+Classification = Dict[str, bool]
+# Optional local classifier: transcript -> (classification, confidence) or None
+LocalClassifier = Callable[[str], Optional[Tuple[Classification, float]]]
+
+ALL_SOURCES: Classification = {"is_git": True, "is_jira": True, "is_meeting_notes": True}
+
+# General prep for an upcoming meeting → every source
+PREP_RULE = re.compile(
+    r"\b(prep|prepare|brief|briefing|catch me up|get me ready|ready for)\b.*"
+    r"\b(standup|stand up|stand-up|meeting|sync|1:1|one on one|retro|planning|demo|day)\b"
+    r"|^(standup|stand up) (prep|briefing)$"
+)
+
+SOURCE_RULES = {
+    "is_git": re.compile(
+        r"\b(prs?|pull requests?|commits?|merged?|shipped|ship|code reviews?|reviews?|deploy(ed|ment|ments|s)?|branch(es)?|repo|github)\b"
+    ),
+    "is_jira": re.compile(
+        r"\b(tickets?|jira|blockers?|blocking|blocked|tasks?|sprint|issues?|backlog|epics?|assigned)\b"
+    ),
+    "is_meeting_notes": re.compile(
+        r"\b(meeting notes|notes|last meeting|last standup|discussed|discussion|mention(ed)?|decided|decisions?|agenda|notion)\b"
+    ),
+}
+
+_local_classifier: Optional[LocalClassifier] = None
+_memo: "OrderedDict[str, Classification]" = OrderedDict()
+_stats = {"rule": 0, "classifier": 0, "cache": 0, "llm": 0}
+
+
+def normalize_transcript(transcript: str) -> str:
+    text = re.sub(r"[^\w\s:/-]", " ", (transcript or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def set_local_classifier(classifier: Optional[LocalClassifier]) -> None:
+    """Plug in a small local model consulted when the keyword rules aren't confident."""
+    global _local_classifier
+    _local_classifier = classifier
+
+
+def classify_by_rules(text: str) -> Tuple[Classification, float]:
+    """Keyword/regex routing on a normalized transcript."""
+    if PREP_RULE.search(text):
+        return dict(ALL_SOURCES), 0.95
+
+    result = {name: bool(rule.search(text)) for name, rule in SOURCE_RULES.items()}
+    matched = sum(result.values())
+    if matched == 0:
+        return result, 0.0
+    # Short, single-topic questions are the easy ones
+    confidence = 0.9 if len(text.split()) <= 12 else 0.7
+    return result, confidence
+
+
+def route_locally(transcript: str) -> Optional[Tuple[Classification, str]]:
+    """Try to classify without the LLM.
+
+    Returns (classification, source) where source is "cache", "rule" or
+    "classifier", or None when no local stage is confident enough.
+    """
+    text = normalize_transcript(transcript)
+
+    cached = _memo.get(text)
+    if cached is not None:
+        _memo.move_to_end(text)
+        _stats["cache"] += 1
+        return dict(cached), "cache"
+
+    classification, confidence = classify_by_rules(text)
+    if confidence >= MIN_CONFIDENCE:
+        _stats["rule"] += 1
+        return classification, "rule"
+
+    if _local_classifier is not None:
+        try:
+            predicted = _local_classifier(transcript)
+        except Exception as e:
+            logger.warning(f"Local classifier failed: {e}")
+            predicted = None
+        if predicted is not None and predicted[1] >= MIN_CONFIDENCE:
+            _stats["classifier"] += 1
+            return dict(predicted[0]), "classifier"
+
+    return None
+
+
+def remember(transcript: str, classification: Classification) -> None:
+    """Memoize an LLM classification for the normalized transcript."""
+    _stats["llm"] += 1
+    _memo[normalize_transcript(transcript)] = dict(classification)
+    while len(_memo) > MEMO_MAXSIZE:
+        _memo.popitem(last=False)
+
+
+def router_stats() -> Dict[str, Any]:
+    """How many coordinator calls were answered by each routing source."""
+    return dict(_stats, memo_size=len(_memo))
@@ -0,0 +1,255 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Where caches, auth status and in-flight fetch coordination are shared:
+# "memory" keeps everything in this process (one worker), "redis" shares it
+# between gunicorn workers / replicas through any Redis-compatible server.
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "memory")
+SHARED_STATE_URL = os.getenv("SHARED_STATE_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+SHARED_STATE_PREFIX = os.getenv("SHARED_STATE_PREFIX", "briefly:")
+# Per-command timeout (seconds); a slow or unreachable server counts as a miss
+SHARED_STATE_TIMEOUT = float(os.getenv("SHARED_STATE_TIMEOUT", "0.25"))
+# How often a worker waiting on another worker's fetch checks for its result
+SHARED_POLL_INTERVAL = float(os.getenv("SHARED_POLL_INTERVAL", "0.05"))
+
+_stats = {"hits": 0, "misses": 0, "sets": 0, "errors": 0, "locks": 0, "lock_waits": 0, "lock_wait_hits": 0, "locks_lost": 0}
+
+# Compare-and-delete / compare-and-extend: only the owner of a lock may release or renew it
+RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+RENEW_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+
+
+class MemorySharedState:
+    """In-process backend: state is only shared within this worker."""
+
+    shared = False
+
+    def __init__(self):
+        # key -> (value, monotonic expiry or None)
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set only if absent; True when this call created the key (a lock)."""
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        """Delete only while `key` still holds `value` (the lock's owner token)."""
+        if self._live(key) != value:
+            return False
+        del self._data[key]
+        return True
+
+    async def expire_if(self, key: str, value: bytes, ttl: float) -> bool:
+        """Push `key`'s expiry out to `ttl` seconds while it still holds `value`."""
+        if self._live(key) != value:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def aclose(self) -> None:
+        self._data.clear()
+
+
+class RedisSharedState:
+    """Redis (or any RESP-compatible server) backend, shared across workers and replicas."""
+
+    shared = True
+
+    def __init__(self, url: str = SHARED_STATE_URL, timeout: float = SHARED_STATE_TIMEOUT):
+        # optional dependency: only needed when SHARED_STATE_BACKEND=redis
+        import redis.asyncio as redis
+
+        self.url = url
+        # RESP2: understood by every Redis-compatible server, HELLO-less ones included
+        self._client = redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout, protocol=2)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(await self._client.set(key, value, px=int(ttl * 1000) if ttl else None, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        return bool(await self._client.eval(RELEASE_SCRIPT, 1, key, value))
+
+    async def expire_if(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self._client.eval(RENEW_SCRIPT, 1, key, value, int(ttl * 1000)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# Lazy initialization - connect only when needed
+_shared_state = None
+
+
+def get_shared_state():
+    """Process-wide backend picked by SHARED_STATE_BACKEND (memory|redis)."""
+    global _shared_state
+    if _shared_state is None:
+        if SHARED_STATE_BACKEND == "redis":
+            _shared_state = RedisSharedState()
+        else:
+            _shared_state = MemorySharedState()
+    return _shared_state
+
+
+def set_shared_state(backend) -> None:
+    """Swap the backend (e.g. a Redis stand-in in benchmarks); None resets to the env default."""
+    global _shared_state
+    _shared_state = backend
+
+
+def is_shared() -> bool:
+    """Whether state is shared beyond this process (callers skip the extra tier otherwise)."""
+    return get_shared_state().shared
+
+
+async def _call(op: str, key: str, *args) -> Any:
+    """Run one backend command; failures are logged and reported as None (degrade to local)."""
+    try:
+        return await getattr(get_shared_state(), op)(SHARED_STATE_PREFIX + key, *args)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Shared state {op} {key} failed: {e}")
+        return None
+
+
+async def get_json(key: str) -> Any:
+    raw = await _call("get", key)
+    if raw is None:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    return json.loads(raw)
+
+
+async def set_json(key: str, value: Any, ttl: Optional[float] = None) -> None:
+    _stats["sets"] += 1
+    await _call("set", key, json.dumps(value, default=str).encode(), ttl)
+
+
+async def delete(key: str) -> None:
+    await _call("delete", key)
+
+
+async def acquire(key: str, ttl: float) -> Optional[str]:
+    """Best-effort lock on `key` for `ttl` seconds; the owner token if this worker holds it.
+
+    An unreachable backend grants the lock, so a Redis outage means duplicate
+    work rather than stalled requests.
+    """
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    got = await _call("add", "lock:" + key, token.encode(), ttl)
+    if got is None or got:
+        _stats["locks"] += 1
+        return token
+    return None
+
+
+async def release(key: str, token: str) -> None:
+    """Drop the lock if `token` still owns it; an expired lock taken over by another worker is left alone."""
+    await _call("delete_if", "lock:" + key, token.encode())
+
+
+async def renew(key: str, token: str, ttl: float) -> bool:
+    """Extend the lock to `ttl` seconds from now; False once another worker owns it."""
+    return await _call("expire_if", "lock:" + key, token.encode(), ttl) is not False
+
+
+async def locked(key: str) -> bool:
+    return await _call("get", "lock:" + key) is not None
+
+
+async def _keep_alive(key: str, token: str, ttl: float) -> None:
+    """Renew the leader's lock every ttl/3 so a call slower than `ttl` keeps it."""
+    while True:
+        await asyncio.sleep(ttl / 3)
+        if not await renew(key, token, ttl):
+            _stats["locks_lost"] += 1
+            logger.warning(f"Shared lock {key} was lost before the call finished")
+            return
+
+
+async def shared_do(key: str, fn: Callable[[], Awaitable[Any]], ttl: float, result_ttl: float = 10.0) -> Any:
+    """Cross-worker single-flight: one worker runs fn(), the others wait for its result.
+
+    The leader holds a `ttl`-second lock and renews it while fn() runs, then
+    publishes its (JSON-serializable) result under `key` for `result_ttl`
+    seconds. Waiters poll for it and run fn() themselves if the leader's lock
+    goes away without a result (failure, or a crashed leader whose lock expired).
+    """
+    result_key = "flight:" + key
+    token = await acquire(key, ttl)
+    if token:
+        keep_alive = asyncio.create_task(_keep_alive(key, token, ttl))
+        try:
+            value = await fn()
+            await set_json(result_key, value, result_ttl)
+            return value
+        finally:
+            keep_alive.cancel()
+            await release(key, token)
+
+    _stats["lock_waits"] += 1
+    while True:
+        await asyncio.sleep(SHARED_POLL_INTERVAL)
+        # lock first: a leader publishes before releasing, so no result + no lock means it failed
+        held = await locked(key)
+        raw = await _call("get", result_key)
+        if raw is not None:
+            _stats["lock_wait_hits"] += 1
+            return json.loads(raw)
+        if not held:
+            break
+    return await fn()
+
+
+def shared_state_stats() -> Dict[str, Any]:
+    return dict(_stats, backend=1 if is_shared() else 0)
+
+
+async def aclose_shared_state() -> None:
+    global _shared_state
+    if _shared_state is not None:
+        await _shared_state.aclose()
+        _shared_state = None
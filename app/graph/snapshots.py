@@ -0,0 +1,256 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+import asyncio
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from app.graph import replay
+from app.graph.arcade_tools import execute_recorded
+from app.graph.cache import DEFAULT_TTLS
+from app.graph.singleflight import SingleFlight
+from app.graph.sources import JIRA_PROJECT_KEY
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Fetch only PRs / issues changed since the last sync and merge them into a local snapshot
+INCREMENTAL_SYNC = os.getenv("INCREMENTAL_SYNC", "false").lower() == "true"
+SNAPSHOT_DB = os.getenv("SNAPSHOT_DB", ".cache/snapshots.db")
+# Full re-sync interval (seconds) to drop items that left the query (reassigned, deleted...)
+FULL_SYNC_INTERVAL = float(os.getenv("SNAPSHOT_FULL_SYNC_INTERVAL", "86400"))
+SNAPSHOT_MAX_PAGES = int(os.getenv("SNAPSHOT_MAX_PAGES", "10"))
+SNAPSHOT_PAGE_SIZE = int(os.getenv("SNAPSHOT_PAGE_SIZE", "30"))
+# Items handed to the briefing (most recently updated first)
+SNAPSHOT_MAX_ITEMS = int(os.getenv("SNAPSHOT_MAX_ITEMS", "50"))
+# Overlap added to relative JQL windows to absorb clock skew (minutes)
+JQL_SKEW_MINUTES = 5
+
+GITHUB_TOOL = "Github.ListPullRequests"
+JIRA_TOOL = "Jira.GetIssuesWithoutId"
+JIRA_JQL_TOOL = "Jira.SearchIssuesWithJql"
+
+
+class SnapshotStore:
+    """SQLite store of per-user / per-scope item snapshots and sync cursors."""
+
+    def __init__(self, path: str = SNAPSHOT_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS snapshots (
+                    user_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    cursor TEXT,
+                    items TEXT NOT NULL,
+                    changed TEXT NOT NULL,
+                    synced_at REAL NOT NULL,
+                    full_synced_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, source, scope)
+                )"""
+            )
+            self._conn.commit()
+
+    def load(self, user_id: str, source: str, scope: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, items, changed, synced_at, full_synced_at FROM snapshots "
+                "WHERE user_id = ? AND source = ? AND scope = ?",
+                (user_id, source, scope),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "cursor": row[0],
+            "items": json.loads(row[1]),
+            "changed": json.loads(row[2]),
+            "synced_at": row[3],
+            "full_synced_at": row[4],
+        }
+
+    def save(self, user_id: str, source: str, scope: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id, source, scope, snapshot.get("cursor"),
+                    json.dumps(snapshot["items"], default=str), json.dumps(snapshot["changed"]),
+                    snapshot["synced_at"], snapshot["full_synced_at"],
+                ),
+            )
+            self._conn.commit()
+
+    async def aload(self, user_id: str, source: str, scope: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.load, user_id, source, scope)
+
+    async def asave(self, user_id: str, source: str, scope: str, snapshot: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.save, user_id, source, scope, snapshot)
+
+
+# Lazy initialization - open the database only when needed
+_store: Optional[SnapshotStore] = None
+_syncs = SingleFlight()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        _store = SnapshotStore()
+    return _store
+
+
+def set_snapshot_store(store: Optional[SnapshotStore]) -> None:
+    global _store
+    _store = store
+
+
+def diff_items(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Keys added, updated or removed between two snapshots."""
+    changed = [key for key, item in new.items() if old.get(key) != item]
+    changed.extend(key for key in old if key not in new)
+    return changed
+
+
+def _fresh(snapshot: Optional[Dict[str, Any]], source: str, now: float) -> bool:
+    return snapshot is not None and now - snapshot["synced_at"] < DEFAULT_TTLS.get(source, 0)
+
+
+def _needs_full_sync(snapshot: Optional[Dict[str, Any]], now: float) -> bool:
+    return snapshot is None or now - snapshot["full_synced_at"] > FULL_SYNC_INTERVAL
+
+
+async def _sync_github(user_id: str, owner: str, repo: str) -> Dict[str, Any]:
+    store = get_snapshot_store()
+    scope = f"{owner}/{repo}"
+    now = time.time()
+    snapshot = await store.aload(user_id, "github", scope)
+    replay.record_snapshot("github", user_id, scope, snapshot, now)
+    if _fresh(snapshot, "github", now):
+        return snapshot
+
+    full = _needs_full_sync(snapshot, now)
+    old_items: Dict[str, Any] = snapshot["items"] if snapshot else {}
+    items: Dict[str, Any] = {} if full else dict(old_items)
+    cursor = None if full else snapshot["cursor"]
+    newest = cursor or ""
+
+    # Most recently updated first; stop once we reach what the last sync already saw
+    for page in range(1, SNAPSHOT_MAX_PAGES + 1):
+        data = await execute_recorded("github", GITHUB_TOOL, {
+            "owner": owner,
+            "repo": repo,
+            "state": "open" if full else "all",
+            "sort": "updated",
+            "direction": "desc",
+            "per_page": SNAPSHOT_PAGE_SIZE,
+            "page": page,
+        }, user_id)
+        if isinstance(data, str):
+            data = json.loads(data)
+        prs = (data or {}).get("pull_requests", [])
+
+        reached_cursor = False
+        for pr in prs:
+            updated = pr.get("updated_at") or ""
+            if cursor and updated and updated <= cursor:
+                reached_cursor = True
+                break
+            newest = max(newest, updated)
+            key = str(pr["number"])
+            if pr.get("state", "open") == "open":
+                items[key] = pr
+            else:
+                items.pop(key, None)
+        if reached_cursor or len(prs) < SNAPSHOT_PAGE_SIZE:
+            break
+
+    snapshot = {
+        "cursor": newest or None,
+        "items": items,
+        "changed": diff_items(old_items, items) if old_items else [],
+        "synced_at": now,
+        "full_synced_at": now if full else snapshot["full_synced_at"],
+    }
+    await store.asave(user_id, "github", scope, snapshot)
+    return snapshot
+
+
+def jql_string(value: str) -> str:
+    """`value` as a quoted JQL string literal (backslashes and quotes escaped)."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+async def _sync_jira(user_id: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    store = get_snapshot_store()
+    project = tool_input.get("project", "")
+    assignee = tool_input.get("assignee", "")
+    scope = f"{project}:{assignee}"
+    now = time.time()
+    snapshot = await store.aload(user_id, "jira", scope)
+    replay.record_snapshot("jira", user_id, scope, snapshot, now)
+    if _fresh(snapshot, "jira", now):
+        return snapshot
+
+    full = _needs_full_sync(snapshot, now)
+    old_items: Dict[str, Any] = snapshot["items"] if snapshot else {}
+    if full:
+        raw = await execute_recorded("jira", JIRA_TOOL, tool_input, user_id)
+        items = {}
+    else:
+        # relative JQL window avoids depending on the Jira user's timezone
+        minutes = math.ceil((now - snapshot["synced_at"]) / 60) + JQL_SKEW_MINUTES
+        if not JIRA_PROJECT_KEY.match(project):
+            raise ValueError(f"Not a Jira project key: {project!r}")
+        jql = (
+            f"project = {project} AND assignee = {jql_string(assignee)} "
+            f"AND updated >= -{minutes}m ORDER BY updated DESC"
+        )
+        raw = await execute_recorded("jira", JIRA_JQL_TOOL, {
+            "jql": jql,
+            "limit": tool_input.get("limit", SNAPSHOT_PAGE_SIZE),
+            "atlassian_cloud_id": tool_input.get("atlassian_cloud_id"),
+        }, user_id)
+        items = dict(old_items)
+
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    # raw Arcade issues; normalized into records by the fetch node
+    for issue in (raw or {}).get("issues", []):
+        items[issue["key"]] = issue
+
+    snapshot = {
+        "cursor": None,
+        "items": items,
+        "changed": diff_items(old_items, items) if old_items else [],
+        "synced_at": now,
+        "full_synced_at": now if full else snapshot["full_synced_at"],
+    }
+    await store.asave(user_id, "jira", scope, snapshot)
+    return snapshot
+
+
+async def sync_github(user_id: str, owner: str, repo: str) -> Dict[str, Any]:
+    """Open PRs for a repo from the local snapshot, after fetching only what changed."""
+    snapshot = await _syncs.do(
+        f"github:{user_id}:{owner}/{repo}", lambda: _sync_github(user_id, owner, repo)
+    )
+    prs = sorted(snapshot["items"].values(), key=lambda pr: pr.get("updated_at") or "", reverse=True)
+    return {"pull_requests": prs[:SNAPSHOT_MAX_ITEMS], "changed": snapshot["changed"]}
+
+
+async def sync_jira(user_id: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    """Jira issues from the local snapshot, after fetching only what changed (via JQL)."""
+    key = f"jira:{user_id}:{tool_input.get('project')}:{tool_input.get('assignee')}"
+    snapshot = await _syncs.do(key, lambda: _sync_jira(user_id, tool_input))
+    issues = sorted(snapshot["items"].values(), key=lambda issue: issue.get("updated") or issue.get("created") or "", reverse=True)
+    return {"issues": issues[:SNAPSHOT_MAX_ITEMS], "changed": snapshot["changed"]}
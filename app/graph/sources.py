@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+from dotenv import load_dotenv
+import asyncio
+import json
+import logging
+import os
+import re
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Which repos / Jira projects a briefing covers. Defaults come from the env,
+# per-user overrides from SOURCES_FILE, per-request ones from the request's
+# "inputs" ({"github": {"repos": [...]}, "jira": {"projects": [...]}}).
+GITHUB_REPOS = os.getenv("GITHUB_REPOS", "facebook/react")
+GITHUB_PR_STATE = os.getenv("GITHUB_PR_STATE", "open")
+GITHUB_PER_PAGE = int(os.getenv("GITHUB_PER_PAGE", "5"))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", "1"))
+JIRA_PROJECTS = os.getenv("JIRA_PROJECTS", "briefly")
+JIRA_ASSIGNEE = os.getenv("JIRA_ASSIGNEE", "mlau191@uw.edu")
+JIRA_CLOUD_ID = os.getenv("JIRA_CLOUD_ID", "a3c0ae94-18ac-4e5b-a511-6fa2460c8c35")
+JIRA_LIMIT = int(os.getenv("JIRA_LIMIT", "10"))
+JIRA_MAX_PAGES = int(os.getenv("JIRA_MAX_PAGES", "1"))
+# JSON file: {"<user_id>": {"github": {...}, "jira": {...}}}
+SOURCES_FILE = os.getenv("SOURCES_FILE", "")
+# Tool calls in flight per fetch node (provider caps in limits.py still apply)
+FETCH_FANOUT_CONCURRENCY = int(os.getenv("FETCH_FANOUT_CONCURRENCY", "8"))
+# Upper bounds on what a request may ask for
+MAX_REPOS = 20
+MAX_PROJECTS = 10
+MAX_PAGES = 10
+# Jira project keys (JQL matches them case-insensitively); anything else is refused
+JIRA_PROJECT_KEY = re.compile(r"^[A-Z][A-Z0-9_]+$", re.IGNORECASE)
+# What a request's inputs may change; who to fetch for (jira assignee) and which
+# tenant (atlassian_cloud_id) come only from the env and SOURCES_FILE
+REQUEST_KEYS = {
+    "github": {"repos", "state", "per_page", "max_pages"},
+    "jira": {"projects", "limit", "max_pages"},
+}
+
+T = TypeVar("T")
+
+_user_config: Optional[Dict[str, Any]] = None
+
+
+def _split(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value or [] if str(v).strip()]
+
+
+def _defaults() -> Dict[str, Dict[str, Any]]:
+    return {
+        "github": {
+            "repos": _split(GITHUB_REPOS),
+            "state": GITHUB_PR_STATE,
+            "per_page": GITHUB_PER_PAGE,
+            "max_pages": GITHUB_MAX_PAGES,
+        },
+        "jira": {
+            "projects": _split(JIRA_PROJECTS),
+            "assignee": JIRA_ASSIGNEE,
+            "atlassian_cloud_id": JIRA_CLOUD_ID,
+            "limit": JIRA_LIMIT,
+            "max_pages": JIRA_MAX_PAGES,
+        },
+    }
+
+
+def user_config(user_id: Optional[str]) -> Dict[str, Any]:
+    """Per-user overrides from SOURCES_FILE (read once)."""
+    global _user_config
+    if _user_config is None:
+        _user_config = {}
+        if SOURCES_FILE:
+            try:
+                with open(SOURCES_FILE) as f:
+                    _user_config = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read {SOURCES_FILE}: {e}")
+    return _user_config.get(user_id or "", {})
+
+
+def set_user_config(config: Optional[Dict[str, Any]]) -> None:
+    global _user_config
+    _user_config = config
+
+
+def resolve(user_id: Optional[str], inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Repos / projects to fetch: env defaults <- per-user config <- request inputs.
+
+    Top-level "repos" / "projects" in `inputs` are accepted as shorthand.
+    Inputs may only change REQUEST_KEYS. Raises ValueError for malformed or
+    disallowed inputs.
+    """
+    config = _defaults()
+    inputs = dict(inputs or {})
+    if "repos" in inputs:
+        inputs.setdefault("github", {})["repos"] = inputs.pop("repos")
+    if "projects" in inputs:
+        inputs.setdefault("jira", {})["projects"] = inputs.pop("projects")
+
+    for source in ("github", "jira"):
+        overrides = inputs.get(source) or {}
+        if not isinstance(overrides, dict):
+            raise ValueError(f"inputs.{source} must be an object")
+        for key in overrides:
+            if key in config[source] and key not in REQUEST_KEYS[source]:
+                raise ValueError(f"inputs.{source}.{key} cannot be set per request")
+
+    for layer in (user_config(user_id), inputs):
+        for source in ("github", "jira"):
+            overrides = layer.get(source) or {}
+            if isinstance(overrides, dict):
+                config[source].update({k: v for k, v in overrides.items() if k in config[source]})
+
+    github, jira = config["github"], config["jira"]
+    github["repos"] = list(dict.fromkeys(_split(github["repos"])))
+    jira["projects"] = list(dict.fromkeys(_split(jira["projects"])))
+    for repo in github["repos"]:
+        owner, _, name = repo.partition("/")
+        if not owner or not name or "/" in name:
+            raise ValueError(f"inputs.github.repos: expected owner/name, got {repo!r}")
+    for project in jira["projects"]:
+        if not JIRA_PROJECT_KEY.match(project):
+            raise ValueError(f"inputs.jira.projects: expected a project key, got {project!r}")
+    if len(github["repos"]) > MAX_REPOS or len(jira["projects"]) > MAX_PROJECTS:
+        raise ValueError(f"inputs: at most {MAX_REPOS} repos and {MAX_PROJECTS} projects per briefing")
+    for source, key in (("github", "per_page"), ("github", "max_pages"), ("jira", "limit"), ("jira", "max_pages")):
+        try:
+            config[source][key] = int(config[source][key])
+        except (TypeError, ValueError):
+            raise ValueError(f"inputs.{source}.{key} must be an integer")
+        if config[source][key] < 1:
+            raise ValueError(f"inputs.{source}.{key} must be at least 1")
+    github["max_pages"] = min(github["max_pages"], MAX_PAGES)
+    jira["max_pages"] = min(jira["max_pages"], MAX_PAGES)
+    return config
+
+
+async def fan_out(
+    calls: Sequence[Callable[[], Awaitable[T]]],
+    limit: Optional[int] = None,
+) -> List[Any]:
+    """Run `calls` concurrently, at most `limit` (FETCH_FANOUT_CONCURRENCY) at a time.
+
+    Results keep the order of `calls`; a failed call's slot holds its exception.
+    """
+    if len(calls) == 1:
+        # common case: no pool needed, and errors propagate as usual
+        return [await calls[0]()]
+    semaphore = asyncio.Semaphore(limit or FETCH_FANOUT_CONCURRENCY)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
+
+def successful(results: List[Any], labels: List[str], source: str) -> List[Any]:
+    """Drop failed calls (logging them); raise if every call failed."""
+    failed = [(label, r) for label, r in zip(labels, results) if isinstance(r, BaseException)]
+    if failed and len(failed) == len(results):
+        raise failed[0][1]
+    for label, error in failed:
+        logger.warning(f"{source} fetch for {label} failed: {error}")
+    return [r for r in results if not isinstance(r, BaseException)]
+
+
+def merge_pull_requests(*parts: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized PR payloads (one per repo / page) -> one, deduped by ref, newest first."""
+    if len(parts) == 1:
+        return parts[0]
+    prs: Dict[str, Any] = {}
+    changed: List[str] = []
+    for part in parts:
+        for pr in part["pull_requests"]:
+            prs.setdefault(pr.ref, pr)
+        changed.extend(part.get("changed", []))
+    ordered = sorted(prs.values(), key=lambda pr: pr.updated_at, reverse=True)
+    return {"pull_requests": ordered, "changed": list(dict.fromkeys(changed))}
+
+
+def merge_issues(*parts: Dict[str, Any]) -> Dict[str, Any]:
+    """Parsed Jira payloads (one per project / page) -> one, deduped by issue key."""
+    if len(parts) == 1:
+        return parts[0]
+    issues: Dict[str, Any] = {}
+    changed: List[str] = []
+    for part in parts:
+        for issue in part["issues"]:
+            issues.setdefault(issue.key, issue)
+        changed.extend(part.get("changed", []))
+    merged: Dict[str, Any] = {"issues": list(issues.values())}
+    if changed or any("changed" in part for part in parts):
+        merged["changed"] = list(dict.fromkeys(changed))
+    return merged
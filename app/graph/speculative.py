@@ -0,0 +1,108 @@
+from __future__ import annotations
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+
+from app.graph.router import classify_by_rules, normalize_transcript
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Start likely fetches while the coordinator LLM is still deciding
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "false").lower() == "true"
+# Cancel prefetches the router didn't select (default keeps them so they land in the response cache)
+CANCEL_UNUSED = os.getenv("SPECULATIVE_CANCEL_UNUSED", "false").lower() == "true"
+HISTORY_SIZE = int(os.getenv("SPECULATIVE_HISTORY_SIZE", "50"))
+
+SOURCE_FLAGS = {"github": "is_git", "jira": "is_jira", "meeting_notes": "is_meeting_notes"}
+
+Fetcher = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# run_id -> {source: task}
+_inflight: Dict[str, Dict[str, asyncio.Task]] = {}
+# recent routing decisions, used when the rules have no opinion
+_history: "deque[Dict[str, bool]]" = deque(maxlen=HISTORY_SIZE)
+_stats = {"started": 0, "useful": 0, "wasted": 0, "cancelled": 0, "failed": 0}
+
+
+def record_route(classification: Dict[str, bool]) -> None:
+    """Remember a final routing decision for future guesses."""
+    _history.append(dict(classification))
+
+
+def guess_sources(transcript: str) -> List[str]:
+    """Cheap local guess of which sources the coordinator will pick."""
+    classification, _ = classify_by_rules(normalize_transcript(transcript))
+    guessed = [source for source, flag in SOURCE_FLAGS.items() if classification.get(flag)]
+    if guessed or not _history:
+        return guessed
+
+    # Fall back to sources picked in most recent routes
+    counts: Counter = Counter()
+    for past in _history:
+        counts.update(flag for flag, on in past.items() if on)
+    return [source for source, flag in SOURCE_FLAGS.items() if counts[flag] * 2 > len(_history)]
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Speculative fetch failed: {task.exception()}")
+
+
+def start(run_id: str, state: Dict[str, Any], fetchers: Dict[str, Fetcher]) -> List[str]:
+    """Kick off fetches for the guessed sources; returns the started source names."""
+    sources = [s for s in guess_sources(state.get("transcript", "")) if s in fetchers]
+    if not sources:
+        return []
+    tasks = _inflight.setdefault(run_id, {})
+    for source in sources:
+        task = asyncio.create_task(fetchers[source](dict(state)))
+        task.add_done_callback(_consume_exception)
+        tasks[source] = task
+        _stats["started"] += 1
+    logger.info(f"Speculatively prefetching {sources}")
+    return sources
+
+
+def settle(run_id: str, selected: Iterable[str]) -> None:
+    """Account for the routing decision: unselected prefetches are wasted (kept or cancelled)."""
+    tasks = _inflight.get(run_id)
+    if not tasks:
+        return
+    selected = set(selected)
+    for source in list(tasks):
+        if source in selected:
+            continue
+        task = tasks.pop(source)
+        _stats["wasted"] += 1
+        if CANCEL_UNUSED and not task.done():
+            task.cancel()
+            _stats["cancelled"] += 1
+    if not tasks:
+        _inflight.pop(run_id, None)
+
+
+async def claim(run_id: Optional[str], source: str) -> Optional[Dict[str, Any]]:
+    """Result of a speculative fetch for `source`, or None if there wasn't a usable one."""
+    tasks = _inflight.get(run_id) if run_id else None
+    task = tasks.pop(source, None) if tasks else None
+    if tasks is not None and not tasks:
+        _inflight.pop(run_id, None)
+    if task is None:
+        return None
+    try:
+        result = await task
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.warning(f"Speculative {source} fetch failed, refetching: {e}")
+        return None
+    _stats["useful"] += 1
+    return result
+
+
+def speculative_stats() -> Dict[str, int]:
+    return dict(_stats, inflight_runs=len(_inflight))
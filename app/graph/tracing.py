@@ -0,0 +1,70 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+import functools
+import json
+import time
+
+from app.graph.records import to_json
+from app.metrics import LLM_TOKENS, NODE_LATENCY, PAYLOAD_BYTES
+
+# Trace entry of the node currently running in this task
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("briefly_node_trace", default=None)
+
+
+def record_usage(role: str, usage: Optional[Dict[str, Any]]) -> None:
+    """Add LLM token usage to the running node's trace entry and the token counter."""
+    if not usage:
+        return
+    entry = _current.get()
+    totals = entry.setdefault("usage", {}) if entry is not None else {}
+    for field in ("input_tokens", "output_tokens", "total_tokens"):
+        count = usage.get(field) or 0
+        totals[field] = totals.get(field, 0) + count
+        LLM_TOKENS.inc(count, role=role, kind=field)
+
+
+def annotate(**fields: Any) -> None:
+    """Attach extra diagnostics to the running node's trace entry."""
+    entry = _current.get()
+    if entry is not None:
+        entry.update(fields)
+
+
+def payload_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(json.dumps(value, default=to_json).encode())
+
+
+def traced(name: str, source_key: Optional[str] = None):
+    """Time a graph node and append a trace entry to GraphState["trace"].
+
+    `source_key` names the state key holding fetched data whose size is recorded.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(state):
+            entry: Dict[str, Any] = {"node": name, "ok": True}
+            token = _current.set(entry)
+            start = time.perf_counter()
+            try:
+                result = await fn(state)
+            finally:
+                elapsed = time.perf_counter() - start
+                _current.reset(token)
+                NODE_LATENCY.observe(elapsed, node=name)
+            entry["latencyMs"] = int(elapsed * 1000)
+
+            if source_key is not None:
+                size = payload_size((result or {}).get(source_key))
+                entry["payloadBytes"] = size
+                PAYLOAD_BYTES.inc(size, source=source_key)
+
+            result = dict(result or {})
+            result["trace"] = [entry]
+            return result
+        return wrapper
+    return decorator
@@ -1,11 +1,34 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, AliasChoices
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 import asyncio
+import json
+import os
+import threading
 import time
+from contextlib import asynccontextmanager
 from app.graph.meeting_prep_graph import build_meeting_prep_graph
+from app.graph.arcade_tools import auth_cache_stats, get_arcade_client, singleflight_stats
+from app.graph.context import context_share_stats
+from app.graph.notes_index import notes_index_stats
+from app.graph.answer_cache import answer_cache_stats
+from app.graph.deadline import deadline_at, synth_reserve_ms
+from app.graph.cache import get_response_cache
+from app.graph.shared_state import aclose_shared_state, get_shared_state, shared_state_stats
+from app.graph.router import router_stats
+from app.graph import sources
+from app.graph.replay import ainvoke_recorded, trace_recorder_stats
+from app.graph.speculative import speculative_stats
+from app.graph.llm import aclose_llm_clients, get_llm
+from app.auth import Caller, current_caller
+from app.metrics import register_stats, render_prometheus
+from app.encoding import encode_response, encoding_stats, parse_fields, select_fields, wants
+from app.batch import BATCH_MAX_ITEMS, BatchJob, BatchScheduler
+from app.prewarm import PREWARM_ENABLED, PrewarmScheduler, RecurringMeeting
+from app.graph.limits import STATE_CODES, health_stats, provider_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,9 +37,59 @@ logger = logging.getLogger(__name__)
 
 class SummarizeRequest(BaseModel):
     transcript: str = Field(validation_alias=AliasChoices("transcript", "trasncript"))
+    user_id: Optional[str] = None  # service API keys only; otherwise the authenticated user
+    no_cache: bool = False  # always generate a fresh briefing
+    deadline_ms: Optional[int] = None  # latency budget; overrides REQUEST_DEADLINE_MS
+    # repos / Jira projects for this briefing, e.g. {"github": {"repos": ["org/api"]}, "jira": {"projects": ["OPS"]}}
+    inputs: Optional[Dict[str, Any]] = None
+
+
+# Compile the graph and import provider SDKs in the background at startup,
+# so the port opens right away and the first request finds them ready
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+# Lazy initialization - compile the graph on first use (or during warm-up)
+_graph_app = None
+_graph_lock = threading.Lock()
+
+
+def get_graph_app():
+    global _graph_app
+    if _graph_app is None:
+        with _graph_lock:
+            if _graph_app is None:
+                _graph_app = build_meeting_prep_graph()
+    return _graph_app
+
+
+def warm_up() -> None:
+    """Compile the graph and build the LLM / Arcade clients ahead of the first request."""
+    start = time.perf_counter()
+    get_graph_app()
+    for warm in (lambda: get_llm("coordinator"), lambda: get_llm("synth"), get_arcade_client, get_shared_state):
+        try:
+            warm()
+        except Exception as e:
+            # missing credentials etc. surface on the first real call instead
+            logger.warning(f"Warm-up step failed: {e}")
+    logger.info(f"Warm-up finished in {int((time.perf_counter() - start) * 1000)} ms")
 
 
-app = FastAPI(title="Briefly Backend", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = asyncio.create_task(asyncio.to_thread(warm_up)) if STARTUP_WARMUP else None
+    prewarm = asyncio.create_task(prewarm_scheduler.run_forever()) if PREWARM_ENABLED else None
+    yield
+    if prewarm is not None:
+        prewarm.cancel()
+    if warmup is not None:
+        await warmup
+    # release pooled LLM / shared state connections
+    await aclose_llm_clients()
+    await aclose_shared_state()
+
+
+app = FastAPI(title="Briefly Backend", version="0.1.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -54,30 +127,339 @@ class AgentResponse(BaseModel):
     usage: Optional[Dict[str, Any]] = None
     errors: Optional[List[str]] = None
 
-# build state graph
-graph_app = build_meeting_prep_graph()
+# export cache / routing counters on /metrics
+register_stats("briefly_auth_cache", "Tool authorization cache counters", "stat", auth_cache_stats)
+register_stats("briefly_response_cache", "Source response cache counters", "stat", lambda: get_response_cache().stats)
+register_stats("briefly_router", "Coordinator routing decisions by source", "source", router_stats)
+register_stats("briefly_speculative", "Speculative prefetch counters", "stat", speculative_stats)
+register_stats("briefly_singleflight", "Coalesced source fetches", "stat", singleflight_stats)
+register_stats("briefly_context_share", "Shared context preparation reuse", "stat", context_share_stats)
+register_stats("briefly_answer_cache", "Synth answer cache counters", "stat", answer_cache_stats)
+register_stats("briefly_notes_index", "Meeting-notes vector index counters", "stat", notes_index_stats)
+register_stats("briefly_shared_state", "Shared state backend counters (backend 1 = shared across workers)", "stat", shared_state_stats)
+register_stats("briefly_trace_recorder", "Recorded graph runs (TRACE_RECORD_ENABLED)", "stat", trace_recorder_stats)
+register_stats("briefly_response_encoding", "/summarize response formats, compression and bytes", "stat", encoding_stats)
+
+
+def initial_state(
+    transcript: str,
+    user_id: Optional[str] = None,
+    no_cache: bool = False,
+    deadline_ms: Optional[int] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    state: Dict[str, Any] = {"transcript": transcript}
+    if user_id:
+        state["user_id"] = user_id
+    if no_cache:
+        state["no_cache"] = True
+    if inputs:
+        try:
+            sources.resolve(user_id, inputs)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        state["inputs"] = inputs
+    deadline = deadline_at(deadline_ms)
+    if deadline is not None:
+        state["deadline"] = deadline
+        state["synth_reserve_ms"] = synth_reserve_ms(deadline_ms)
+    return state
+
+
+def request_deadline_ms(req: SummarizeRequest, request: Request) -> Optional[int]:
+    """Latency budget from the body field, else the X-Deadline-Ms header."""
+    if req.deadline_ms is not None:
+        return req.deadline_ms
+    header = request.headers.get("x-deadline-ms")
+    if header is None:
+        return None
+    try:
+        return int(header)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be an integer (milliseconds)")
+
+
+SKIP_ERRORS = {
+    "deadline": "skipped: deadline exceeded",
+    "circuit_open": "skipped: provider circuit open",
+    "error": "skipped: fetch failed",
+}
+
+
+def build_steps(result_state: Dict[str, Any], latency: int):
+    """Per-node StepResults (wall time, payload size, tokens) plus aggregated LLM usage."""
+    trace = result_state.get("trace", [])
+    steps = [
+        StepResult(
+            name="graph_execute",
+            ok=True,
+            latencyMs=latency,
+            data={
+                "nodes": [entry["node"] for entry in trace],
+                "auth_cache": auth_cache_stats(),
+                "response_cache": dict(get_response_cache().stats),
+                "speculative": speculative_stats(),
+                "singleflight": singleflight_stats(),
+                "context_share": context_share_stats(),
+                "answer_cache": answer_cache_stats(),
+                "shared_state": shared_state_stats(),
+                "skippedSources": result_state.get("skipped", []),
+                "providers": health_stats(),
+            },
+        )
+    ]
+
+    usage: Dict[str, Any] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "by_node": {}}
+    for entry in trace:
+        data = {k: v for k, v in entry.items() if k not in ("node", "ok", "latencyMs")}
+        if entry["node"] == "coordinator":
+            routing = result_state.get("routing") or {}
+            data.update(routing=routing.get("source"), router=router_stats())
+        if "usage" in entry:
+            usage["by_node"][entry["node"]] = entry["usage"]
+            for field in ("input_tokens", "output_tokens", "total_tokens"):
+                usage[field] += entry["usage"].get(field, 0)
+        steps.append(StepResult(
+            name=entry["node"],
+            ok=entry.get("ok", True),
+            latencyMs=entry.get("latencyMs", 0),
+            data=data or None,
+            error=SKIP_ERRORS.get(entry["skipped"], f"skipped: {entry['skipped']}") if entry.get("skipped") else None,
+        ))
+    return steps, usage
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    """Prometheus-style metrics: node/provider latency histograms, tokens, payload sizes."""
+    return render_prometheus()
 
 @app.post("/summarize", response_model=AgentResponse)
-async def summarize(req: SummarizeRequest) -> AgentResponse:
+async def summarize(
+    req: SummarizeRequest, request: Request, fields: Optional[str] = None, caller: Caller = Depends(current_caller)
+) -> Response:
+    """Briefing for a transcript.
+
+    JSON or MessagePack per Accept, gzip / brotli per Accept-Encoding;
+    `fields=result.summary,usage.total_tokens` returns only those fields.
+    """
     start = time.perf_counter()
-    state = {"transcript": req.transcript}
+    try:
+        paths = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    state = initial_state(
+        req.transcript, caller.user_for(req.user_id), req.no_cache, request_deadline_ms(req, request), req.inputs
+    )
     try:
         # final state object
-        result_state = await graph_app.ainvoke(state)
+        result_state = await ainvoke_recorded(get_graph_app(), state)
 
         # calaculate latency
         latency = int((time.perf_counter() - start) * 1000)
 
-        # steps for diagnotics
-        steps = [
-            StepResult(name="graph_execute", ok=True, latencyMs=latency, data={"nodes": list(result_state.keys())})
-        ]
-        return AgentResponse(result={"summary": result_state.get("summary", ""), "classification": result_state.get("classification", {})}, steps=steps)
+        # steps for diagnotics (skipped when the client didn't ask for them)
+        steps, usage = build_steps(result_state, latency) if wants(paths, "steps") or wants(paths, "usage") else ([], None)
+        response = AgentResponse(
+            result={"summary": result_state.get("summary", ""), "classification": result_state.get("classification", {})},
+            steps=steps,
+            usage=usage,
+        )
     except Exception as e:
         latency = int((time.perf_counter() - start) * 1000)
         logger.exception("Graph execution failed")
         steps = [StepResult(name="graph_execute", ok=False, latencyMs=latency, error=str(e))]
-        return AgentResponse(result="", steps=steps, errors=[str(e)])
+        response = AgentResponse(result="", steps=steps, errors=[str(e)])
+
+    payload: Any = response
+    if paths is not None:
+        payload = select_fields(response.model_dump(mode="json"), paths)
+        if response.errors:
+            payload["errors"] = response.errors  # failures are always reported
+    return encode_response(payload, request.headers.get("accept", ""), request.headers.get("accept-encoding", ""))
+
+
+SOURCE_NODES = ("github", "jira", "meeting_notes")
+
+
+async def stream_graph_events(state: Dict[str, Any]):
+    """Yield progress events for one graph run: routing, each source, synth tokens, done."""
+    start = time.perf_counter()
+    summary = ""
+    try:
+        async for event in get_graph_app().astream_events(state, version="v2"):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+            elapsed = int((time.perf_counter() - start) * 1000)
+
+            if kind == "on_chain_end" and event["name"] == "coordinator":
+                output = event["data"].get("output") or {}
+                yield {
+                    "event": "routing",
+                    "classification": output.get("classification", {}),
+                    "routing": output.get("routing"),
+                    "latencyMs": elapsed,
+                }
+            elif kind == "on_chain_end" and event["name"] in SOURCE_NODES:
+                output = event["data"].get("output") or {}
+                skipped = event["name"] in (output.get("skipped") or [])
+                source = {"event": "source", "name": event["name"], "ok": not skipped, "latencyMs": elapsed}
+                if skipped:
+                    reasons = [entry.get("skipped") for entry in output.get("trace") or []]
+                    source["skipped"] = next((r for r in reasons if r), "circuit_open")
+                yield source
+            elif kind == "on_chat_model_stream" and node == "synth":
+                text = event["data"]["chunk"].content
+                if text:
+                    yield {"event": "token", "text": text}
+            elif kind == "on_chain_end" and event["name"] == "synth":
+                summary = (event["data"].get("output") or {}).get("summary", "")
+
+        yield {"event": "done", "summary": summary, "latencyMs": int((time.perf_counter() - start) * 1000)}
+    except Exception as e:
+        logger.exception("Graph streaming failed")
+        yield {"event": "error", "error": str(e), "latencyMs": int((time.perf_counter() - start) * 1000)}
+
+
+@app.post("/summarize/stream")
+async def summarize_stream(
+    req: SummarizeRequest, request: Request, caller: Caller = Depends(current_caller)
+) -> StreamingResponse:
+    """Streaming /summarize: NDJSON by default, SSE when the client accepts text/event-stream."""
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    state = initial_state(
+        req.transcript, caller.user_for(req.user_id), req.no_cache, request_deadline_ms(req, request), req.inputs
+    )
+
+    async def body():
+        async for event in stream_graph_events(state):
+            line = json.dumps(event, default=str)
+            yield f"data: {line}\n\n" if sse else line + "\n"
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    transcript: str
+    user_id: Optional[str] = None
+    inputs: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    mode: Literal["sync", "async"] = "sync"
+
+
+async def run_batch_item(item: Dict[str, Any], on_node) -> Dict[str, Any]:
+    """Run one briefing, reporting each finished node for progress."""
+    final: Dict[str, Any] = {}
+    state = initial_state(item["transcript"], item.get("user_id"), inputs=item.get("inputs"))
+    async for mode, chunk in get_graph_app().astream(state, stream_mode=["updates", "values"]):
+        if mode == "updates":
+            for node in chunk:
+                on_node(node)
+        else:
+            final = chunk
+    return {"summary": final.get("summary", ""), "classification": final.get("classification", {})}
+
+
+batch_scheduler = BatchScheduler(run_batch_item)
+
+
+async def run_prewarm(meeting: RecurringMeeting) -> None:
+    """Fetch fresh source data and regenerate the briefing, filling the response and answer caches."""
+    state = dict(initial_state(meeting.transcript, meeting.user_id, inputs=meeting.inputs), refresh=True)
+    await get_graph_app().ainvoke(state)
+
+
+prewarm_scheduler = PrewarmScheduler(run_prewarm)
+register_stats("briefly_prewarm", "Pre-warm scheduler counters", "stat", lambda: prewarm_scheduler.stats_dict())
+register_stats("briefly_provider_active", "In-flight calls per provider", "provider",
+               lambda: {p: s["active"] for p, s in provider_stats().items()})
+register_stats("briefly_provider_limit", "Adaptive concurrency limit per provider", "provider",
+               lambda: {p: s["limit"] for p, s in provider_stats().items()})
+register_stats("briefly_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", "key",
+               lambda: {k: STATE_CODES[h["state"]] for k, h in health_stats().items()})
+register_stats("briefly_provider_error_rate", "Recent error rate per provider / LLM role", "key",
+               lambda: {k: h["errorRate"] for k, h in health_stats().items()})
+register_stats("briefly_provider_latency_ewma_ms", "Latency EWMA per provider / LLM role", "key",
+               lambda: {k: h["latencyEwmaMs"] for k, h in health_stats().items() if h["latencyEwmaMs"] is not None})
+
+
+@app.post("/summarize/batch")
+async def summarize_batch(req: BatchRequest, caller: Caller = Depends(current_caller)) -> Dict[str, Any]:
+    """Many briefings in one call; mode=async returns a job id to poll."""
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_ITEMS} items per batch")
+    items = [dict(item.model_dump(), user_id=caller.user_for(item.user_id)) for item in req.items]
+    # reject bad inputs up front rather than as per-item failures once the job runs
+    for i, item in enumerate(items):
+        if item["inputs"]:
+            try:
+                sources.resolve(item["user_id"], item["inputs"])
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"items[{i}]: {e}")
+    if req.mode == "async":
+        job = await batch_scheduler.submit(items)
+        return {"jobId": job.id, "status": job.status, "progress": job.counts()}
+
+    start = time.perf_counter()
+    job = await batch_scheduler.run(BatchJob(items))
+    return dict(job.to_dict(), latencyMs=int((time.perf_counter() - start) * 1000), providers=provider_stats())
+
+
+@app.get("/summarize/batch/{job_id}")
+async def summarize_batch_status(job_id: str, caller: Caller = Depends(current_caller)) -> Dict[str, Any]:
+    job = await batch_scheduler.get(job_id)
+    if job is None or not all(caller.can_see(item["user_id"]) for item in job["items"]):
+        raise HTTPException(status_code=404, detail="Unknown batch job")
+    return job
+
+
+class PrewarmMeeting(BaseModel):
+    user_id: Optional[str] = None  # service API keys only; otherwise the authenticated user
+    at: str = Field(description="local start time, HH:MM")
+    days: Optional[List[str]] = None  # mon..sun; default weekdays
+    timezone: str = "UTC"
+    transcript: str = "Prep me for standup"  # what the user will ask at meeting time
+    lead_minutes: Optional[float] = None
+    inputs: Optional[Dict[str, Any]] = None  # the repos / projects the user will ask with
+
+
+def _meeting_dict(meeting: RecurringMeeting) -> Dict[str, Any]:
+    due = prewarm_scheduler.next_runs().get(meeting.id)
+    return dict(meeting.to_dict(), nextPrewarm=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(due)) if due else None)
+
+
+@app.post("/prewarm/meetings")
+async def register_prewarm(req: PrewarmMeeting, caller: Caller = Depends(current_caller)) -> Dict[str, Any]:
+    """Register a recurring meeting whose briefing is prepared ahead of time."""
+    try:
+        meeting = RecurringMeeting(**dict(req.model_dump(), user_id=caller.user_for(req.user_id)))
+        if meeting.inputs:
+            sources.resolve(meeting.user_id, meeting.inputs)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _meeting_dict(prewarm_scheduler.register(meeting))
+
+
+@app.get("/prewarm/meetings")
+async def list_prewarm(user_id: Optional[str] = None, caller: Caller = Depends(current_caller)) -> Dict[str, Any]:
+    meetings = [
+        m for m in prewarm_scheduler.meetings.values()
+        if caller.can_see(m.user_id) and (user_id is None or m.user_id == user_id)
+    ]
+    return {"meetings": [_meeting_dict(m) for m in meetings]}
+
+
+@app.delete("/prewarm/meetings/{meeting_id}")
+async def unregister_prewarm(meeting_id: str, caller: Caller = Depends(current_caller)) -> Dict[str, Any]:
+    meeting = prewarm_scheduler.get(meeting_id)
+    if meeting is None or not caller.can_see(meeting.user_id) or not prewarm_scheduler.unregister(meeting_id):
+        raise HTTPException(status_code=404, detail="Unknown meeting")
+    return {"id": meeting_id, "deleted": True}
 
 
 if __name__ == "__main__":
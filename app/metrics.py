@@ -0,0 +1,96 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Minimal Prometheus text-format metrics (no client library needed)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted(labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    inner = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs)
+    return "{" + inner + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _labels(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_fmt_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # label key -> (bucket counts, sum, count)
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        counts, total, n = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+        idx = bisect_left(self.buckets, value)
+        if idx < len(counts):
+            counts[idx] += 1
+        self._values[key] = (counts, total + value, n + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, n) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(key, [('le', '+Inf')])} {n}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {n}")
+        return lines
+
+
+NODE_LATENCY = Histogram("briefly_node_latency_seconds", "Wall time per graph node")
+PROVIDER_LATENCY = Histogram("briefly_provider_latency_seconds", "Latency per external provider call")
+PROVIDER_ERRORS = Counter("briefly_provider_errors_total", "Failed external provider calls")
+LLM_TOKENS = Counter("briefly_llm_tokens_total", "LLM token usage")
+PAYLOAD_BYTES = Counter("briefly_source_payload_bytes_total", "Bytes fetched per source")
+
+_metrics = [NODE_LATENCY, PROVIDER_LATENCY, PROVIDER_ERRORS, LLM_TOKENS, PAYLOAD_BYTES]
+# name -> callable returning {label value: number}; exported as gauges
+_gauge_sources: Dict[str, Tuple[str, str, Callable[[], Dict[str, float]]]] = {}
+
+
+def register_stats(name: str, help: str, label: str, collect: Callable[[], Dict[str, float]]) -> None:
+    """Export a stats dict (e.g. cache counters) as a labelled gauge."""
+    _gauge_sources[name] = (help, label, collect)
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for name, (help, label, collect) in sorted(_gauge_sources.items()):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        for key, value in sorted(collect().items()):
+            if isinstance(value, (int, float)):
+                lines.append(f"{name}{_fmt_labels(((label, key),))} {value}")
+    return "\n".join(lines) + "\n"
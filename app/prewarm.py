@@ -0,0 +1,322 @@
+from __future__ import annotations
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
+import asyncio
+import fcntl
+import heapq
+import json
+import logging
+import os
+import random
+import time
+import uuid
+
+from app.graph import shared_state
+from app.graph.router import classify_by_rules, normalize_transcript
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Run briefings for registered recurring meetings ahead of time, so the
+# request at meeting time is served from the response and answer caches
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "true").lower() == "true"
+PREWARM_LEAD_MINUTES = float(os.getenv("PREWARM_LEAD_MINUTES", "5"))
+# Pre-warms start up to this many seconds earlier than the lead, at random,
+# so everyone's 9:30 standup doesn't hit the providers in the same second
+PREWARM_JITTER_SECONDS = float(os.getenv("PREWARM_JITTER_SECONDS", "120"))
+# Pre-warm calls allowed per provider per minute (on top of live traffic)
+PREWARM_RATE_PER_MINUTE = float(os.getenv("PREWARM_RATE_PER_MINUTE", "30"))
+PREWARM_MAX_CONCURRENCY = int(os.getenv("PREWARM_MAX_CONCURRENCY", "4"))
+# Registrations are persisted here (and re-read when another worker changes it)
+PREWARM_FILE = os.getenv("PREWARM_FILE", ".cache/prewarm.json")
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# classification flag -> provider its source node calls
+FLAG_PROVIDERS = {"is_git": "github", "is_jira": "jira", "is_meeting_notes": "notion"}
+
+
+class SystemClock:
+    """Wall-clock time; tests and benchmarks swap in a fake one."""
+
+    def now(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+class RecurringMeeting:
+    """A meeting that repeats at `at` (local time in `timezone`) on `days`."""
+
+    def __init__(
+        self,
+        user_id: Optional[str],
+        at: str,
+        days: Optional[List[str]] = None,
+        timezone: str = "UTC",
+        transcript: str = "Prep me for standup",
+        lead_minutes: Optional[float] = None,
+        id: Optional[str] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id or uuid.uuid4().hex[:12]
+        self.user_id = user_id
+        self.at = dt_time.fromisoformat(at)
+        self.days = [d.lower()[:3] for d in (days or WEEKDAYS[:5])]
+        if any(d not in WEEKDAYS for d in self.days):
+            raise ValueError(f"days must be among {', '.join(WEEKDAYS)}")
+        self.timezone = timezone
+        self.tz = ZoneInfo(timezone)
+        self.transcript = transcript
+        self.lead_minutes = PREWARM_LEAD_MINUTES if lead_minutes is None else lead_minutes
+        # repos / projects, as in the /summarize request the pre-warm stands in for
+        self.inputs = inputs
+
+    def next_meeting(self, after: float) -> float:
+        """Timestamp of the first meeting whose pre-warm time is after `after`."""
+        lead = self.lead_minutes * 60
+        day = datetime.fromtimestamp(after, self.tz).date()
+        for offset in range(8):
+            candidate = day + timedelta(days=offset)
+            if WEEKDAYS[candidate.weekday()] not in self.days:
+                continue
+            start = datetime.combine(candidate, self.at, self.tz).timestamp()
+            if start - lead > after:
+                return start
+        raise ValueError(f"meeting {self.id} has no upcoming occurrence")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "at": self.at.strftime("%H:%M"),
+            "days": self.days,
+            "timezone": self.timezone,
+            "transcript": self.transcript,
+            "lead_minutes": self.lead_minutes,
+            "inputs": self.inputs,
+        }
+
+
+class TokenBucket:
+    """`rate` calls per minute with bursts of ~10 seconds' worth, timed by `clock`."""
+
+    def __init__(self, rate_per_minute: float, clock):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(self.rate * 10, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock.now()
+
+    async def take(self) -> float:
+        """Wait for a token; returns seconds waited."""
+        waited = 0.0
+        while True:
+            now = self.clock.now()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            waited += delay
+            await self.clock.sleep(delay)
+
+
+# (meeting) -> None ; runs the fetch stage + synth for the meeting's transcript
+RunMeeting = Callable[[RecurringMeeting], Awaitable[Any]]
+# transcript -> providers the briefing will call
+ProvidersFor = Callable[[str], List[str]]
+
+
+def likely_providers(transcript: str) -> List[str]:
+    """Providers a briefing for `transcript` will call (all of them when the rules can't tell)."""
+    result, confidence = classify_by_rules(normalize_transcript(transcript))
+    return [provider for flag, provider in FLAG_PROVIDERS.items() if result.get(flag) or not confidence]
+
+
+class PrewarmScheduler:
+    """Runs each registered meeting's briefing `lead_minutes` (minus jitter) before it starts."""
+
+    def __init__(
+        self,
+        run_meeting: RunMeeting,
+        providers_for: ProvidersFor = likely_providers,
+        clock=None,
+        jitter: float = PREWARM_JITTER_SECONDS,
+        rate_per_minute: float = PREWARM_RATE_PER_MINUTE,
+        max_concurrency: int = PREWARM_MAX_CONCURRENCY,
+        path: Optional[str] = PREWARM_FILE,
+        rng: Optional[random.Random] = None,
+    ):
+        self.run_meeting = run_meeting
+        self.providers_for = providers_for
+        self.clock = clock or SystemClock()
+        self.jitter = jitter
+        self.rate_per_minute = rate_per_minute
+        self.max_concurrency = max_concurrency
+        self.path = path
+        self.rng = rng or random.Random()
+        self.meetings: Dict[str, RecurringMeeting] = {}
+        # (due at, meeting id, meeting start) ; stale entries are skipped when popped
+        self._queue: List[tuple] = []
+        self._due: Dict[str, float] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._mtime: Optional[float] = None
+        self._tasks: set = set()
+        self.stats = {"runs": 0, "errors": 0, "duplicates": 0, "rate_limited": 0}
+        self._load()
+
+    # ---- registrations ----
+
+    def register(self, meeting: RecurringMeeting) -> RecurringMeeting:
+        self._save(upsert=meeting)
+        self.meetings[meeting.id] = meeting
+        self._schedule(meeting, self.clock.now())
+        return meeting
+
+    def unregister(self, meeting_id: str) -> bool:
+        self._save(remove=meeting_id)
+        found = self.meetings.pop(meeting_id, None) is not None
+        self._due.pop(meeting_id, None)
+        return found
+
+    def get(self, meeting_id: str) -> Optional[RecurringMeeting]:
+        self._load()  # may have been registered through another worker
+        return self.meetings.get(meeting_id)
+
+    def next_runs(self) -> Dict[str, float]:
+        """Meeting id -> when its next pre-warm is due."""
+        return dict(self._due)
+
+    def _schedule(self, meeting: RecurringMeeting, after: float) -> None:
+        start = meeting.next_meeting(after)
+        due = max(start - meeting.lead_minutes * 60 - self.rng.uniform(0, self.jitter), after)
+        self._due[meeting.id] = due
+        heapq.heappush(self._queue, (due, meeting.id, start))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            with open(self.path) as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._mtime = mtime
+        now = self.clock.now()
+        loaded = {}
+        for item in raw.get("meetings", []):
+            try:
+                meeting = RecurringMeeting(**item)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping pre-warm registration {item}: {e}")
+                continue
+            loaded[meeting.id] = meeting
+        for meeting_id in set(self.meetings) - set(loaded):
+            self._due.pop(meeting_id, None)
+        for meeting in loaded.values():
+            if meeting.id not in self.meetings or meeting.to_dict() != self.meetings[meeting.id].to_dict():
+                self.meetings[meeting.id] = meeting
+                self._schedule(meeting, now)
+        self.meetings = {k: self.meetings[k] for k in loaded}
+
+    def _save(self, upsert: Optional[RecurringMeeting] = None, remove: Optional[str] = None) -> None:
+        """Apply one change to the registrations file.
+
+        Read-modify-write under a file lock, so a worker's save never drops
+        registrations other workers made since it last read the file.
+        """
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(self.path + ".lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+                self._mtime = None
+                self._load()
+                meetings = dict(self.meetings)
+                if upsert is not None:
+                    meetings[upsert.id] = upsert
+                meetings.pop(remove, None)
+                with open(tmp, "w") as f:
+                    json.dump({"meetings": [m.to_dict() for m in meetings.values()]}, f, indent=1)
+                os.replace(tmp, self.path)
+                self._mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            logger.warning(f"Could not save pre-warm registrations: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ---- running ----
+
+    async def run_forever(self, poll_interval: float = 60.0) -> None:
+        """Scheduler loop (started from the app lifespan)."""
+        self._wakeup = asyncio.Event()
+        while True:
+            self._load()
+            now = self.clock.now()
+            while self._queue and self._queue[0][0] <= now:
+                due, meeting_id, start = heapq.heappop(self._queue)
+                meeting = self.meetings.get(meeting_id)
+                if meeting is None or self._due.get(meeting_id) != due:
+                    continue  # unregistered or rescheduled
+                task = asyncio.create_task(self._prewarm(meeting, start))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                self._schedule(meeting, start)
+            wait = min(self._queue[0][0] - now if self._queue else poll_interval, poll_interval)
+            await self._sleep(max(wait, 0.0))
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep on the clock, cut short when a registration changes the schedule."""
+        self._wakeup.clear()
+        sleeper = asyncio.ensure_future(self.clock.sleep(seconds))
+        woken = asyncio.ensure_future(self._wakeup.wait())
+        try:
+            await asyncio.wait({sleeper, woken}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sleeper.cancel()
+            woken.cancel()
+
+    async def _prewarm(self, meeting: RecurringMeeting, start: float) -> None:
+        # with several workers / replicas, one of them pre-warms each occurrence
+        if not await shared_state.acquire(f"prewarm:{meeting.id}:{int(start)}", ttl=meeting.lead_minutes * 60 + self.jitter):
+            self.stats["duplicates"] += 1
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            for provider in self.providers_for(meeting.transcript):
+                bucket = self._buckets.get(provider)
+                if bucket is None:
+                    bucket = self._buckets[provider] = TokenBucket(self.rate_per_minute, self.clock)
+                if await bucket.take():
+                    self.stats["rate_limited"] += 1
+            try:
+                await self.run_meeting(meeting)
+                self.stats["runs"] += 1
+                logger.info(f"Pre-warmed {meeting.id} for {meeting.user_id} ({(start - self.clock.now()) / 60:.1f} min ahead)")
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception(f"Pre-warm of {meeting.id} failed")
+
+    async def drain(self) -> None:
+        """Wait for pre-warms already started (tests / shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats_dict(self) -> Dict[str, int]:
+        return dict(self.stats, meetings=len(self.meetings), running=len(self._tasks))
@@ -1,13 +1,22 @@
 from typing import Any, Dict
 import logging
 import json
-from arcadepy import Arcade
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-client = Arcade(os.getenv("ARCADE_API_KEY"))
+# Lazy initialization - create client only when needed
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        from arcadepy import Arcade
+
+        _client = Arcade(api_key=os.getenv("ARCADE_API_KEY"))
+    return _client
 
 async def node_github(owner: str, repo: str) -> Dict[str, Any]:
     logging.info("GitHub node started")
@@ -19,6 +28,7 @@ async def node_github(owner: str, repo: str) -> Dict[str, Any]:
     repo = "mock_repo_frontend"
     state = "open"
 
+    client = get_client()
     auth_response = client.tools.authorize(
         tool_name=TOOL_NAME,
         user_id=USER_ID,
@@ -0,0 +1,50 @@
+"""Provider calls vs concurrent duplicate briefings, with and without single-flight.
+
+    python -m benchmarks.coalescing --concurrency 1 10 50 100
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.fakes import BRIEFING, COORDINATOR_ALL, FakeArcade, FakeLLM
+
+
+async def run_wave(graph_app, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(graph_app.ainvoke({"transcript": "Prep me for standup"}) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+async def main(levels, latency: float) -> None:
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+
+    from app.graph import arcade_tools, cache, llm
+    from app.graph.meeting_prep_graph import build_meeting_prep_graph
+
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.05))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.1))
+    graph_app = build_meeting_prep_graph()
+
+    print(f"{'concurrent':>10} {'coalescing':>10} {'provider calls':>15} {'wall (s)':>9}")
+    for enabled in (False, True):
+        arcade_tools.SINGLEFLIGHT_ENABLED = enabled
+        for n in levels:
+            fake = FakeArcade(default_latency=latency)
+            arcade_tools.set_arcade_client(fake)
+            cache.set_response_cache(cache.ResponseCache())  # cold cache per wave
+            wall = await run_wave(graph_app, n)
+            print(f"{n:>10} {'on' if enabled else 'off':>10} {fake.provider_calls():>15} {wall:>9.2f}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--latency", type=float, default=0.3, help="fake provider latency (seconds)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.concurrency, args.latency))
@@ -0,0 +1,85 @@
+"""Prompt size and synth latency: full context vs the token-budgeted builder.
+
+    python -m benchmarks.context_builder --prs 200 --issues 300 --notes-kb 200
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.stub_openai import start_stub_server
+
+WORDS = ("auth login token refresh payment checkout invoice cache latency deploy rollout flag "
+         "migration schema index search mobile android ios onboarding email billing retry").split()
+
+
+def synthetic_inputs(n_prs: int, n_issues: int, notes_kb: int, seed: int = 7):
+    rng = random.Random(seed)
+
+    def sentence(n: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    issues = [
+        {
+            "key": f"OPS-{i}", "title": sentence(5), "status": {"name": rng.choice(["In Progress", "To Do", "Done"])},
+            "priority": {"name": "Medium"}, "assignee": {"name": "Matt Lau"}, "description": f"<p>{sentence(120)}</p>",
+            "parent": None, "created": "2025-10-16", "jira_gui_url": f"https://jira/OPS-{i}",
+        }
+        for i in range(n_issues)
+    ]
+    prs = [
+        {
+            "number": i, "title": (f"OPS-{i} " if i % 3 == 0 else "") + sentence(6), "state": "open",
+            "user": "matt", "body": sentence(150), "html_url": f"https://github/pr/{i}",
+        }
+        for i in range(n_prs)
+    ]
+    notes = []
+    while sum(len(n) for n in notes) < notes_kb * 1024:
+        notes.append(f"## {sentence(3)}\n{sentence(80)}\n")
+    return {"pull_requests": prs}, {"issues": issues}, "\n".join(notes)
+
+
+async def main(args) -> None:
+    base_url = start_stub_server(latency=0.05, per_1k_prompt_tokens=args.ms_per_1k / 1000)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["LLM_FALLBACK_ENABLED"] = "false"
+
+    from app.graph.context import build_context, estimate_tokens
+    from app.graph import llm
+
+    github, jira, notes = synthetic_inputs(args.prs, args.issues, args.notes_kb)
+    transcript = "What's the status of the payment checkout work?"
+
+    results = {}
+    for label, budget in (("full context", 10**9), (f"budget {args.budget}", args.budget)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            context, stats = build_context(transcript, github, jira, notes, budget=budget)
+        build_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        start = time.perf_counter()
+        await llm.ainvoke_llm("synth", [{"role": "user", "content": context}])
+        synth_ms = (time.perf_counter() - start) * 1000
+
+        results[label] = (estimate_tokens(context), build_ms, synth_ms, stats)
+        print(f"{label:<14} prompt≈{estimate_tokens(context):>8} tokens  build {build_ms:7.1f} ms  "
+              f"synth {synth_ms:8.1f} ms  items {stats['itemsIncluded']}/{stats['itemsConsidered']}")
+
+    (full_tokens, _, full_synth, _), (small_tokens, _, small_synth, _) = results.values()
+    print(f"prompt size -{100 * (1 - small_tokens / full_tokens):.1f}%   synth latency -{100 * (1 - small_synth / full_synth):.1f}%")
+    await llm.aclose_llm_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prs", type=int, default=200)
+    parser.add_argument("--issues", type=int, default=300)
+    parser.add_argument("--notes-kb", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ms-per-1k", type=float, default=20.0, help="stub synth latency per 1k prompt tokens (ms)")
+    asyncio.run(main(parser.parse_args()))
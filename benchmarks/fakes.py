@@ -0,0 +1,184 @@
+"""Local stand-ins for the Arcade client and the LLMs used by the graph.
+
+Latency, error rate and payload size are configurable; every call is counted
+so benchmarks can report provider-call scaling.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+import asyncio
+import heapq
+import random
+
+from langchain_core.messages import AIMessage
+
+GITHUB_TOOL = "Github.ListPullRequests"
+JIRA_TOOL = "Jira.GetIssuesWithoutId"
+NOTION_TOOL = "NotionToolkit.GetPageContentByTitle"
+
+
+def fake_pull_requests(n: int) -> Dict[str, Any]:
+    return {
+        "pull_requests": [
+            {
+                "number": 1000 + i, "title": f"Improve auth token refresh part {i}", "state": "open",
+                "user": "matt", "body": "Refreshes tokens before expiry. " * 10,
+                "html_url": f"https://github.com/org/repo/pull/{1000 + i}",
+                "updated_at": "2025-10-16T18:50:36Z",
+            }
+            for i in range(n)
+        ]
+    }
+
+
+def fake_jira_issues(n: int) -> Dict[str, Any]:
+    return {
+        "issues": [
+            {
+                "key": f"OPS-{i}", "title": f"Payment checkout step {i}", "status": {"name": "In Progress"},
+                "priority": {"name": "High"}, "assignee": {"name": "Matt Lau", "email": "mlau191@uw.edu"},
+                "description": "<p>Create a secure payment flow with retries.</p>" * 5,
+                "parent": None, "created": "2025-10-16T18:50:36.559-0700",
+                "updated": "2025-10-16T18:50:36.559-0700",
+                "jira_gui_url": f"https://jira/browse/OPS-{i}", "project": {"name": "briefly", "key": "OPS"},
+            }
+            for i in range(n)
+        ]
+    }
+
+
+def fake_meeting_notes(kb: int) -> str:
+    section = "## Standup {i}\nSarah mentioned the auth rollout is blocked on OPS-{i}. We decided to ship behind a flag.\n"
+    parts: List[str] = []
+    i = 0
+    while sum(len(p) for p in parts) < kb * 1024:
+        parts.append(section.format(i=i))
+        i += 1
+    return "\n".join(parts)
+
+
+class _FakeTools:
+    def __init__(self, owner: "FakeArcade"):
+        self.owner = owner
+
+    async def authorize(self, tool_name: str, user_id: str, **kwargs):
+        self.owner.calls["authorize"] += 1
+        return SimpleNamespace(status="completed", url=None, id="auth")
+
+    async def execute(self, tool_name: str, input: Dict[str, Any], user_id: str, **kwargs):
+        owner = self.owner
+        owner.calls[tool_name] += 1
+        await asyncio.sleep(owner.latency.get(tool_name, owner.default_latency))
+        if random.random() < owner.error_rate:
+            error = SimpleNamespace(kind="UPSTREAM_RUNTIME_SERVER_ERROR", message="fake upstream failure")
+            return SimpleNamespace(output=SimpleNamespace(value=None, error=error), success=False)
+        return SimpleNamespace(output=SimpleNamespace(value=owner.payload(tool_name, input), error=None), success=True)
+
+
+class _FakeAuth:
+    async def wait_for_completion(self, auth_response):
+        return auth_response
+
+
+class FakeArcade:
+    """Async Arcade stand-in with per-tool latency, error rate and payload size."""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, float]] = None,
+        default_latency: float = 0.2,
+        error_rate: float = 0.0,
+        prs: int = 5,
+        issues: int = 10,
+        notes_kb: int = 4,
+    ):
+        self.latency = latency or {}
+        self.default_latency = default_latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self._payloads = {
+            GITHUB_TOOL: fake_pull_requests(prs),
+            JIRA_TOOL: fake_jira_issues(issues),
+            NOTION_TOOL: fake_meeting_notes(notes_kb),
+        }
+        self.tools = _FakeTools(self)
+        self.auth = _FakeAuth()
+
+    def payload(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
+        return self._payloads.get(tool_name)
+
+    def provider_calls(self) -> int:
+        return sum(v for k, v in self.calls.items() if k != "authorize")
+
+
+class FakeLLM:
+    """Chat model stand-in: sleeps, then returns `content` with token usage."""
+
+    def __init__(self, content: str, latency: float = 0.3, error_rate: float = 0.0):
+        self.content = content
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if random.random() < self.error_rate:
+            raise RuntimeError("fake LLM failure")
+        prompt_tokens = sum(len(str(m.get("content", "")) if isinstance(m, dict) else str(m.content)) for m in messages) // 4
+        return AIMessage(
+            content=self.content,
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": 40, "total_tokens": prompt_tokens + 40},
+        )
+
+
+class FakeClock:
+    """Manually advanced clock for the pre-warm scheduler: sleep() returns once advance() passes its wake time."""
+
+    def __init__(self, start: float = 0.0):
+        self.t = start
+        self._sleepers: List[tuple] = []
+        self._seq = 0
+
+    def now(self) -> float:
+        return self.t
+
+    async def sleep(self, seconds: float) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._sleepers, (self.t + max(seconds, 0.0), self._seq, waiter))
+        await waiter
+
+    async def advance(self, seconds: float) -> None:
+        """Move time forward, waking sleepers in order and letting their tasks run."""
+        target = self.t + seconds
+        while True:
+            await self.settle()
+            if not self._sleepers or self._sleepers[0][0] > target:
+                break
+            wake, _, waiter = heapq.heappop(self._sleepers)
+            self.t = max(self.t, wake)
+            if not waiter.done():
+                waiter.set_result(None)
+        self.t = target
+        await self.settle()
+
+    @staticmethod
+    async def settle() -> None:
+        # zero-latency fakes finish within a few real milliseconds
+        for _ in range(5):
+            await asyncio.sleep(0.001)
+
+
+COORDINATOR_ALL = '{"is_git": true, "is_jira": true, "is_meeting_notes": true}'
+BRIEFING = "You shipped two PRs yesterday, so lead with that. Be ready to talk about OPS-7."
+
+# Service API key the benchmarks post with: they brief many user_ids from one client
+BENCH_HEADERS = {"X-API-Key": "bench"}
+
+
+def allow_bench_key() -> None:
+    from app import auth
+
+    auth.set_api_keys({BENCH_HEADERS["X-API-Key"]: auth.SERVICE_USER})
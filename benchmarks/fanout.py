@@ -0,0 +1,96 @@
+"""Multi-repo / multi-project fetch: bounded parallel fan-out vs one call at a time.
+
+    python -m benchmarks.fanout --repos 5 --pages 2 --projects 2
+
+Each tool call takes a random latency between --min-latency and --max-latency.
+The fetch node's wall time is compared with the slowest single call (the
+floor) and with the sum of all calls (what running them one by one costs).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.fakes import GITHUB_TOOL, JIRA_TOOL, FakeArcade, fake_jira_issues, fake_pull_requests
+
+
+class VaryingArcade(FakeArcade):
+    """Distinct PRs / issues per repo, project and page, and a random latency per call."""
+
+    def __init__(self, min_latency: float, max_latency: float, per_page: int):
+        super().__init__()
+        self.min_latency, self.max_latency, self.per_page = min_latency, max_latency, per_page
+        self.latencies = []
+        self._variants = {}
+        execute = self.tools.execute
+
+        async def timed_execute(tool_name, input, user_id, **kwargs):
+            self.default_latency = random.uniform(self.min_latency, self.max_latency)
+            self.latencies.append(self.default_latency)
+            return await execute(tool_name, input, user_id, **kwargs)
+
+        self.tools.execute = timed_execute
+
+    def payload(self, tool_name, tool_input):
+        key = (tool_name, tuple(sorted(tool_input.items())))
+        if key not in self._variants:
+            offset = abs(hash(key)) % 10_000 * 100
+            if tool_name == GITHUB_TOOL:
+                data = fake_pull_requests(self.per_page)
+                for pr in data["pull_requests"]:
+                    pr["number"] += offset
+            elif tool_name == JIRA_TOOL:
+                data = fake_jira_issues(tool_input.get("limit", 10))
+                for issue in data["issues"]:
+                    issue["key"] = f"{tool_input['project'].upper()}-{offset + int(issue['key'].split('-')[1])}"
+            else:
+                data = super().payload(tool_name, tool_input)
+            self._variants[key] = data
+        return self._variants[key]
+
+
+async def run(args, limit: int) -> None:
+    from app.graph import arcade_tools, cache, sources
+    from app.graph.meeting_prep_graph import fetch_github, fetch_jira
+
+    sources.FETCH_FANOUT_CONCURRENCY = limit
+    inputs = {
+        "github": {"repos": [f"org/repo{i}" for i in range(args.repos)], "per_page": args.per_page, "max_pages": args.pages},
+        "jira": {"projects": [f"p{i}" for i in range(args.projects)], "max_pages": args.pages},
+    }
+    for name, fetch, key, items in (("github", fetch_github, "github", "pull_requests"), ("jira", fetch_jira, "jira", "issues")):
+        fake = VaryingArcade(args.min_latency, args.max_latency, args.per_page)
+        arcade_tools.set_arcade_client(fake)
+        cache.set_response_cache(cache.ResponseCache())  # cold
+        start = time.perf_counter()
+        result = await fetch({"user_id": "bench@example.com", "inputs": inputs})
+        wall = (time.perf_counter() - start) * 1000
+        calls = fake.provider_calls()
+        print(f"{name:<7} {limit:>6} {calls:>6} {len(result[key][items]):>6} {wall:>9.0f} "
+              f"{max(fake.latencies) * 1000:>11.0f} {sum(fake.latencies) * 1000:>9.0f}")
+
+
+async def main(args) -> None:
+    print(f"{'node':<7} {'pool':>6} {'calls':>6} {'items':>6} {'wall ms':>9} {'slowest ms':>11} {'sum ms':>9}")
+    for limit in (1, args.concurrency):
+        random.seed(0)
+        await run(args, limit)
+
+
+if __name__ == "__main__":
+    import logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=5)
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8, help="FETCH_FANOUT_CONCURRENCY to compare with 1")
+    parser.add_argument("--min-latency", type=float, default=0.2)
+    parser.add_argument("--max-latency", type=float, default=0.6)
+    args = parser.parse_args()
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args))
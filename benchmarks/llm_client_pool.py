@@ -0,0 +1,62 @@
+"""Throughput of per-call ChatOpenAI construction vs the shared LLM registry.
+
+    python -m benchmarks.llm_client_pool --requests 400 --concurrency 50
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.stub_openai import start_stub_server
+
+MESSAGES = [{"role": "system", "content": "You are a stub."}, {"role": "user", "content": "Prep me for standup"}]
+
+
+async def run(label: str, call, total: int, concurrency: int) -> None:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {total} requests in {elapsed:.2f}s  ->  {total / elapsed:.1f} req/s")
+
+
+async def main(total: int, concurrency: int, latency: float) -> None:
+    base_url = start_stub_server(latency=latency)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["LLM_FALLBACK_ENABLED"] = "false"
+    os.environ["LLM_MAX_CONCURRENCY"] = str(concurrency)
+
+    from langchain_openai import ChatOpenAI
+    from app.graph import llm
+
+    async def per_call():
+        client = ChatOpenAI(model="gpt-4o-mini", temperature=0, base_url=base_url)
+        await client.ainvoke(MESSAGES)
+
+    async def pooled():
+        await llm.ainvoke_llm("coordinator", MESSAGES)
+
+    # warm both paths once
+    await per_call()
+    await pooled()
+
+    for _ in range(2):
+        await run("new ChatOpenAI per call", per_call, total, concurrency)
+        await run("shared registry", pooled, total, concurrency)
+    await llm.aclose_llm_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server latency (seconds)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
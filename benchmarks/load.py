@@ -0,0 +1,200 @@
+"""Load test /summarize in-process against local stand-ins for OpenAI and Arcade.
+
+    python -m benchmarks.load --requests 500 --concurrency 50
+    python -m benchmarks.load --llm stub --synth-latency 1.5 --jira-latency 2 --error-rate 0.05
+    python -m benchmarks.load --compare benchmarks/results/<commit>-default.json
+
+Reports p50/p95/p99 latency, requests/sec and per-node latency, and saves the
+run to benchmarks/results/<commit>-<label>.json for comparison across commits.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from benchmarks.fakes import (
+    BENCH_HEADERS, BRIEFING, COORDINATOR_ALL, GITHUB_TOOL, JIRA_TOOL, NOTION_TOOL, FakeArcade, FakeLLM, allow_bench_key,
+)
+
+TRANSCRIPTS = [
+    "Prep me for standup",  # rule-routed
+    "What's blocking us?",
+    "Status on auth feature?",
+    "What did Sarah mention about the rollout?",
+]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[idx]
+
+
+def summarize_latencies(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": max(values, default=0.0),
+    }
+
+
+def git_revision() -> str:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure(args) -> None:
+    """Environment for the app, set before it is imported."""
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+    os.environ["LLM_FALLBACK_ENABLED"] = "false"
+    if args.cold:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+        os.environ["SYNTH_CACHE_ENABLED"] = "false"
+    if args.llm == "stub":
+        from benchmarks.stub_openai import start_stub_server
+
+        os.environ["OPENAI_BASE_URL"] = start_stub_server(latency=args.synth_latency, error_rate=args.llm_error_rate)
+
+
+async def run(args) -> Dict[str, Any]:
+    import httpx
+    from app.graph import arcade_tools, llm
+    import app.main as main_module
+
+    fake = FakeArcade(
+        latency={GITHUB_TOOL: args.github_latency, JIRA_TOOL: args.jira_latency, NOTION_TOOL: args.notion_latency},
+        error_rate=args.error_rate,
+        prs=args.prs,
+        issues=args.issues,
+        notes_kb=args.notes_kb,
+    )
+    arcade_tools.set_arcade_client(fake)
+    if args.llm == "fake":
+        llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=args.coordinator_latency, error_rate=args.llm_error_rate))
+        llm.set_llm("synth", FakeLLM(BRIEFING, latency=args.synth_latency, error_rate=args.llm_error_rate))
+
+    latencies: List[float] = []
+    nodes: Dict[str, List[float]] = defaultdict(list)
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+
+    async def worker(client) -> None:
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body: Dict[str, Any] = {"transcript": TRANSCRIPTS[i % len(TRANSCRIPTS)], "user_id": f"user{i % args.users}@example.com"}
+            if args.deadline_ms:
+                body["deadline_ms"] = args.deadline_ms
+            start = time.perf_counter()
+            resp = await client.post("/summarize", json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            data = resp.json()
+            if resp.status_code != 200 or data.get("errors"):
+                errors += 1
+                continue
+            for step in data["steps"]:
+                if step["name"] != "graph_execute":
+                    nodes[step["name"]].append(step["latencyMs"])
+
+    allow_bench_key()
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, headers=BENCH_HEADERS) as client:
+        wall = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        wall = time.perf_counter() - wall
+    await llm.aclose_llm_clients()
+
+    return {
+        "commit": git_revision(),
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "out", "label")},
+        "latencyMs": summarize_latencies(latencies),
+        "rps": args.requests / wall,
+        "errors": errors,
+        "providerCalls": dict(fake.calls),
+        "nodes": {name: dict(summarize_latencies(values), count=len(values)) for name, values in sorted(nodes.items())},
+    }
+
+
+def report(result: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    def delta(new: float, old: float) -> str:
+        return f" ({100 * (new - old) / old:+.1f}%)" if old else ""
+
+    lat, base = result["latencyMs"], (baseline or {}).get("latencyMs", {})
+    print(f"commit {result['commit']}  {result['config']['requests']} requests @ concurrency {result['config']['concurrency']}")
+    for key in ("p50", "p95", "p99"):
+        print(f"  {key:<4} {lat[key]:9.1f} ms{delta(lat[key], base.get(key, 0))}")
+    print(f"  rps  {result['rps']:9.1f}{delta(result['rps'], (baseline or {}).get('rps', 0))}   errors {result['errors']}")
+    print(f"  {'node':<14} {'count':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    base_nodes = (baseline or {}).get("nodes", {})
+    for name, stats in result["nodes"].items():
+        old = base_nodes.get(name, {})
+        print(f"  {name:<14} {stats['count']:>6} {stats['p50']:>8.0f} {stats['p95']:>8.0f}{delta(stats['p95'], old.get('p95', 0))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10, help="distinct user_ids (cache / coalescing keys)")
+    parser.add_argument("--llm", choices=("fake", "stub"), default="fake",
+                        help="in-process fake models, or the HTTP stub OpenAI server (exercises the client pool)")
+    parser.add_argument("--coordinator-latency", type=float, default=0.4)
+    parser.add_argument("--synth-latency", type=float, default=1.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--github-latency", type=float, default=0.3)
+    parser.add_argument("--jira-latency", type=float, default=0.5)
+    parser.add_argument("--notion-latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Arcade tool error rate")
+    parser.add_argument("--prs", type=int, default=5)
+    parser.add_argument("--issues", type=int, default=10)
+    parser.add_argument("--notes-kb", type=int, default=4)
+    parser.add_argument("--deadline-ms", type=int, default=0)
+    parser.add_argument("--cold", action="store_true", help="disable the response and answer caches")
+    parser.add_argument("--label", default="default", help="name of this scenario in the results file")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    import logging
+
+    logging.disable(logging.WARNING)
+    configure(args)
+    result = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(result, baseline)
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{result['commit']}-{args.label}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Pre-warming a morning of standups on a fake clock.
+
+    python -m benchmarks.prewarm --users 100 --jitter 120 --rate 60
+
+Every user has a 09:30 standup. The scheduler runs on a fake clock from 09:00
+to 09:30. The benchmark reports the peak provider calls per minute (with and
+without jitter / rate limiting), pre-warms that finished late, and what the
+09:30 requests cost once the caches are warm.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.fakes import BENCH_HEADERS, BRIEFING, COORDINATOR_ALL, FakeArcade, FakeClock, FakeLLM, allow_bench_key
+
+MEETING = "09:30"
+
+
+async def scenario(args, jitter: float, rate: float, prewarm: bool) -> dict:
+    import httpx
+    from app.graph import arcade_tools, answer_cache, cache, llm
+    from app.prewarm import PrewarmScheduler, RecurringMeeting
+    import app.main as main_module
+
+    cache.set_response_cache(cache.ResponseCache())
+    answer_cache.set_answer_cache(answer_cache.AnswerCache())
+    day = datetime(2026, 10, 19, tzinfo=timezone.utc)  # a Monday
+    clock = FakeClock(day.replace(hour=9).timestamp())
+    meeting_at = day.replace(hour=9, minute=30).timestamp()
+
+    fake = FakeArcade(default_latency=0.0)
+    calls = []
+    execute = fake.tools.execute
+
+    async def timed_execute(*a, **kw):
+        calls.append(clock.now())
+        return await execute(*a, **kw)
+
+    fake.tools.execute = timed_execute
+    arcade_tools.set_arcade_client(fake)
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.0))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.0))
+
+    finished = []
+
+    async def run_meeting(meeting):
+        await main_module.run_prewarm(meeting)
+        finished.append(clock.now())
+
+    scheduler = PrewarmScheduler(run_meeting, clock=clock, jitter=jitter, rate_per_minute=rate,
+                                 max_concurrency=args.max_concurrency, path=None, rng=random.Random(0))
+    if prewarm:
+        for i in range(args.users):
+            scheduler.register(RecurringMeeting(f"user{i}@example.com", MEETING, lead_minutes=args.lead))
+        loop = asyncio.create_task(scheduler.run_forever())
+        while clock.now() < meeting_at:
+            await clock.advance(1.0)
+        loop.cancel()
+
+    # meeting time: real provider / model latency from here on
+    fake.default_latency = args.provider_latency
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=args.synth_latency))
+    prewarm_calls = len(calls)
+    latencies = []
+    allow_bench_key()
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, headers=BENCH_HEADERS) as client:
+        async def ask(i):
+            start = time.perf_counter()
+            await client.post("/summarize", json={"transcript": "Prep me for standup", "user_id": f"user{i}@example.com"})
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(ask(i) for i in range(args.users)))
+    await scheduler.drain()
+
+    per_minute = Counter(int(t // 60) for t in calls[:prewarm_calls])
+    return {
+        "prewarm calls": prewarm_calls,
+        "peak calls/min": max(per_minute.values(), default=0),
+        "late": sum(t > meeting_at for t in finished),
+        "09:30 calls": len(calls) - prewarm_calls,
+        "09:30 p50 ms": statistics.median(latencies),
+    }
+
+
+async def main(args) -> None:
+    from app.graph import llm
+
+    rows = [
+        ("no pre-warm", await scenario(args, 0, 1e9, prewarm=False)),
+        ("no jitter/limit", await scenario(args, 0, 1e9, prewarm=True)),
+        (f"jitter {args.jitter:.0f}s, {args.rate:.0f}/min", await scenario(args, args.jitter, args.rate, prewarm=True)),
+    ]
+    await llm.aclose_llm_clients()
+    cols = list(rows[0][1])
+    print(f"{'':<22}" + "".join(f"{c:>16}" for c in cols))
+    for label, row in rows:
+        print(f"{label:<22}" + "".join(f"{row[c]:>16.0f}" for c in cols))
+
+
+if __name__ == "__main__":
+    import logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--lead", type=float, default=5.0, help="minutes before the meeting")
+    parser.add_argument("--jitter", type=float, default=120.0, help="seconds")
+    parser.add_argument("--rate", type=float, default=60.0, help="pre-warm calls per provider per minute")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--provider-latency", type=float, default=0.3)
+    parser.add_argument("--synth-latency", type=float, default=1.2)
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+    os.environ.setdefault("PREWARM_ENABLED", "false")
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args))
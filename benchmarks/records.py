@@ -0,0 +1,87 @@
+"""Memory per item and render time: parsed dicts vs slotted records.
+
+    python -m benchmarks.records --issues 5000 --prs 5000 --renders 5
+"""
+from __future__ import annotations
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.context_builder import synthetic_inputs
+
+
+def legacy_issue(issue):
+    # the pre-records parsed shape: a dict per issue, HTML left in the description
+    return {
+        "key": issue["key"], "title": issue["title"], "status": issue["status"]["name"],
+        "priority": issue["priority"]["name"] if issue.get("priority") else "No Priority",
+        "assignee": issue["assignee"]["name"], "description": issue["description"],
+        "parent_epic": None, "created": issue["created"], "updated": issue.get("updated"),
+        "url": issue["jira_gui_url"],
+    }
+
+
+def legacy_render(issue, idx):
+    # per-render regex strip / truncate, as the context builder used to do
+    from app.graph.records import HTML_TAG, truncate
+    lines = [
+        f"  {idx}. {issue['key']}: {issue['title']}",
+        f"     Status: {issue['status']}, Priority: {issue['priority']}",
+        f"     Assignee: {issue['assignee']}",
+    ]
+    description = (issue.get("description") or "").strip()
+    if description:
+        lines.append(f"     Description: {truncate(HTML_TAG.sub('', description))}")
+    lines.append(f"     URL: {issue['url']}")
+    return lines
+
+
+def measure(build):
+    """(result, bytes allocated while building it)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main(args) -> None:
+    from app.graph.records import JiraIssue, PullRequest
+
+    github, jira, _ = synthetic_inputs(args.prs, args.issues, 0)
+    raw_issues, raw_prs = jira["issues"], github["pull_requests"]
+
+    dicts = [legacy_issue(i) for i in raw_issues]
+    issues, issue_bytes = measure(lambda: [JiraIssue.from_arcade(i) for i in raw_issues])
+    prs, pr_bytes = measure(lambda: [PullRequest.from_arcade(pr) for pr in raw_prs])
+    # same field values held in a dict vs in the slotted record: container overhead only
+    _, as_dict = measure(lambda: [dict(i.to_dict(), terms=i.terms, title_terms=i.title_terms) for i in issues])
+    _, as_record = measure(lambda: [JiraIssue(**i.to_dict(), terms=i.terms, title_terms=i.title_terms) for i in issues])
+    print(f"container/issue   dict {as_dict / len(issues):6.0f} B   slotted record {as_record / len(issues):6.0f} B")
+    print(f"total/record      issue {issue_bytes / len(issues):6.0f} B   PR {pr_bytes / len(prs):6.0f} B "
+          f"(incl. cleaned text and precomputed terms)")
+
+    ingest_ms = timed(lambda: [JiraIssue.from_arcade(i) for i in raw_issues], 1)
+    legacy_ms = timed(lambda: [legacy_render(issue, n + 1) for n, issue in enumerate(dicts)], args.renders)
+    first_ms = timed(lambda: [issue.render(n + 1) for n, issue in enumerate(issues)], 1)
+    cached_ms = timed(lambda: [issue.render(n + 1) for n, issue in enumerate(issues)], args.renders)
+    print(f"render {len(issues)} issues   dict+regex {legacy_ms:7.2f} ms   record first {first_ms:7.2f} ms   "
+          f"record cached {cached_ms:7.2f} ms   (one-off ingest {ingest_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--prs", type=int, default=5000)
+    parser.add_argument("--renders", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,120 @@
+"""Replay recorded graph runs offline: per-node timings, profiles, regression budget.
+
+    TRACE_RECORD_ENABLED=true ... (production)      # appends to .cache/traces.jsonl.gz
+    python -m benchmarks.replay .cache/traces.jsonl.gz --slowest 5 --repeat 5
+    python -m benchmarks.replay traces.jsonl.gz --id 3f2a9c01b7de --profile
+    python -m benchmarks.replay traces.jsonl.gz --budget-ms 50     # exit 1 when over
+    python -m benchmarks.replay /tmp/fake.jsonl.gz --record 5      # make a trace from the local fakes
+
+Each run is re-executed against its recorded tool outputs and LLM responses
+with outbound connections blocked. --latency-scale 0 (default) measures only
+our own code (prompt building, parsing, graph overhead); 1 also waits the
+recorded provider / LLM latencies.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import statistics
+import sys
+
+
+async def record(path: str, runs: int) -> None:
+    """Record `runs` briefings served by the local fakes (no real providers)."""
+    import httpx
+    from app.graph import arcade_tools, llm, replay
+    import app.main as main_module
+    from benchmarks.fakes import BENCH_HEADERS, BRIEFING, COORDINATOR_ALL, FakeArcade, FakeLLM, allow_bench_key
+
+    replay.TRACE_RECORD_ENABLED, replay.TRACE_RECORD_FILE = True, path
+    arcade_tools.set_arcade_client(FakeArcade(default_latency=0.05, prs=20, issues=20, notes_kb=16))
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.05))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.2))
+    allow_bench_key()
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, headers=BENCH_HEADERS) as client:
+        for i in range(runs):
+            await client.post("/summarize", json={"transcript": "Prep me for standup", "user_id": f"user{i}@example.com"})
+    print(f"recorded {runs} runs to {path}")
+
+
+async def run(traces, args) -> int:
+    from app.graph import replay
+    from app.graph.meeting_prep_graph import build_meeting_prep_graph
+
+    graph_app = build_meeting_prep_graph()
+    over = 0
+    profiler = cProfile.Profile() if args.profile else None
+    print(f"{'run':<14} {'recorded ms':>12} {'replayed ms':>12}  nodes (recorded -> replayed ms)")
+    with replay.block_network():
+        for trace in traces:
+            results = []
+            for _ in range(args.repeat):
+                if profiler:
+                    profiler.enable()
+                results.append(await replay.replay(trace, graph_app, args.latency_scale))
+                if profiler:
+                    profiler.disable()
+            median = statistics.median(r["replayedMs"] for r in results)
+            last = results[-1]
+            nodes = ", ".join(f"{node} {rec if rec is not None else '-'}->{rep if rep is not None else '-'}"
+                              for node, (rec, rep) in last["nodes"].items())
+            print(f"{trace.get('id', '?'):<14} {trace.get('latencyMs', 0):>12} {median:>12.1f}  {nodes}")
+            notes = []
+            if last["misses"]:
+                notes.append(f"unrecorded calls: {', '.join(last['misses'])}")
+            if last["promptChanged"]:
+                notes.append("prompt differs from the recording")
+            if not last["classificationMatches"]:
+                notes.append("classification differs")
+            if not last["summaryMatches"]:
+                notes.append("summary differs")
+            for note in notes:
+                print(f"{'':<14} ! {note}")
+            if args.budget_ms is not None and median > args.budget_ms:
+                over += 1
+                print(f"{'':<14} ! over budget ({median:.1f} ms > {args.budget_ms} ms)")
+    if profiler:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(args.profile_lines)
+        print(out.getvalue())
+    return over
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="trace file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--id", help="replay only this run")
+    parser.add_argument("--slowest", type=int, help="replay only the N slowest recorded runs")
+    parser.add_argument("--repeat", type=int, default=3, help="replays per run (median reported)")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="0 = no waiting, 1 = recorded latencies")
+    parser.add_argument("--profile", action="store_true", help="cProfile the replays")
+    parser.add_argument("--profile-lines", type=int, default=30)
+    parser.add_argument("--budget-ms", type=float, help="fail (exit 1) when a run's median replay is slower")
+    parser.add_argument("--record", type=int, metavar="N", help="first record N briefings from the local fakes")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+    os.environ.setdefault("PREWARM_ENABLED", "false")
+    os.environ.setdefault("STARTUP_WARMUP", "false")
+    import logging
+
+    logging.disable(logging.WARNING)
+    from app.graph import replay
+
+    if args.record:
+        asyncio.run(record(args.path, args.record))
+    traces = [t for t in replay.load_traces(args.path) if args.id is None or t.get("id") == args.id]
+    if args.slowest:
+        traces = sorted(traces, key=lambda t: -t.get("latencyMs", 0))[:args.slowest]
+    if not traces:
+        sys.exit(f"no recorded runs in {args.path}" + (f" with id {args.id}" if args.id else ""))
+    over = asyncio.run(run(traces, args))
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""/summarize response size and encode time per format / compression.
+
+    python -m benchmarks.serialization --large-steps 200
+
+"typical" is a real /summarize response (fake tools and LLMs, so no
+network). "large" is the same response with --large-steps extra step
+entries carrying per-repo / per-provider diagnostics, like a multi-repo
+briefing's trace. Encode time covers serialization plus compression.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import copy
+import os
+import time
+
+
+async def typical_payload() -> dict:
+    import httpx
+    from app.graph import arcade_tools, llm
+    import app.main as main_module
+    from benchmarks.fakes import BRIEFING, COORDINATOR_ALL, FakeArcade, FakeLLM
+
+    arcade_tools.set_arcade_client(FakeArcade(default_latency=0.0))
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.0))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.0))
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/summarize", json={"transcript": "Prep me for standup"},
+                                     headers={"accept-encoding": "identity"})
+    await llm.aclose_llm_clients()
+    return response.json()
+
+
+def large_payload(typical: dict, extra_steps: int) -> dict:
+    payload = copy.deepcopy(typical)
+    providers = {
+        f"provider{i}": {"state": "closed", "limit": 8, "error_rate": 0.0125, "latency_ewma_ms": 412.5, "calls": 1200 + i}
+        for i in range(20)
+    }
+    payload["steps"][0]["data"]["providers"] = providers
+    for i in range(extra_steps):
+        payload["steps"].append({
+            "name": f"github:org/repo{i}#page{i % 3 + 1}",
+            "ok": True,
+            "latencyMs": 300 + i % 250,
+            "error": None,
+            "data": {"payloadBytes": 5120 + i, "items": 20, "cache": "miss", "provider": "github", "attempts": 1},
+        })
+    return payload
+
+
+def timed(fn, repeat: int):
+    fn()  # warm
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--large-steps", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ARCADE_API_KEY", "stub")
+    os.environ.setdefault("PREWARM_ENABLED", "false")
+    import logging
+
+    logging.disable(logging.WARNING)
+    from app.encoding import _optional, compress, select_fields, serialize
+    from app.main import AgentResponse
+
+    typical = asyncio.run(typical_payload())
+    payloads = {"typical": typical, "large": large_payload(typical, args.large_steps)}
+    variants = [
+        ("json (dict)", lambda p, m: serialize(p), None),
+        ("json (model)", lambda p, m: serialize(m), None),
+        ("json + gzip", lambda p, m: serialize(m), "gzip"),
+        ("json + br", lambda p, m: serialize(m), "br"),
+        ("msgpack", lambda p, m: serialize(m, "msgpack"), None),
+        ("msgpack + gzip", lambda p, m: serialize(m, "msgpack"), "gzip"),
+        ("msgpack + br", lambda p, m: serialize(m, "msgpack"), "br"),
+        ("fields=result.summary", lambda p, m: serialize(select_fields(p, [["result", "summary"]])), None),
+    ]
+    print(f"{'payload':<8} {'encoding':<22} {'bytes':>8} {'vs json':>8} {'encode µs':>10}")
+    for name, payload in payloads.items():
+        model = AgentResponse(**payload)
+        baseline = len(serialize(model))
+        for label, build, encoding in variants:
+            if "msgpack" in label and _optional("msgpack") is None or encoding == "br" and _optional("brotli") is None:
+                print(f"{name:<8} {label:<22} {'(not installed)':>28}")
+                continue
+            body, micros = timed(lambda: compress(build(payload, model), encoding), args.repeat)
+            print(f"{name:<8} {label:<22} {len(body):>8} {len(body) / baseline:>7.0%} {micros:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
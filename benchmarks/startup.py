@@ -0,0 +1,111 @@
+"""Cold start: `import app.main`, warm-up and first-request latency in fresh processes.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --importtime   # slowest modules imported by app.main
+
+Each run is a new interpreter. The OpenAI client talks to the local stub
+server (so langchain_openai / openai are really imported on first use);
+Arcade tools are faked in-process.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def child(warmup: bool) -> None:
+    """Runs inside the fresh interpreter; prints one JSON line of timings (ms)."""
+    start = time.perf_counter()
+    import app.main as main_module
+    timings = {"import": (time.perf_counter() - start) * 1000}
+
+    # after the timed import: the fakes pull in langchain_core
+    import httpx
+    from app.graph import arcade_tools
+    from benchmarks.fakes import FakeArcade
+
+    arcade_tools.set_arcade_client(FakeArcade(default_latency=0.0))
+    if warmup:
+        start = time.perf_counter()
+        main_module.warm_up()
+        timings["warmup"] = (time.perf_counter() - start) * 1000
+
+    async def requests():
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in ("first_request", "second_request"):
+                start = time.perf_counter()
+                resp = await client.post("/summarize", json={"transcript": "Prep me for standup", "no_cache": True})
+                timings[name] = (time.perf_counter() - start) * 1000
+                assert resp.status_code == 200, resp.text
+
+    asyncio.run(requests())
+    print(json.dumps(timings))
+
+
+def run_child(warmup: bool, env) -> dict:
+    cmd = [sys.executable, "-m", "benchmarks.startup", "--child"] + (["--warmup"] if warmup else [])
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def import_profile(env, top: int) -> None:
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         env=env, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        # "import time:      9260 |     310150 | app.main"
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        if self_us.strip().isdigit():
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms cumulative {self_us / 1000:8.1f} ms self  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warmup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        import logging
+
+        logging.disable(logging.WARNING)
+        child(args.warmup)
+        return
+
+    from benchmarks.stub_openai import start_stub_server
+
+    env = dict(
+        os.environ,
+        OPENAI_BASE_URL=start_stub_server(latency=0.0),
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "stub"),
+        ARCADE_API_KEY=os.environ.get("ARCADE_API_KEY", "stub"),
+        LLM_FALLBACK_ENABLED="false",
+        STARTUP_WARMUP="false",
+    )
+    if args.importtime:
+        import_profile(env, args.top)
+        return
+
+    for warmup in (False, True):
+        runs = [run_child(warmup, env) for _ in range(args.runs)]
+        label = "with warm-up" if warmup else "lazy (no warm-up)"
+        cols = "  ".join(
+            f"{name} {statistics.median(r[name] for r in runs):7.1f} ms"
+            for name in ("import", "warmup", "first_request", "second_request") if name in runs[0]
+        )
+        print(f"{label:<18} {cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Local stand-in for an OpenAI-compatible chat completions server.
+
+Latency, error rate and reply size are configurable so benchmarks can run
+without network access or API keys.
+"""
+from __future__ import annotations
+from typing import Any, Dict
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uvicorn
+
+
+def create_stub_app(
+    latency: float = 0.05,
+    error_rate: float = 0.0,
+    reply_words: int = 40,
+    per_1k_prompt_tokens: float = 0.0,
+) -> FastAPI:
+    app = FastAPI()
+    app.state.requests = 0
+    reply = " ".join(["word"] * reply_words)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body: Dict[str, Any] = await request.json()
+        app.state.requests += 1
+        # prompt tokens ≈ chars / 4; bigger prompts take longer, like the real API
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        await asyncio.sleep(latency + per_1k_prompt_tokens * prompt_tokens / 1000)
+        if random.random() < error_rate:
+            return JSONResponse(status_code=500, content={"error": {"message": "stub failure", "type": "server_error"}})
+
+        created = int(time.time())
+        model = body.get("model", "stub")
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": reply_words, "total_tokens": prompt_tokens + reply_words}
+
+        if body.get("stream"):
+            async def chunks():
+                for word in reply.split(" "):
+                    chunk = {
+                        "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {"role": "assistant", "content": word + " "}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                done = {
+                    "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub_server(**kwargs) -> str:
+    """Run the stub in a background thread; returns its OpenAI base URL."""
+    port = _free_port()
+    config = uvicorn.Config(create_stub_app(**kwargs), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}/v1"
@@ -0,0 +1,136 @@
+"""Local stand-in for a Redis server (the RESP subset the shared state backend uses).
+
+Supports PING, GET, SET (EX/PX/NX), DEL, EXISTS, PEXPIRE, FLUSHALL and EVAL of
+the shared state's lock scripts, with optional per-command latency, so SHARED_STATE_BACKEND=redis can be exercised without
+a real server.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import threading
+import time
+
+
+class StubRedis:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.commands: Counter = Counter()
+        # key -> (value, monotonic expiry or None)
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0]
+
+    def execute(self, args: List[bytes]) -> bytes:
+        name = args[0].upper().decode()
+        self.commands[name] += 1
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name == "GET":
+            return _bulk(self._get(args[1]))
+        if name == "SET":
+            key, value, options = args[1], args[2], [a.upper() for a in args[3:]]
+            expires = None
+            if b"PX" in options:
+                expires = time.monotonic() + int(args[3 + options.index(b"PX") + 1]) / 1000
+            elif b"EX" in options:
+                expires = time.monotonic() + int(args[3 + options.index(b"EX") + 1])
+            if b"NX" in options and self._get(key) is not None:
+                return b"$-1\r\n"
+            self._data[key] = (value, expires)
+            return b"+OK\r\n"
+        if name == "DEL":
+            return b":%d\r\n" % sum(self._data.pop(k, None) is not None for k in args[1:])
+        if name == "EXISTS":
+            return b":%d\r\n" % sum(self._get(k) is not None for k in args[1:])
+        if name == "PEXPIRE":
+            value = self._get(args[1])
+            if value is not None:
+                self._data[args[1]] = (value, time.monotonic() + int(args[2]) / 1000)
+            return b":%d\r\n" % (value is not None)
+        if name == "EVAL":
+            return self._eval(args[1].decode(), args[3:3 + int(args[2])], args[3 + int(args[2]):])
+        if name == "FLUSHALL":
+            self._data.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % args[0]
+
+    def _eval(self, script: str, keys: List[bytes], argv: List[bytes]) -> bytes:
+        # no Lua here: the known compare-and-delete / compare-and-extend scripts run natively
+        from app.graph.shared_state import RELEASE_SCRIPT, RENEW_SCRIPT
+
+        if script not in (RELEASE_SCRIPT, RENEW_SCRIPT):
+            return b"-ERR unsupported script\r\n"
+        if self._get(keys[0]) != argv[0]:
+            return b":0\r\n"
+        if script == RELEASE_SCRIPT:
+            return self.execute([b"DEL", keys[0]])
+        return self.execute([b"PEXPIRE", keys[0], argv[1]])
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await _read_command(reader)
+                if args is None:
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):  # inline command
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        size = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+def start_stub_redis(latency: float = 0.0) -> Tuple[str, StubRedis]:
+    """Run the stand-in in a background thread; returns (redis:// URL, server state)."""
+    stub = StubRedis(latency)
+    ready = threading.Event()
+    port: List[int] = []
+
+    async def serve():
+        server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return f"redis://127.0.0.1:{port[0]}/0", stub
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    url, _ = start_stub_redis(args.latency)
+    print(f"SHARED_STATE_BACKEND=redis SHARED_STATE_URL={url}", flush=True)
+    threading.Event().wait()
@@ -0,0 +1,84 @@
+"""Provider calls across several worker processes, with and without shared state.
+
+    python -m benchmarks.workers --workers 4 --requests 20
+
+Each worker is a separate process running the app in-process (fake Arcade
+tools, fake LLMs) and sending the same briefings at the same moment, like
+gunicorn workers behind one port. With SHARED_STATE_BACKEND=redis (pointed
+at the local Redis stand-in) the workers share cached responses and
+in-flight fetches instead of each calling the providers.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+
+def worker(env, barrier, requests: int, latency: float, results) -> None:
+    os.environ.update(env)
+    import logging
+
+    logging.disable(logging.WARNING)
+    import httpx
+    from app.graph import arcade_tools, llm
+    import app.main as main_module
+    from benchmarks.fakes import BENCH_HEADERS, BRIEFING, COORDINATOR_ALL, FakeArcade, FakeLLM, allow_bench_key
+
+    fake = FakeArcade(default_latency=latency)
+    arcade_tools.set_arcade_client(fake)
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.05))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.1))
+    main_module.warm_up()
+
+    async def run():
+        allow_bench_key()
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, headers=BENCH_HEADERS) as client:
+            barrier.wait()
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                client.post("/summarize", json={"transcript": "Prep me for standup", "user_id": f"user{i % 4}@example.com"})
+                for i in range(requests)
+            ))
+            return time.perf_counter() - start
+
+    wall = asyncio.run(run())
+    results.put((fake.provider_calls(), fake.calls["authorize"], wall))
+
+
+def run_workers(n: int, env, requests: int, latency: float):
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(n), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(env, barrier, requests, latency, results)) for _ in range(n)]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return sum(r[0] for r in rows), sum(r[1] for r in rows), max(r[2] for r in rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20, help="concurrent briefings per worker")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake provider latency (seconds)")
+    parser.add_argument("--redis-latency", type=float, default=0.0005, help="stand-in round trip (seconds)")
+    args = parser.parse_args()
+
+    from benchmarks.stub_redis import start_stub_redis
+
+    url, stub = start_stub_redis(args.redis_latency)
+    base = {"OPENAI_API_KEY": "stub", "ARCADE_API_KEY": "stub", "LLM_FALLBACK_ENABLED": "false", "STARTUP_WARMUP": "false"}
+    print(f"{'workers':>7} {'shared state':>12} {'provider calls':>15} {'authorize':>10} {'wall (s)':>9}")
+    for backend in ("memory", "redis"):
+        env = dict(base, SHARED_STATE_BACKEND=backend, SHARED_STATE_URL=url)
+        calls, auths, wall = run_workers(args.workers, env, args.requests, args.latency)
+        print(f"{args.workers:>7} {backend:>12} {calls:>15} {auths:>10} {wall:>9.2f}")
+    print(f"stand-in commands: {dict(stub.commands)}")
+
+
+if __name__ == "__main__":
+    main()
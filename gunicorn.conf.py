@@ -0,0 +1,31 @@
+"""Gunicorn config: uvicorn workers across cores.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Each worker is a separate process with its own clients and in-memory caches;
+set SHARED_STATE_BACKEND=redis (and SHARED_STATE_URL) so workers and replicas
+share cached provider responses, authorizations, in-flight fetches and batch
+jobs. Without it the default is a single worker.
+"""
+import logging
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+shared = os.getenv("SHARED_STATE_BACKEND", "memory") == "redis"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() if shared else 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+# briefings wait on several providers and an LLM; don't kill slow ones
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+# no preload: clients, connection pools and the compiled graph are built per worker
+preload_app = False
+
+
+def on_starting(server):
+    if workers > 1 and not shared:
+        logging.getLogger("gunicorn.error").warning(
+            f"{workers} workers with SHARED_STATE_BACKEND=memory: caches, fetch coalescing and"
+            " async batch jobs are per worker"
+        )
@@ -0,0 +1,66 @@
+"""Shared fixtures: stub credentials, no background tasks, fresh module-level state per test."""
+import asyncio
+import os
+import tempfile
+
+# before any app import reads them
+os.environ.update(
+    OPENAI_API_KEY="stub",
+    ARCADE_API_KEY="stub",
+    LLM_FALLBACK_ENABLED="false",
+    STARTUP_WARMUP="false",
+    PREWARM_ENABLED="false",
+    SHARED_STATE_BACKEND="memory",
+    INCREMENTAL_SYNC="false",
+    TRACE_RECORD_ENABLED="false",
+    NOTES_INDEX_DIR=tempfile.mkdtemp(prefix="briefly-notes-"),
+    PREWARM_FILE="",
+)
+
+import httpx
+import pytest
+
+from app import auth
+from app.graph import answer_cache, arcade_tools, cache, limits, llm, shared_state
+from benchmarks.fakes import BRIEFING, COORDINATOR_ALL, FakeArcade, FakeLLM
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    cache.set_response_cache(cache.ResponseCache())
+    answer_cache.set_answer_cache(answer_cache.AnswerCache())
+    shared_state.set_shared_state(shared_state.MemorySharedState())
+    arcade_tools.clear_auth_cache()
+    limits._health.clear()
+    limits._limiters.clear()
+    auth.set_api_keys(None)
+    yield
+    arcade_tools.set_arcade_client(None)
+    llm.set_llm("coordinator", None)
+    llm.set_llm("synth", None)
+
+
+@pytest.fixture
+def fakes():
+    """Zero-latency fake Arcade client and LLMs; returns the Arcade fake."""
+    fake = FakeArcade(default_latency=0.0)
+    arcade_tools.set_arcade_client(fake)
+    llm.set_llm("coordinator", FakeLLM(COORDINATOR_ALL, latency=0.0))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.0))
+    return fake
+
+
+@pytest.fixture
+def post():
+    """POST to the app in-process: post(path, json, headers=None) -> httpx.Response."""
+    import app.main as main_module
+
+    def send(path: str, json: dict, headers: dict = None) -> httpx.Response:
+        async def request():
+            transport = httpx.ASGITransport(app=main_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post(path, json=json, headers=headers or {})
+
+        return asyncio.run(request())
+
+    return send
@@ -0,0 +1,62 @@
+"""Synth answer cache: keyed on the context fingerprint, prompt version and model."""
+import time
+
+from app.graph.answer_cache import AnswerCache
+from app.graph.context import build_context
+from benchmarks.fakes import fake_jira_issues, fake_meeting_notes, fake_pull_requests
+
+SUMMARY = "Lead with the auth PR."
+
+
+def fingerprint(transcript, prs=2, issues=2, notes=None):
+    _, stats = build_context(transcript, fake_pull_requests(prs), fake_jira_issues(issues), notes)
+    return stats["fingerprint"]
+
+
+def test_fingerprint_follows_the_data_not_the_wording():
+    assert fingerprint("Prep me for standup") == fingerprint("Prep me for standup")
+    # the transcript is part of the cache key, not of the fingerprint
+    assert fingerprint("Prep me for standup") == fingerprint("Get me ready for the 1:1")
+    assert fingerprint("Prep me for standup") != fingerprint("Prep me for standup", prs=3)
+    assert fingerprint("Prep me for standup") != fingerprint("Prep me for standup", notes=fake_meeting_notes(1))
+
+
+def test_exact_hit_needs_same_transcript_context_version_and_model():
+    cache = AnswerCache(ttl=60, maxsize=8)
+    fp = fingerprint("Prep me for standup")
+    cache.set("Prep me for standup", fp, "v1", "gpt", SUMMARY)
+
+    assert cache.get("  prep me for STANDUP! ", fp, "v1", "gpt") == (SUMMARY, "exact")
+    assert cache.get("Prep me for standup", fingerprint("x", prs=3), "v1", "gpt") is None
+    assert cache.get("Prep me for standup", fp, "v2", "gpt") is None
+    assert cache.get("Prep me for standup", fp, "v1", "other") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 3
+
+
+def test_answers_expire():
+    cache = AnswerCache(ttl=60, maxsize=8)
+    cache._put("Prep me for standup", "fp", "v1", "gpt", SUMMARY, time.time() - 61)
+    assert cache.get("Prep me for standup", "fp", "v1", "gpt") is None
+
+
+def test_near_duplicates_only_over_the_same_context():
+    cache = AnswerCache(ttl=60, maxsize=8, near_dup=True, similarity=0.5)
+    cache.set("What are my blockers on the payment tickets", "fp", "v1", "gpt", SUMMARY)
+
+    assert cache.get("What blockers are on my payment tickets", "fp", "v1", "gpt") == (SUMMARY, "near")
+    assert cache.get("What blockers are on my payment tickets", "other", "v1", "gpt") is None
+    assert cache.get("Summarize the auth rollout", "fp", "v1", "gpt") is None
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = AnswerCache(ttl=60, maxsize=2)
+    for transcript in ("one", "two"):
+        cache.set(transcript, "fp", "v1", "gpt", transcript)
+    cache.get("one", "fp", "v1", "gpt")
+    cache.set("three", "fp", "v1", "gpt", "three")
+
+    assert cache.get("two", "fp", "v1", "gpt") is None
+    assert cache.get("one", "fp", "v1", "gpt") == ("one", "exact")
+    assert len(cache._data) == 2
+    # the by-context index drops evicted keys too
+    assert [len(keys) for keys in cache._by_data.values()] == [2]
@@ -0,0 +1,49 @@
+"""Briefings run as the authenticated caller; request bodies can't pick the user or tenant."""
+from app import auth
+
+
+def record_users(fake) -> list:
+    """User ids the Arcade tools were executed as."""
+    users, execute = [], fake.tools.execute
+
+    async def tools_execute(tool_name, input, user_id, **kwargs):
+        users.append(user_id)
+        return await execute(tool_name, input, user_id, **kwargs)
+
+    fake.tools.execute = tools_execute
+    return users
+
+
+def test_body_user_id_needs_a_service_key(fakes, post):
+    users = record_users(fakes)
+    auth.set_api_keys({"alice-key": "alice@example.com", "svc-key": auth.SERVICE_USER})
+    body = {"transcript": "Prep me for standup", "user_id": "bob@example.com"}
+
+    assert post("/summarize", body).status_code == 401
+    assert post("/summarize", body, {"X-API-Key": "wrong"}).status_code == 401
+    assert post("/summarize", body, {"X-API-Key": "alice-key"}).status_code == 403
+    assert users == []
+
+    as_alice = post("/summarize", {"transcript": "Prep me for standup"}, {"X-API-Key": "alice-key"})
+    assert as_alice.status_code == 200
+    assert set(users) == {"alice@example.com"}
+
+    users.clear()
+    assert post("/summarize", body, {"Authorization": "Bearer svc-key"}).status_code == 200
+    assert set(users) == {"bob@example.com"}
+
+
+def test_without_auth_body_user_id_is_rejected(fakes, post):
+    # no keys configured: requests run as the default user and can't name another
+    response = post("/summarize", {"transcript": "Prep me for standup", "user_id": "bob@example.com"})
+    assert response.status_code == 403
+
+
+def test_inputs_cannot_change_assignee_or_tenant(fakes, post):
+    for inputs in ({"jira": {"assignee": "ceo@example.com"}}, {"jira": {"atlassian_cloud_id": "other-tenant"}}):
+        response = post("/summarize", {"transcript": "Prep me for standup", "inputs": inputs})
+        assert response.status_code == 400
+        assert "cannot be set per request" in response.json()["detail"]
+
+    allowed = {"github": {"repos": ["org/api"], "max_pages": 2}, "jira": {"projects": ["OPS"], "limit": 5}}
+    assert post("/summarize", {"transcript": "Prep me for standup", "inputs": allowed}).status_code == 200
@@ -0,0 +1,38 @@
+"""Batch briefings: items run as the caller and bad items are rejected before queueing."""
+import app.main as main
+from app import auth
+
+from tests.test_auth import record_users
+
+PREP = "Prep me for standup"
+
+
+def test_batch_items_run_as_the_caller(fakes, post):
+    users = record_users(fakes)
+    auth.set_api_keys({"alice-key": "alice@example.com", "svc-key": auth.SERVICE_USER})
+    alice = {"X-API-Key": "alice-key"}
+
+    impersonating = {"items": [{"transcript": PREP}, {"transcript": PREP, "user_id": "bob@example.com"}]}
+    assert post("/summarize/batch", impersonating, alice).status_code == 403
+    assert users == []
+
+    assert post("/summarize/batch", {"items": [{"transcript": PREP}]}, alice).status_code == 200
+    assert set(users) == {"alice@example.com"}
+
+    users.clear()
+    assert post("/summarize/batch", impersonating, {"X-API-Key": "svc-key"}).status_code == 200
+    assert "bob@example.com" in users
+
+
+def test_bad_item_inputs_rejected_before_queueing(fakes, post, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(main.batch_scheduler, "submit", submitted.append)
+    items = [
+        {"transcript": PREP, "inputs": {"github": {"repos": ["org/api"]}}},
+        {"transcript": PREP, "inputs": {"jira": {"assignee": "ceo@example.com"}}},
+    ]
+
+    response = post("/summarize/batch", {"items": items, "mode": "async"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("items[1]: inputs.jira.assignee")
+    assert submitted == [] and fakes.provider_calls() == 0
@@ -0,0 +1,101 @@
+"""Response cache: fresh hits, expiry, stale-while-revalidate and keys."""
+import asyncio
+import time
+
+from app.graph.cache import MemoryLRUBackend, ResponseCache, make_key
+
+TTL, SWR = 60.0, 300.0
+
+
+def counting_fetch(values):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return values[len(calls) - 1]
+
+    return fetch, calls
+
+
+def aged(cache, key, value, age):
+    cache.backend.set(key, (value, time.time() - age))
+
+
+def test_fresh_entry_is_a_hit():
+    cache = ResponseCache(ttls={"github": TTL}, stale_while_revalidate=SWR)
+    fetch, calls = counting_fetch(["v1", "v2"])
+
+    async def run():
+        return [await cache.get_or_fetch("github", "k", fetch) for _ in range(3)]
+
+    assert asyncio.run(run()) == ["v1"] * 3
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1 and cache.stats["hits"] == 2
+
+
+def test_expired_entry_is_refetched():
+    cache = ResponseCache(ttls={"github": TTL}, stale_while_revalidate=SWR)
+    aged(cache, "k", "old", TTL + SWR + 1)
+    fetch, calls = counting_fetch(["new"])
+
+    assert asyncio.run(cache.get_or_fetch("github", "k", fetch)) == "new"
+    assert len(calls) == 1 and cache.stats["misses"] == 1
+    assert cache.backend.get("k")[0] == "new"
+
+
+def test_stale_entry_served_while_refreshing_once():
+    cache = ResponseCache(ttls={"github": TTL}, stale_while_revalidate=SWR)
+    aged(cache, "k", "old", TTL + 1)
+    fetch, calls = counting_fetch(["new", "newer"])
+
+    async def run():
+        served = [await cache.get_or_fetch("github", "k", fetch) for _ in range(2)]
+        await asyncio.gather(*cache._refreshing.values())
+        return served, await cache.get_or_fetch("github", "k", fetch)
+
+    served, after = asyncio.run(run())
+    assert served == ["old", "old"]
+    assert after == "new"
+    assert len(calls) == 1  # one background refresh for both stale reads
+    assert cache.stats["stale_hits"] == 2 and cache.stats["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_serving_stale():
+    cache = ResponseCache(ttls={"github": TTL}, stale_while_revalidate=SWR)
+    aged(cache, "k", "old", TTL + 1)
+
+    async def failing():
+        raise RuntimeError("provider down")
+
+    async def run():
+        first = await cache.get_or_fetch("github", "k", failing)
+        await asyncio.gather(*cache._refreshing.values())
+        return first, await cache.get_or_fetch("github", "k", failing)
+
+    assert asyncio.run(run()) == ("old", "old")
+    assert cache.stats["refresh_errors"] >= 1
+
+
+def test_refresh_bypasses_fresh_entries():
+    cache = ResponseCache(ttls={"github": TTL}, stale_while_revalidate=SWR)
+    aged(cache, "k", "cached", 0)
+    fetch, calls = counting_fetch(["fresh"])
+
+    assert asyncio.run(cache.get_or_fetch("github", "k", fetch, refresh=True)) == "fresh"
+    assert cache.backend.get("k")[0] == "fresh"
+
+
+def test_keys_normalize_input_and_user():
+    key = make_key("Github.ListPullRequests", {"owner": "org ", "repo": "api", "state": None}, "Alice@Example.com")
+    assert key == make_key("Github.ListPullRequests", {"repo": "api", "owner": "org"}, " alice@example.com")
+    assert key != make_key("Github.ListPullRequests", {"repo": "api", "owner": "org"}, "bob@example.com")
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = MemoryLRUBackend(maxsize=2)
+    backend.set("a", (1, 0.0))
+    backend.set("b", (2, 0.0))
+    backend.get("a")
+    backend.set("c", (3, 0.0))
+    assert backend.get("b") is None
+    assert backend.get("a") == (1, 0.0) and backend.get("c") == (3, 0.0)
@@ -0,0 +1,98 @@
+"""Only provider-level failures count against a provider's circuit breaker."""
+from types import SimpleNamespace
+import asyncio
+import time
+
+import pytest
+
+from app.graph import arcade_tools, limits
+from benchmarks.fakes import GITHUB_TOOL
+
+BAD_REPO = "nope/missing"
+
+
+def failing_github(fake, kind: str, status_code: int):
+    """GitHub calls for BAD_REPO return an Arcade error of `kind`; everything else succeeds."""
+    execute = fake.tools.execute
+
+    async def tools_execute(tool_name, input, user_id, **kwargs):
+        if tool_name.startswith("Github") and f"{input['owner']}/{input['repo']}" == BAD_REPO:
+            error = SimpleNamespace(kind=kind, message="failed", status_code=status_code)
+            return SimpleNamespace(output=SimpleNamespace(value=None, error=error), success=False)
+        return await execute(tool_name, input, user_id, **kwargs)
+
+    fake.tools.execute = tools_execute
+
+
+def briefings(post, bad_requests: int):
+    for _ in range(bad_requests):
+        post("/summarize", {"transcript": "Prep me for standup", "inputs": {"repos": [BAD_REPO]}})
+    response = post("/summarize", {"transcript": "Prep me for standup"})
+    return response.json()["steps"][0]["data"]["skippedSources"]
+
+
+def test_not_found_does_not_open_circuit(fakes, post):
+    failing_github(fakes, "UPSTREAM_RUNTIME_NOT_FOUND", 404)
+
+    skipped = briefings(post, limits.CIRCUIT_CONSECUTIVE_FAILURES + 2)
+
+    assert not limits.circuit_open("github")
+    assert "github" not in skipped
+
+
+def test_server_errors_open_circuit(fakes, post):
+    failing_github(fakes, "UPSTREAM_RUNTIME_SERVER_ERROR", 502)
+
+    skipped = briefings(post, limits.CIRCUIT_CONSECUTIVE_FAILURES)
+
+    assert limits.circuit_open("github")
+    assert "github" in skipped
+
+
+def pending_auth(fake, wait_latency: float = 0.0, authorize_latency: float = 0.0, users=("slow",)):
+    """`users` aren't authorized yet: authorize takes `authorize_latency`, their OAuth wait `wait_latency`."""
+    async def authorize(tool_name, user_id, **kwargs):
+        await asyncio.sleep(authorize_latency)
+        status = "pending" if user_id in users else "completed"
+        return SimpleNamespace(status=status, url="https://auth", id=user_id)
+
+    async def wait_for_completion(auth_response):
+        await asyncio.sleep(wait_latency)
+        return SimpleNamespace(status="completed", url=None, id=auth_response.id)
+
+    fake.tools.authorize = authorize
+    fake.auth.wait_for_completion = wait_for_completion
+
+
+def test_auth_wait_does_not_hold_a_slot(fakes):
+    pending_auth(fakes, wait_latency=0.5)
+    limits._limiters["github"] = limits.AdaptiveLimiter(1)
+    tool_input = {"owner": "org", "repo": "api"}
+
+    async def run():
+        slow = asyncio.create_task(arcade_tools.execute_tool(GITHUB_TOOL, tool_input, "slow"))
+        await asyncio.sleep(0.05)  # the slow user is waiting on their OAuth consent
+        start = time.perf_counter()
+        await arcade_tools.execute_tool(GITHUB_TOOL, tool_input, "fast")
+        fast = time.perf_counter() - start
+        await slow
+        return fast
+
+    assert asyncio.run(run()) < 0.25
+
+
+@pytest.mark.parametrize("step, opens", [("authorize", True), ("wait_for_completion", False)])
+def test_auth_timeouts(fakes, step, opens):
+    if step == "authorize":
+        pending_auth(fakes, authorize_latency=1.0)
+    else:
+        pending_auth(fakes, wait_latency=1.0)
+
+    async def run():
+        for _ in range(limits.CIRCUIT_CONSECUTIVE_FAILURES):
+            with pytest.raises(arcade_tools.ToolTimeoutError):
+                await arcade_tools.execute_tool(GITHUB_TOOL, {"owner": "org", "repo": "api"}, "slow", timeout=0.02)
+
+    asyncio.run(run())
+    # a stalled Arcade authorize counts like a stalled execute; a user slow to consent doesn't
+    assert limits.circuit_open("github") is opens
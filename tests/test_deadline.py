@@ -0,0 +1,17 @@
+"""Short deadlines still leave the source fetches a share of the budget."""
+from app.graph import deadline
+
+
+def test_reserve_is_capped_to_a_share_of_the_budget():
+    assert deadline.synth_reserve_ms(20000) == deadline.DEADLINE_SYNTH_RESERVE_MS
+    assert deadline.synth_reserve_ms(2000) == 2000 * deadline.DEADLINE_SYNTH_RESERVE_FRACTION
+
+
+def test_small_deadline_still_fetches(fakes, post):
+    fakes.default_latency = 0.1
+    # below the 2500 ms reserve: without the cap every fetch got a 0 s budget
+    body = post("/summarize", {"transcript": "Prep me for standup", "deadline_ms": 1500}).json()
+
+    assert body["steps"][0]["data"]["skippedSources"] == []
+    fetched = {step["name"] for step in body["steps"] if step["ok"]}
+    assert {"github", "jira", "meeting_notes"} <= fetched
@@ -0,0 +1,86 @@
+"""Response encoding: `fields=` selection, Accept / Accept-Encoding negotiation."""
+import gzip
+
+import pytest
+
+from app import encoding
+from benchmarks.fakes import BRIEFING
+
+# optional extras; the negotiation below assumes both are installed
+brotli = pytest.importorskip("brotli")
+msgpack = pytest.importorskip("msgpack")
+
+PAYLOAD = {
+    "result": {"summary": "Lead with the auth PR.", "classification": {"is_git": True}},
+    "steps": [{"name": "github", "ok": True, "latencyMs": 12}, {"name": "jira", "ok": False, "latencyMs": 30}],
+    "usage": {"total_tokens": 120, "prompt_tokens": 100},
+}
+
+
+def test_parse_fields():
+    assert encoding.parse_fields(None) is None
+    assert encoding.parse_fields(" result.summary, usage.total_tokens ") == [["result", "summary"], ["usage", "total_tokens"]]
+    for bad in ("", " , ", "result..summary", ",".join(["a"] * (encoding.MAX_FIELDS + 1))):
+        with pytest.raises(ValueError):
+            encoding.parse_fields(bad)
+
+
+def test_select_fields_merges_paths_and_maps_over_lists():
+    paths = encoding.parse_fields("result.summary,usage.total_tokens,steps.name,steps.latencyMs,missing.key")
+    assert encoding.select_fields(PAYLOAD, paths) == {
+        "result": {"summary": "Lead with the auth PR."},
+        "usage": {"total_tokens": 120},
+        "steps": [{"name": "github", "latencyMs": 12}, {"name": "jira", "latencyMs": 30}],
+    }
+    assert encoding.wants(paths, "steps") and not encoding.wants(paths, "errors")
+    assert encoding.wants(None, "errors")
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("", "json"),
+    ("application/json", "json"),
+    ("application/msgpack", "msgpack"),
+    ("application/json;q=0.5, application/x-msgpack", "msgpack"),
+    ("application/msgpack;q=0.5, */*", "json"),
+])
+def test_negotiate_format(accept, expected):
+    assert encoding.negotiate_format(accept) == expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "br"),
+    ("br;q=0, *;q=0.5", "gzip"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert encoding.negotiate_encoding(accept_encoding) == expected
+
+
+def test_encode_response_round_trips():
+    payload = dict(PAYLOAD, result={"summary": BRIEFING * 20})
+
+    small = encoding.encode_response({"ok": True}, "application/json", "gzip, br")
+    assert "content-encoding" not in small.headers  # below RESPONSE_COMPRESS_MIN_BYTES
+    assert small.body == b'{"ok":true}'
+
+    packed = encoding.encode_response(payload, "application/msgpack", "br")
+    assert packed.media_type == "application/msgpack" and packed.headers["content-encoding"] == "br"
+    assert msgpack.unpackb(brotli.decompress(packed.body)) == payload
+
+    zipped = encoding.encode_response(payload, "", "gzip")
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept, Accept-Encoding"
+    assert gzip.decompress(zipped.body) == encoding.serialize(payload)
+
+
+def test_summarize_fields(fakes, post):
+    body = post("/summarize?fields=result.summary,steps.name", {"transcript": "Prep me for standup"}).json()
+    assert set(body) == {"result", "steps"}
+    assert body["result"] == {"summary": BRIEFING}
+    assert all(set(step) == {"name"} for step in body["steps"])
+
+    assert post("/summarize?fields=result..summary", {"transcript": "Prep me for standup"}).status_code == 400
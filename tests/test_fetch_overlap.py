@@ -0,0 +1,40 @@
+"""Source fetches run concurrently: a briefing takes about as long as its slowest source."""
+import asyncio
+import time
+
+from app.graph import arcade_tools
+from app.graph.meeting_prep_graph import build_meeting_prep_graph
+from benchmarks.fakes import GITHUB_TOOL, JIRA_TOOL, NOTION_TOOL, FakeArcade
+
+LATENCY = {GITHUB_TOOL: 0.3, JIRA_TOOL: 0.3, NOTION_TOOL: 0.4}
+
+
+def test_sources_overlap(fakes):
+    # the whole Arcade layer runs (execute_tool, timeouts, provider slots); only the client is fake
+    fake = FakeArcade(latency=LATENCY, default_latency=0.0)
+    arcade_tools.set_arcade_client(fake)
+    calls = {}
+    execute = fake.tools.execute
+
+    async def tools_execute(tool_name, input, user_id, **kwargs):
+        start = time.perf_counter()
+        result = await execute(tool_name, input, user_id, **kwargs)
+        calls[tool_name] = (start, time.perf_counter())
+        return result
+
+    fake.tools.execute = tools_execute
+    graph = build_meeting_prep_graph()
+
+    async def run():
+        start = time.perf_counter()
+        result = await graph.ainvoke({"transcript": "Prep me for standup", "no_cache": True})
+        return result, time.perf_counter() - start
+
+    result, wall = asyncio.run(run())
+
+    assert result["summary"]
+    assert set(calls) == set(LATENCY)
+    # every fetch started before any of them finished
+    assert max(start for start, _ in calls.values()) < min(end for _, end in calls.values())
+    slowest, total = max(LATENCY.values()), sum(LATENCY.values())
+    assert wall < slowest + 0.25 < total
@@ -0,0 +1,40 @@
+"""The Anthropic fallback runs under its own slot and circuit, never OpenAI's."""
+import asyncio
+
+import pytest
+
+from app.graph import limits, llm
+from benchmarks.fakes import BRIEFING, FakeLLM
+
+MESSAGES = [{"role": "user", "content": "Prep me for standup"}]
+
+
+@pytest.fixture
+def failing_openai():
+    openai = FakeLLM("unused", latency=0.0, error_rate=1.0)
+    fallback = FakeLLM(BRIEFING, latency=0.0)
+    llm.set_llm("synth", openai)
+    llm.set_fallback_llm("synth", fallback)
+    return openai, fallback
+
+
+def test_fallback_success_does_not_count_for_openai(failing_openai):
+    openai, fallback = failing_openai
+
+    async def run():
+        return [await llm.ainvoke_llm("synth", MESSAGES) for _ in range(limits.CIRCUIT_CONSECUTIVE_FAILURES + 2)]
+
+    responses = asyncio.run(run())
+    assert {resp.content for resp in responses} == {BRIEFING}
+    # OpenAI kept failing: its circuit opened and later calls went straight to the fallback
+    assert limits.circuit_open("llm:synth")
+    assert openai.calls == limits.CIRCUIT_CONSECUTIVE_FAILURES
+    assert fallback.calls == len(responses)
+    assert limits.get_health("llm:synth:fallback").error_rate == 0
+    assert "anthropic" in limits.provider_stats()
+
+
+def test_without_fallback_the_error_surfaces(failing_openai):
+    llm.set_fallback_llm("synth", None)
+    with pytest.raises(RuntimeError, match="fake LLM failure"):
+        asyncio.run(llm.ainvoke_llm("synth", MESSAGES))
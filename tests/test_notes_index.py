@@ -0,0 +1,88 @@
+"""Notes indexes: the open set is bounded by an LRU, and concurrent writers never share temp files."""
+import pytest
+
+from app.graph import notes_index
+from app.graph.records import NoteSection
+
+
+@pytest.fixture
+def small_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(notes_index, "NOTES_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(notes_index, "NOTES_INDEX_MAX_OPEN", 2)
+    notes_index.set_embedder(notes_index.HashEmbedder())
+    yield
+    notes_index.set_embedder(None)
+
+
+def page(topic: str):
+    return [NoteSection.from_text(f"## {topic} {i}\nWe discussed {topic} item {i} and OPS-{i}.") for i in range(12)]
+
+
+def test_lru_closes_evicted_indexes(small_cache):
+    for user in ("alice", "bob"):
+        notes_index.select_sections(user, "Standup", page("auth rollout"), "auth rollout", k=3)
+    alice = notes_index.get_index("alice", "Standup")  # most recently used now
+    bob = notes_index.get_index("bob", "Standup")
+    notes_index.get_index("alice", "Standup")
+
+    notes_index.select_sections("carol", "Standup", page("billing"), "billing", k=3)
+
+    assert len(notes_index._indexes) == 2
+    assert bob.vectors.size == 0 and bob.sections == []  # closed: memory map dropped
+    assert alice.vectors.size > 0
+    assert notes_index.notes_index_stats()["evictions"] >= 1
+
+    # reopened from disk, nothing re-embedded
+    embedded = notes_index.notes_index_stats()["embedded"]
+    notes_index.select_sections("bob", "Standup", page("auth rollout"), "auth rollout", k=3)
+    assert notes_index.get_index("bob", "Standup") is not bob
+    assert notes_index.notes_index_stats()["embedded"] == embedded
+
+
+def test_concurrent_writers_use_their_own_temp_files(small_cache, tmp_path):
+    import threading
+
+    path = str(tmp_path / "shared")
+    # two workers' indexes over the same page file
+    writers = [notes_index.NotesIndex(path, notes_index.HashEmbedder()) for _ in range(2)]
+    pages = [page("auth rollout"), page("billing")]
+    errors = []
+
+    def write(index, sections):
+        try:
+            for n in range(10):
+                index.update(sections, f"{sections[0].text}-{n}", force=True)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=pair) for pair in zip(writers, pages)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["shared.json", "shared.npy"]  # no temp files left
+    reopened = notes_index.NotesIndex(path, notes_index.HashEmbedder())
+    assert len(reopened.sections) == 12 and len(reopened.vectors) == 12
+
+
+def test_selected_notes_share_the_prepared_context(small_cache, fakes):
+    import asyncio
+
+    from app.graph import context
+    from app.graph.meeting_prep_graph import build_meeting_prep_graph
+
+    graph = build_meeting_prep_graph()
+    context._prepared.clear()
+    hits = context.context_share_stats()["hits"]
+
+    async def briefing():
+        return await graph.ainvoke({"transcript": "What did Sarah say about the auth rollout?", "user_id": "alice"})
+
+    first, second = asyncio.run(briefing()), asyncio.run(briefing())
+
+    # same cached page, same relevant sections: the second briefing reuses the first's items
+    assert first["meeting_notes"] is second["meeting_notes"]
+    assert len(first["meeting_notes"]["sections"]) == notes_index.NOTES_TOP_K
+    assert context.context_share_stats()["hits"] == hits + 1
@@ -0,0 +1,69 @@
+"""Pre-warm scheduler on a fake clock: runs land before the meeting, within the per-provider rate."""
+import asyncio
+import random
+from datetime import datetime, timezone
+
+from app.prewarm import PrewarmScheduler, RecurringMeeting, likely_providers
+from benchmarks.fakes import FakeClock
+
+MONDAY = datetime(2026, 10, 19, tzinfo=timezone.utc)
+START = MONDAY.replace(hour=9).timestamp()
+MEETING = MONDAY.replace(hour=9, minute=30).timestamp()
+
+
+async def run_until_meeting(scheduler, clock):
+    loop = asyncio.create_task(scheduler.run_forever())
+    await clock.advance(MEETING - clock.now())  # wakes every sleeper in time order
+    loop.cancel()
+    await scheduler.drain()
+
+
+def test_prewarm_runs_before_meeting_with_its_inputs(fakes):
+    import app.main as main_module
+
+    clock = FakeClock(START)
+    calls = []
+    execute = fakes.tools.execute
+
+    async def tools_execute(tool_name, input, user_id, **kwargs):
+        calls.append((clock.now(), tool_name, input, user_id))
+        return await execute(tool_name, input, user_id, **kwargs)
+
+    fakes.tools.execute = tools_execute
+    scheduler = PrewarmScheduler(main_module.run_prewarm, clock=clock, jitter=120, path=None, rng=random.Random(0))
+    scheduler.register(RecurringMeeting(
+        "alice@example.com", "09:30", lead_minutes=5, inputs={"repos": ["org/api"], "projects": ["OPS"]},
+    ))
+
+    asyncio.run(run_until_meeting(scheduler, clock))
+
+    assert scheduler.stats["runs"] == 1
+    assert calls and all(MEETING - 5 * 60 - 120 <= at < MEETING for at, *_ in calls)
+    assert {user for *_, user in calls} == {"alice@example.com"}
+    github = [input for _, tool, input, _ in calls if tool.startswith("Github")]
+    assert github and all((input["owner"], input["repo"]) == ("org", "api") for input in github)
+
+
+def test_prewarm_respects_provider_rate():
+    clock = FakeClock(START)
+    rate = 6  # pre-warm calls per provider per minute
+    started = []
+
+    async def run_meeting(meeting):
+        started.append(clock.now())
+
+    scheduler = PrewarmScheduler(run_meeting, clock=clock, jitter=0, rate_per_minute=rate, path=None,
+                                 rng=random.Random(0))
+    users = 15
+    for i in range(users):
+        scheduler.register(RecurringMeeting(f"user{i}@example.com", "09:30", lead_minutes=5))
+
+    asyncio.run(run_until_meeting(scheduler, clock))
+
+    assert likely_providers("Prep me for standup")
+    assert len(started) == users and max(started) < MEETING
+    assert scheduler.stats["rate_limited"] > 0
+    # every run takes one token per provider: at most a full bucket plus `rate` per minute
+    burst = max(rate * 10 / 60, 1.0)
+    for at in started:
+        assert sum(at <= other < at + 60 for other in started) <= rate + burst
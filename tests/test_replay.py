@@ -0,0 +1,61 @@
+"""Recorded runs replay offline: same briefing, no unrecorded calls, process state left as it was."""
+import asyncio
+
+import pytest
+
+from app.graph import arcade_tools, llm, replay, snapshots
+from benchmarks.fakes import JIRA_TOOL
+
+PREP = {"transcript": "Prep me for standup"}
+
+
+@pytest.fixture
+def recording(monkeypatch, tmp_path):
+    path = str(tmp_path / "traces.jsonl.gz")
+    monkeypatch.setattr(replay, "TRACE_RECORD_ENABLED", True)
+    monkeypatch.setattr(replay, "TRACE_RECORD_FILE", path)
+    return lambda: list(replay.load_traces(path))
+
+
+def replayed(trace):
+    with replay.block_network():
+        return asyncio.run(replay.replay(trace))
+
+
+def assert_faithful(result):
+    assert result["summaryMatches"] and result["classificationMatches"]
+    assert result["misses"] == []
+    assert result["replayedMs"] < 2000
+
+
+def test_replay_matches_the_recording(fakes, post, recording):
+    assert post("/summarize", PREP).status_code == 200
+    (trace,) = recording()
+    assert {entry["source"] for entry in trace["tools"]} == {"github", "jira", "meeting_notes"}
+
+    coordinator = llm._llms["coordinator"]
+    assert_faithful(replayed(trace))
+    # the process's own client and models are back
+    assert arcade_tools._arcade_client is fakes
+    assert llm._llms["coordinator"] is coordinator
+
+
+def test_incremental_sync_replays(fakes, post, recording, monkeypatch):
+    monkeypatch.setattr(snapshots, "INCREMENTAL_SYNC", True)
+    store = snapshots.SnapshotStore(":memory:")
+    snapshots.set_snapshot_store(store)
+    try:
+        assert post("/summarize", PREP).status_code == 200  # full sync
+        # an hour later: only what changed is fetched (JQL window, PRs since the cursor)
+        store._conn.execute("UPDATE snapshots SET synced_at = synced_at - 3630")
+        assert post("/summarize", PREP).status_code == 200
+        full, incremental = recording()
+
+        assert JIRA_TOOL in {entry["tool"] for entry in full["tools"]}
+        assert "Jira.SearchIssuesWithJql" in {entry["tool"] for entry in incremental["tools"]}
+        assert {entry["source"] for entry in incremental["snapshots"]} == {"github", "jira"}
+        for trace in (full, incremental):
+            assert_faithful(replayed(trace))
+        assert snapshots._store is store
+    finally:
+        snapshots.set_snapshot_store(None)
@@ -0,0 +1,60 @@
+"""Coordinator routing without the LLM: keyword rules, memo and local classifier."""
+import pytest
+
+from app.graph import router
+
+NONE = {"is_git": False, "is_jira": False, "is_meeting_notes": False}
+
+
+@pytest.fixture(autouse=True)
+def fresh_router():
+    router._memo.clear()
+    router.set_local_classifier(None)
+    yield
+    router._memo.clear()
+    router.set_local_classifier(None)
+
+
+@pytest.mark.parametrize("transcript, expected", [
+    ("Prep me for standup", router.ALL_SOURCES),
+    ("Can you get me ready for the 1:1?", router.ALL_SOURCES),
+    ("What PRs did I merge?", dict(NONE, is_git=True)),
+    ("Any blockers on my Jira tickets?", dict(NONE, is_jira=True)),
+    ("What did we decide in the last meeting?", dict(NONE, is_meeting_notes=True)),
+    ("Which PRs are blocked on tickets?", dict(NONE, is_git=True, is_jira=True)),
+])
+def test_rules_route_confidently(transcript, expected):
+    classification, source = router.route_locally(transcript)
+    assert source == "rule"
+    assert classification == expected
+
+
+def test_normalization():
+    assert router.normalize_transcript("  Prep me   for STANDUP!! ") == "prep me for standup"
+
+
+def test_unclear_transcripts_fall_back_to_the_llm():
+    assert router.route_locally("hello there") is None
+    # long, multi-topic questions match rules but not confidently
+    long = "so about the repo and also the sprint " + "and some other things " * 5
+    assert router.classify_by_rules(router.normalize_transcript(long))[1] < router.MIN_CONFIDENCE
+    assert router.route_locally(long) is None
+
+
+def test_llm_answers_are_remembered_per_normalized_transcript():
+    router.remember("Hello there", dict(NONE, is_jira=True))
+    assert router.route_locally("hello   THERE!") == (dict(NONE, is_jira=True), "cache")
+
+
+def test_local_classifier_used_when_confident():
+    router.set_local_classifier(lambda t: (dict(NONE, is_git=True), 0.85))
+    assert router.route_locally("hello there") == (dict(NONE, is_git=True), "classifier")
+
+    router.set_local_classifier(lambda t: (dict(NONE, is_git=True), 0.5))
+    assert router.route_locally("hello there") is None
+
+    def broken(t):
+        raise RuntimeError("model missing")
+
+    router.set_local_classifier(broken)
+    assert router.route_locally("hello there") is None
@@ -0,0 +1,61 @@
+"""Shared locks are owner-checked and outlive a leader call slower than their TTL."""
+import asyncio
+
+import pytest
+
+from app.graph import shared_state
+from benchmarks.stub_redis import start_stub_redis
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return shared_state.MemorySharedState()
+    pytest.importorskip("redis")
+    url, _ = start_stub_redis()
+    return shared_state.RedisSharedState(url, timeout=1.0)
+
+
+def run(backend, coro):
+    async def main():
+        shared_state.set_shared_state(backend)
+        try:
+            return await coro
+        finally:
+            await backend.aclose()
+
+    return asyncio.run(main())
+
+
+def test_release_leaves_a_lock_taken_over_by_another_worker(backend):
+    async def scenario():
+        first = await shared_state.acquire("k", ttl=0.1)
+        await asyncio.sleep(0.2)  # first holder's lock expires mid-call
+        second = await shared_state.acquire("k", ttl=5)
+        await shared_state.release("k", first)
+        held_after_stale_release = await shared_state.locked("k")
+        await shared_state.release("k", second)
+        return first, second, held_after_stale_release, await shared_state.locked("k")
+
+    first, second, held_after_stale_release, held_after_release = run(backend, scenario())
+    assert first and second and first != second
+    assert held_after_stale_release
+    assert not held_after_release
+
+
+def test_slow_leader_keeps_its_lock(backend):
+    calls = []
+
+    async def slow_fetch():
+        calls.append(1)
+        await asyncio.sleep(0.5)  # five lock TTLs
+        return {"items": 3}
+
+    async def scenario():
+        leader = asyncio.create_task(shared_state.shared_do("fetch", slow_fetch, ttl=0.1))
+        await asyncio.sleep(0.02)
+        waiter = shared_state.shared_do("fetch", slow_fetch, ttl=0.1)
+        return await asyncio.gather(leader, waiter)
+
+    assert run(backend, scenario()) == [{"items": 3}, {"items": 3}]
+    assert len(calls) == 1
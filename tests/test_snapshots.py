@@ -0,0 +1,59 @@
+"""Incremental Jira syncs build JQL only from validated keys and escaped strings."""
+import asyncio
+import time
+
+import pytest
+
+from app.graph import arcade_tools, snapshots, sources
+
+
+@pytest.fixture
+def store():
+    store = snapshots.SnapshotStore(":memory:")
+    snapshots.set_snapshot_store(store)
+    yield store
+    snapshots.set_snapshot_store(None)
+
+
+def stale_snapshot(store, scope):
+    # synced long enough ago to need a refresh, but not a full re-sync
+    synced = time.time() - 3630
+    snapshot = {"cursor": None, "items": {}, "changed": [], "synced_at": synced, "full_synced_at": synced}
+    asyncio.run(store.asave("alice", "jira", scope, snapshot))
+
+
+def test_assignee_is_escaped(store, monkeypatch):
+    queries = []
+
+    async def execute_tool(tool_name, tool_input, user_id, **kwargs):
+        queries.append(tool_input["jql"])
+        return {"issues": []}
+
+    monkeypatch.setattr(arcade_tools, "execute_tool", execute_tool)
+    assignee = 'x" OR project = SECRET OR assignee = "\\'
+    stale_snapshot(store, f"OPS:{assignee}")
+
+    asyncio.run(snapshots.sync_jira("alice", {"project": "OPS", "assignee": assignee}))
+
+    assert queries == [
+        'project = OPS AND assignee = "x\\" OR project = SECRET OR assignee = \\"\\\\" '
+        f"AND updated >= -{61 + snapshots.JQL_SKEW_MINUTES}m ORDER BY updated DESC"
+    ]
+
+
+def test_project_must_be_a_key(store, monkeypatch):
+    async def execute_tool(tool_name, tool_input, user_id, **kwargs):
+        raise AssertionError("no query should be sent")
+
+    monkeypatch.setattr(arcade_tools, "execute_tool", execute_tool)
+    project = 'OPS" OR project = "SECRET'
+    stale_snapshot(store, f"{project}:alice@example.com")
+
+    with pytest.raises(ValueError):
+        asyncio.run(snapshots.sync_jira("alice", {"project": project, "assignee": "alice@example.com"}))
+
+
+def test_request_projects_must_be_keys():
+    assert sources.resolve(None, {"projects": ["OPS", "briefly"]})["jira"]["projects"] == ["OPS", "briefly"]
+    with pytest.raises(ValueError, match="expected a project key"):
+        sources.resolve(None, {"projects": ['OPS" OR project = "SECRET']})
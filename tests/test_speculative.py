@@ -0,0 +1,100 @@
+"""Speculative prefetch: guessing sources, claiming results and accounting for misses."""
+import asyncio
+import time
+
+import pytest
+
+from app.graph import llm, router, speculative
+from app.graph.meeting_prep_graph import build_meeting_prep_graph
+from benchmarks.fakes import BRIEFING, GITHUB_TOOL, JIRA_TOOL, FakeLLM
+
+# matches the repo and sprint rules, but not confidently enough to skip the LLM
+UNSURE = "So about the repo and also the sprint " + "and some other things " * 5
+
+
+@pytest.fixture(autouse=True)
+def fresh_speculation():
+    router._memo.clear()
+    speculative._history.clear()
+    speculative._inflight.clear()
+    for key in speculative._stats:
+        speculative._stats[key] = 0
+    yield
+    router._memo.clear()
+
+
+def test_guess_from_rules_then_recent_routes():
+    assert speculative.guess_sources(UNSURE) == ["github", "jira"]
+    assert speculative.guess_sources("hello there") == []
+
+    for is_jira in (True, True, False):
+        speculative.record_route({"is_git": False, "is_jira": is_jira, "is_meeting_notes": False})
+    assert speculative.guess_sources("hello there") == ["jira"]
+
+
+def fetcher(calls, source, result=None, error=None):
+    async def fetch(state):
+        calls.append(source)
+        await asyncio.sleep(0)
+        if error:
+            raise error
+        return result or {source: "data"}
+
+    return fetch
+
+
+def test_selected_prefetches_are_claimed_and_the_rest_wasted():
+    calls = []
+    fetchers = {s: fetcher(calls, s) for s in ("github", "jira", "meeting_notes")}
+
+    async def run():
+        assert speculative.start("run", {"transcript": UNSURE}, fetchers) == ["github", "jira"]
+        speculative.settle("run", ["github", "meeting_notes"])
+        return await speculative.claim("run", "github"), await speculative.claim("run", "meeting_notes")
+
+    assert asyncio.run(run()) == ({"github": "data"}, None)
+    assert sorted(calls) == ["github", "jira"]
+    assert speculative.speculative_stats() == dict(
+        started=2, useful=1, wasted=1, cancelled=0, failed=0, inflight_runs=0
+    )
+
+
+def test_unused_prefetches_cancelled_when_configured(monkeypatch):
+    monkeypatch.setattr(speculative, "CANCEL_UNUSED", True)
+    calls = []
+
+    async def run():
+        speculative.start("run", {"transcript": UNSURE}, {s: fetcher(calls, s) for s in ("github", "jira")})
+        speculative.settle("run", [])
+
+    asyncio.run(run())
+    assert calls == []  # cancelled before they ran
+    assert speculative._stats["cancelled"] == 2 and not speculative._inflight
+
+
+def test_failed_prefetch_is_not_claimed():
+    async def run():
+        speculative.start("run", {"transcript": UNSURE}, {"github": fetcher([], "github", error=RuntimeError("down"))})
+        return await speculative.claim("run", "github")
+
+    assert asyncio.run(run()) is None
+    assert speculative._stats["failed"] == 1
+
+
+def test_prefetch_overlaps_the_coordinator(fakes, monkeypatch):
+    monkeypatch.setattr(speculative, "SPECULATIVE_PREFETCH", True)
+    llm.set_llm("coordinator", FakeLLM('{"is_git": true, "is_jira": false, "is_meeting_notes": false}', latency=0.3))
+    llm.set_llm("synth", FakeLLM(BRIEFING, latency=0.0))
+    fakes.latency = {GITHUB_TOOL: 0.3, JIRA_TOOL: 0.3}
+    graph = build_meeting_prep_graph()
+
+    async def run():
+        start = time.perf_counter()
+        result = await graph.ainvoke({"transcript": UNSURE, "no_cache": True})
+        return result, time.perf_counter() - start
+
+    result, wall = asyncio.run(run())
+    assert result["summary"] == BRIEFING
+    assert fakes.calls[GITHUB_TOOL] == 1  # the prefetch was reused, not repeated
+    assert wall < 0.3 + 0.3  # the fetch ran during the coordinator call
+    assert speculative._stats["useful"] == 1 and speculative._stats["wasted"] == 1
@@ -0,0 +1,54 @@
+"""State that several gunicorn workers share: async batch jobs and pre-warm registrations."""
+import asyncio
+
+import pytest
+
+from app.batch import BatchScheduler
+from app.graph import shared_state
+from app.prewarm import PrewarmScheduler, RecurringMeeting
+from benchmarks.stub_redis import start_stub_redis
+
+
+async def run_item(item, on_node):
+    on_node("fetch")
+    return {"summary": f"briefing for {item['id']}", "classification": {}}
+
+
+def test_batch_job_pollable_from_another_worker():
+    pytest.importorskip("redis")
+    url, _ = start_stub_redis()
+
+    async def scenario():
+        shared_state.set_shared_state(shared_state.RedisSharedState(url, timeout=1.0))
+        started_on, polled_on = BatchScheduler(run_item), BatchScheduler(run_item)
+        job = await started_on.submit([{"id": "alice", "transcript": "Prep me for standup"}])
+        queued = await polled_on.get(job.id)
+        await job.task
+        done = await polled_on.get(job.id)
+        missing = await polled_on.get("no-such-job")
+        await shared_state.aclose_shared_state()
+        return queued, done, missing
+
+    queued, done, missing = asyncio.run(scenario())
+    assert queued["status"] == "queued"
+    assert done["status"] == "done"
+    assert done["items"][0]["result"]["summary"] == "briefing for alice"
+    assert missing is None
+
+
+def test_prewarm_saves_keep_other_workers_registrations(tmp_path):
+    path = str(tmp_path / "prewarm.json")
+
+    async def run_meeting(meeting):
+        pass
+
+    first, second = PrewarmScheduler(run_meeting, path=path), PrewarmScheduler(run_meeting, path=path)
+    first.register(RecurringMeeting(user_id="alice@example.com", at="09:30", id="alice"))
+    # second loaded the file before alice was added; its save must not drop her
+    second.register(RecurringMeeting(user_id="bob@example.com", at="10:00", id="bob"))
+    first.unregister("missing")
+
+    reloaded = PrewarmScheduler(run_meeting, path=path)
+    assert set(reloaded.meetings) == {"alice", "bob"}
+    assert set(first.meetings) == {"alice", "bob"}
+    assert list(tmp_path.glob("*.tmp")) == []